@@ -0,0 +1,59 @@
+# TorchMeter, AGPL-3.0 license
+# Author: Ahzyuan
+# Repo: https://github.com/TorchMeter/torchmeter
+
+"""
+Micro-benchmark of the per-call overhead of the `cal` and `mem` measurement hooks.
+
+The overhead is the time of a hooked feed-forward minus that of a plain one, divided by the number of hook calls.
+Run it before and after a change of the hooks to compare, e.g. `python misc/bench_hooks.py --depth 1000`.
+"""
+
+import argparse
+from time import perf_counter
+
+import torch
+import torch.nn as nn
+
+from torchmeter.hooks import HookDispatcher
+from torchmeter.engine import OperationTree
+
+
+def build_model(depth: int) -> nn.Module:
+    return nn.Sequential(*(nn.Sequential(nn.Linear(8, 8), nn.ReLU()) for _ in range(depth)))
+
+
+def time_forward(model: nn.Module, ipt: torch.Tensor, stat_name: str, repeat: int) -> float:
+    """The best time of a feed-forward with the hooks of `stat_name` on a fresh tree, or without hooks if empty"""
+    best = float("inf")
+    for _ in range(repeat):
+        dispatcher = HookDispatcher()
+        if stat_name:
+            for node in OperationTree(model).all_nodes:
+                getattr(node, stat_name).measure(dispatcher=dispatcher)
+
+        with torch.inference_mode(), dispatcher:
+            start = perf_counter()
+            model(ipt)
+            best = min(best, perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=500, help="number of Linear-ReLU blocks")
+    parser.add_argument("--repeat", type=int, default=20, help="number of runs, the best one is reported")
+    args = parser.parse_args()
+
+    model = build_model(args.depth)
+    ipt = torch.randn(1, 8)
+    hook_calls = 1 + 3 * args.depth  # root, blocks and leaves
+
+    plain = time_forward(model, ipt, "", args.repeat)
+    for stat_name in ("cal", "mem"):
+        hooked = time_forward(model, ipt, stat_name, args.repeat)
+        print(f"{stat_name}: {(hooked - plain) / hook_calls * 1e6:.2f} us per hook call")
+
+
+if __name__ == "__main__":
+    main()
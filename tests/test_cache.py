@@ -0,0 +1,106 @@
+import os
+from unittest.mock import patch
+
+import pytest
+import torch.nn as nn
+
+from torchmeter.cache import (
+    CACHE_FILE_EXT,
+    tree_cache_dir,
+    tree_cache_key,
+    clear_tree_cache,
+    load_cached_tree,
+    save_cached_tree,
+    list_cached_files,
+)
+from torchmeter.config import get_config
+from torchmeter.engine import OperationTree
+
+
+@pytest.fixture
+def cache_cfg(tmpdir):
+    cfg = get_config()
+    cfg.tree_cache.enabled = True
+    cfg.tree_cache.cache_dir = tmpdir.join("cache").strpath
+    cfg.tree_cache.max_entries = 2
+    yield cfg.tree_cache
+    cfg.restore()
+
+
+@pytest.fixture
+def repeat_model():
+    return nn.Sequential(*(nn.Sequential(nn.Linear(8, 8), nn.ReLU()) for _ in range(3)))
+
+
+@pytest.mark.vital
+class TestTreeCache:
+    def test_cache_dir(self, cache_cfg) -> None:
+        """Test the cache directory is configurable"""
+        assert tree_cache_dir() == cache_cfg.cache_dir
+
+        cache_cfg.cache_dir = None
+        assert tree_cache_dir() == os.path.join(os.path.expanduser("~"), ".cache", "torchmeter")
+
+    def test_cache_key(self, repeat_model) -> None:
+        """Test the key covers the structure as well as the parameter shapes and gradient states"""
+        struct_hash = OperationTree(repeat_model, lazy=True).struct_hash
+        assert tree_cache_key(repeat_model, struct_hash) == tree_cache_key(repeat_model, struct_hash)
+        assert tree_cache_key(repeat_model, struct_hash) != tree_cache_key(repeat_model, struct_hash + 1)
+
+        key = tree_cache_key(repeat_model, struct_hash)
+        repeat_model[0][0].weight.requires_grad_(False)
+        assert tree_cache_key(repeat_model, struct_hash) != key
+
+    def test_disabled_by_default(self, repeat_model) -> None:
+        """Test nothing is cached unless enabled in the global config"""
+        with patch("torchmeter.engine.save_cached_tree") as mock_save, \
+             patch("torchmeter.engine.load_cached_tree") as mock_load:  # fmt: skip
+            OperationTree(repeat_model)
+            mock_save.assert_not_called()
+            mock_load.assert_not_called()
+
+    def test_reload(self, cache_cfg, repeat_model) -> None:
+        """Test the tree of a structurally identical model is reloaded from the cache"""
+        tree = OperationTree(repeat_model)
+        assert len(list_cached_files(cache_cfg.cache_dir)) == 1
+
+        with patch.object(OperationTree, "expand_all") as mock_expand_all:
+            cached_tree = OperationTree(nn.Sequential(*(nn.Sequential(nn.Linear(8, 8), nn.ReLU()) for _ in range(3))))
+            mock_expand_all.assert_not_called()
+
+        assert [n.node_id for n in cached_tree.preorder] == [n.node_id for n in tree.preorder]
+        assert [n.repeat_time for n in cached_tree.preorder] == [n.repeat_time for n in tree.preorder]
+        assert cached_tree.root.param.is_measured
+        assert cached_tree.root.param.TotalNum.val == 3 * (8 * 8 + 8)
+
+        # an invalid cache file is ignored and overwritten
+        cache_file = list_cached_files(cache_cfg.cache_dir)[0]
+        with open(cache_file, "w") as f:
+            f.write("invalid")
+        assert not load_cached_tree(OperationTree(repeat_model, lazy=True))
+        OperationTree(repeat_model)
+        assert load_cached_tree(OperationTree(repeat_model, lazy=True))
+
+    def test_lru_eviction(self, cache_cfg) -> None:
+        """Test the least recently used files are removed when exceeding the size limit"""
+        trees = [OperationTree(nn.Linear(i + 1, 1)) for i in range(3)]
+        cached_files = list_cached_files(cache_cfg.cache_dir)
+        assert len(cached_files) == 2
+        assert all(file_path.endswith(CACHE_FILE_EXT) for file_path in cached_files)
+        assert not load_cached_tree(OperationTree(nn.Linear(1, 1), lazy=True))
+
+        # a hit marks the file as the most recently used one
+        os.utime(cached_files[0], (0, 0))
+        assert load_cached_tree(trees[1])
+        save_cached_tree(OperationTree(nn.Linear(4, 1)))
+        assert load_cached_tree(OperationTree(nn.Linear(2, 1), lazy=True))
+        assert not load_cached_tree(OperationTree(nn.Linear(3, 1), lazy=True))
+
+    def test_clear(self, cache_cfg, repeat_model) -> None:
+        """Test all cached files are removed"""
+        OperationTree(repeat_model)
+        clear_tree_cache()
+        assert not list_cached_files(cache_cfg.cache_dir)
+
+        cache_cfg.cache_dir = os.path.join(cache_cfg.cache_dir, "not_exist")
+        clear_tree_cache()
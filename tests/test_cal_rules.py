@@ -0,0 +1,414 @@
+import pytest
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import randn as torch_randn
+from torch import randint as torch_randint
+from torch.nn.utils.rnn import pack_padded_sequence
+
+from torchmeter.core import Meter
+from torchmeter.hooks import HookDispatcher
+from torchmeter.engine import OperationTree
+from torchmeter.cal_rules import (
+    CAL_RULES,
+    CalCost,
+    CalCostCache,
+    CalRuleRegistry,
+    conv_rule,
+    linear_rule,
+    get_cal_rule,
+    cal_cache_info,
+    clear_cal_cache,
+    register_cal_rule,
+    unregister_cal_rule,
+)
+from torchmeter.op_counter import OpCounter
+
+
+class Scale(nn.Module):
+    def forward(self, x):
+        return x * 2
+
+
+class SubScale(Scale):
+    pass
+
+
+class CustomConv(nn.Conv2d):
+    pass
+
+
+def scale_rule(module, ipt, opt):  # noqa: ARG001
+    return CalCost(macs=opt.numel(), flops=opt.numel())
+
+
+@pytest.fixture
+def registry():
+    return CalRuleRegistry()
+
+
+@pytest.fixture
+def clean_cache():
+    clear_cal_cache()
+    yield
+    clear_cal_cache()
+
+
+@pytest.fixture
+def scale_registered():
+    register_cal_rule(Scale, scale_rule)
+    yield
+    unregister_cal_rule(Scale)
+
+
+@pytest.mark.vital
+class TestCalRuleRegistry:
+    def test_builtin_rules(self) -> None:
+        """Test the built-in modules are supported"""
+        assert get_cal_rule(nn.Conv1d) is conv_rule
+        assert get_cal_rule(nn.Linear) is linear_rule
+        assert nn.ReLU in CAL_RULES
+        assert nn.Identity not in CAL_RULES
+
+    def test_mro_resolution(self, registry) -> None:
+        """Test a rule applies to the subclasses unless they have their own"""
+        registry.register(Scale, scale_rule)
+        assert registry.resolve(SubScale) is scale_rule
+
+        sub_rule = registry.register(SubScale, lambda *_: CalCost(macs=0, flops=0))
+        assert registry.resolve(SubScale) is sub_rule
+        assert registry.resolve(Scale) is scale_rule
+
+        # fall back to the base class after unregistering
+        registry.unregister(SubScale)
+        assert registry.resolve(SubScale) is scale_rule
+        registry.unregister(SubScale)
+
+        assert get_cal_rule(CustomConv) is conv_rule
+
+    def test_resolve_cache(self, registry) -> None:
+        """Test the rule of each type is resolved only once until the registry changes"""
+        registry.register(Scale, scale_rule)
+        registry.resolve(SubScale)
+        assert registry._CalRuleRegistry__resolved == {SubScale: scale_rule}
+
+        registry.register(nn.Linear, linear_rule)
+        assert not registry._CalRuleRegistry__resolved
+
+    def test_register(self, registry) -> None:
+        """Test registering via a function call or a decorator"""
+
+        @registry.register((Scale, nn.Identity))
+        def identity_rule(module, ipt, opt):  # noqa: ARG001
+            return CalCost(macs=0, flops=0)
+
+        assert registry.resolve(Scale) is identity_rule
+        assert registry.resolve(nn.Identity) is identity_rule
+
+        with pytest.raises(TypeError):
+            registry.register(int, identity_rule)
+        with pytest.raises(TypeError):
+            registry.register(Scale(), identity_rule)
+        with pytest.raises(TypeError):
+            registry.register(Scale, "rule")
+
+    def test_cacheable(self, registry) -> None:
+        """Test a rule can be registered as uncacheable, which applies wherever it is registered"""
+        registry.register(Scale, scale_rule, cacheable=False)
+        assert not registry.is_cacheable(scale_rule)
+
+        registry.register(SubScale, scale_rule)
+        assert registry.is_cacheable(scale_rule)
+
+        decorated = registry.register(nn.Identity, cacheable=False)(scale_rule)
+        assert decorated is scale_rule
+        assert not registry.is_cacheable(scale_rule)
+        assert registry.is_cacheable(linear_rule)
+
+    def test_custom_rule_measurement(self, scale_registered) -> None:
+        """Test a registered rule is used to measure the custom module"""
+        model = nn.Sequential(Scale(), SubScale())
+        tree = OperationTree(model)
+        for node in tree.all_nodes:
+            node.cal.measure()
+        model(torch_randn(2, 5))
+
+        assert not tree.root.cal.is_not_supported
+        assert tree.root.cal.Macs.val == 20
+        assert tree.get_node("1").cal.detail_val[0].Kernel_Size is None
+        assert tree.get_node("2").cal.Flops.val == 10
+
+
+@pytest.mark.vital
+class TestCalCostCache:
+    def test_lru(self) -> None:
+        """Test the least recently used entries are evicted when exceeding the size limit"""
+        cache = CalCostCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.info() == (1, 1, 2, 2)
+
+        cache.maxsize = 1
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+        with pytest.raises(ValueError):
+            cache.maxsize = -1
+
+        cache.clear()
+        assert cache.info() == (0, 0, 1, 0)
+
+    def test_reuse(self, clean_cache) -> None:
+        """Test the cost is computed once for the identical modules seeing a same input"""
+        model = nn.Sequential(nn.Linear(4, 4), nn.Linear(4, 4), nn.Linear(4, 8))
+        tree = OperationTree(model)
+        for node in tree.all_nodes:
+            node.cal.measure()
+        model(torch_randn(1, 4))
+
+        assert cal_cache_info().hits == 1
+        assert cal_cache_info().misses == 2
+        assert tree.get_node("2").cal.Macs.val == tree.get_node("1").cal.Macs.val
+        assert tree.get_node("2").cal.detail_val[0].Input == tree.get_node("1").cal.detail_val[0].Input
+
+        # reused by another tree
+        other_model = nn.Sequential(nn.Linear(4, 4))
+        other_tree = OperationTree(other_model)
+        for node in other_tree.all_nodes:
+            node.cal.measure()
+        other_model(torch_randn(1, 4))
+        assert cal_cache_info().hits == 2
+
+        # a different input is a miss
+        other_model(torch_randn(2, 4))
+        assert cal_cache_info().misses == 3
+
+    def test_hidden_config(self, clean_cache) -> None:
+        """Test the modules whose reprs miss a part of their configuration do not share the cost"""
+        pools = [nn.AvgPool1d(3), nn.AvgPool1d(3, ceil_mode=True)]
+        assert repr(pools[0]) == repr(pools[1])
+
+        trees = [measure(pool, torch_randn(1, 10, 32)) for pool in pools]
+        assert [tree.root.cal.Macs.val for tree in trees] == [200, 220]
+        assert cal_cache_info().misses == 2
+
+    def test_uncacheable(self, clean_cache) -> None:
+        """Test the cost of an uncacheable rule is computed for each module, even if their reprs are the same"""
+
+        def factor_rule(module, ipt, opt):  # noqa: ARG001
+            return CalCost(macs=opt.numel() * module.factor, flops=opt.numel() * module.factor)
+
+        register_cal_rule(Scale, factor_rule, cacheable=False)
+        try:
+            model = nn.Sequential(Scale(), Scale())
+            model[0].factor, model[1].factor = 1, 3
+            tree = OperationTree(model)
+            for node in tree.all_nodes:
+                node.cal.measure()
+            model(torch_randn(2, 5))
+        finally:
+            unregister_cal_rule(Scale)
+
+        assert tree.get_node("1").cal.Macs.val == 10
+        assert tree.get_node("2").cal.Macs.val == 30
+        assert cal_cache_info() == (0, 0, 4096, 0)
+
+
+def measure(model, *ipt):
+    tree = OperationTree(model)
+    for node in tree.all_nodes:
+        node.cal.measure()
+        node.mem.measure()
+    model(*ipt)
+    return tree
+
+
+@pytest.mark.vital
+class TestTransformerRules:
+    def test_mha(self) -> None:
+        """Test the attention scales with the query and key lengths, and is measured as a whole"""
+        mha = nn.MultiheadAttention(8, 2)
+        tree = measure(mha, torch_randn(5, 3, 8), torch_randn(7, 3, 8), torch_randn(7, 3, 8))
+        cal, mem = tree.root.cal, tree.root.mem
+
+        # q, k, v and output projections, each counted as `nn.Linear(8, 8)` regardless of the tokens
+        attn_elems = 3 * 2 * 5 * 7
+        assert cal.Macs.val == 4 * 8 * 8 + 2 * attn_elems * 4 + 3 * attn_elems
+        assert cal.Flops.val == 4 * 8 * 16 + attn_elems * 7 + 3 * 5 * 8 * 13 + 5 * attn_elems + 3 * 5 * 8
+        assert cal.detail_val[0].Bias
+
+        # `out_proj` is not called, its weights are counted in the attention
+        assert mem.ParamCost.val == sum(p.numel() for p in mha.parameters()) * 4
+        assert mem.OutputCost.val == (5 * 3 * 8 + attn_elems // 2) * 4
+
+        seq_first = measure(nn.MultiheadAttention(8, 2), *[torch_randn(5, 3, 8)] * 3)
+        batch_first = measure(nn.MultiheadAttention(8, 2, batch_first=True), *[torch_randn(3, 5, 8)] * 3)
+        assert batch_first.root.cal.Macs.val == seq_first.root.cal.Macs.val
+
+    def test_encoder_layer(self) -> None:
+        """Test the residual additions and the functional activation are added to the submodules"""
+        layer = nn.TransformerEncoderLayer(8, 2, dim_feedforward=16, dropout=0.0)
+        tree = measure(layer, torch_randn(5, 3, 8))
+
+        childs_macs = sum(child.cal.Macs.val for child in tree.root.childs.values())
+        assert tree.root.cal.Macs.val == childs_macs + 2 * 15 * 8 + 15 * 16
+        assert not tree.root.cal.is_not_supported
+        assert all(not child.cal.is_not_supported for child in tree.root.childs.values())
+
+    @pytest.mark.parametrize(
+        argnames=("module", "expected_macs", "expected_flops"),
+        argvalues=[
+            (nn.LayerNorm(10), 3 * 20, 7 * 20),
+            (nn.LayerNorm(10, elementwise_affine=False), 2 * 20, 5 * 20),
+            (nn.GroupNorm(2, 10), 3 * 20, 7 * 20),
+            (nn.GELU(), 7 * 20, 13 * 20),
+            (nn.GELU(approximate="tanh"), 9 * 20, 17 * 20),
+            (nn.Softmax(dim=-1), 3 * 20, 5 * 20),
+            (nn.Dropout(0.5), 20, 20),
+            (nn.Dropout(0.5).eval(), 0, 0),
+        ],
+    )
+    def test_elementwise(self, module, expected_macs, expected_flops, clean_cache) -> None:
+        """Test the cost of the norms, activations and dropouts is proportional to the input size"""
+        tree = measure(module, torch_randn(2, 10))
+        assert tree.root.cal.Macs.val == expected_macs
+        assert tree.root.cal.Flops.val == expected_flops
+
+    def test_training_mode(self, clean_cache) -> None:
+        """Test the cached cost of a module depending on the training mode is not shared across the modes"""
+        assert measure(nn.Dropout(0.5), torch_randn(2, 10)).root.cal.Macs.val == 20
+        assert measure(nn.Dropout(0.5).eval(), torch_randn(2, 10)).root.cal.Macs.val == 0
+
+        # nor are the measurements extrapolated across the modes
+        model = nn.Sequential(nn.Dropout(0.5), nn.Dropout(0.5))
+        model[1].eval()
+        metered_model = Meter(model, device="cpu", extrapolate_repeat=True)
+        metered_model(torch_randn(2, 10))
+        assert metered_model.cal.Macs.val == 20
+        assert metered_model.optree.get_node("1").cal.Macs.val == 20
+        assert metered_model.optree.get_node("2").cal.Macs.val == 0
+
+    def test_embedding(self) -> None:
+        """Test the embedding is a lookup without arithmetic"""
+        tree = measure(nn.Embedding(10, 4), torch_randint(0, 10, (2, 3)))
+        assert not tree.root.cal.is_not_supported
+        assert tree.root.cal.Macs.val == tree.root.cal.Flops.val == 0
+        assert tree.root.mem.OutputCost.val == 2 * 3 * 4 * 4
+
+
+@pytest.mark.vital
+class TestRecurrentRules:
+    def test_lstm(self) -> None:
+        """Test the cost of each gate, layer and direction at each timestep, shown per timestep"""
+        lstm = nn.LSTM(4, 8, num_layers=2, bidirectional=True)
+        tree = measure(lstm, torch_randn(5, 3, 4))
+        cal, mem = tree.root.cal, tree.root.mem
+
+        # 4 gates of both products, and 19 element-wise operations per hidden unit
+        layer0_macs = 4 * 8 * (4 + 8) + 19 * 8
+        layer1_macs = 4 * 8 * (16 + 8) + 19 * 8
+        assert cal.Macs.val == 5 * 3 * 2 * (layer0_macs + layer1_macs)
+        assert cal.Macs.access_cnt == cal.Flops.access_cnt == 5
+        assert cal.detail_val[0].Bias
+
+        # the output, hidden and cell states
+        assert mem.OutputCost.val == (5 * 3 * 16 + 2 * 4 * 3 * 8) * 4
+
+        projected = measure(nn.LSTM(4, 8, proj_size=2), torch_randn(5, 3, 4))
+        assert projected.root.cal.Macs.val == 5 * 3 * (4 * 8 * (4 + 2) + 19 * 8 + 8 * 2)
+
+    def test_packed_sequence(self) -> None:
+        """Test only the valid timesteps of a packed sequence are counted"""
+        padded = measure(nn.GRU(4, 8, batch_first=True), torch_randn(3, 5, 4))
+        packed_ipt = pack_padded_sequence(torch_randn(3, 5, 4), [5, 3, 2], batch_first=True)
+        packed = measure(nn.GRU(4, 8, batch_first=True), packed_ipt)
+
+        assert packed.root.cal.Macs.val * 15 == padded.root.cal.Macs.val * 10
+        assert packed.root.cal.Flops.val * 15 == padded.root.cal.Flops.val * 10
+        assert packed.root.cal.Macs.access_cnt == 5
+
+    @pytest.mark.parametrize(
+        argnames=("module", "expected_macs", "expected_flops"),
+        argvalues=[
+            (nn.RNNCell(4, 8), 8 * 12 + 5 * 8, 8 * 25 + 9 * 8),
+            (nn.RNNCell(4, 8, nonlinearity="relu", bias=False), 8 * 12 + 8, 8 * 23 + 8),
+            (nn.GRUCell(4, 8), 3 * 8 * 12 + 12 * 8, 3 * 8 * 25 + 22 * 8),
+            (nn.LSTMCell(4, 8), 4 * 8 * 12 + 19 * 8, 4 * 8 * 25 + 34 * 8),
+        ],
+    )
+    def test_cells(self, module, expected_macs, expected_flops) -> None:
+        """Test the cost of a single timestep of the cells"""
+        tree = measure(module, torch_randn(3, 4))
+        assert tree.root.cal.Macs.val == 3 * expected_macs
+        assert tree.root.cal.Flops.val == 3 * expected_flops
+        assert tree.root.cal.Macs.access_cnt == 1
+
+
+@pytest.mark.vital
+class TestDecoderRules:
+    @pytest.mark.parametrize(
+        argnames=("module", "ipt_shape", "expected_macs", "expected_flops"),
+        argvalues=[
+            # each output element takes C_in / groups * kernel elements
+            (nn.Conv2d(4, 6, 3, groups=2), (1, 4, 5, 5), 6 * 9 * 2 * 9, 6 * 9 * (2 * 18)),
+            (nn.Conv2d(4, 4, 3, groups=4, bias=False), (1, 4, 5, 5), 4 * 9 * 9, 4 * 9 * (2 * 9 - 1)),
+            (nn.Conv2d(4, 6, 3, dilation=2), (1, 4, 5, 5), 6 * 1 * 36, 6 * 1 * (2 * 36)),
+            (nn.Conv2d(4, 6, 3), (4, 5, 5), 6 * 9 * 36, 6 * 9 * (2 * 36)),  # unbatched
+            # each input element is scattered to C_out / groups * kernel elements
+            (nn.ConvTranspose2d(4, 6, 3, stride=2, groups=2), (1, 4, 5, 5), 100 * 27, 2 * 100 * 27),
+            (nn.ConvTranspose1d(4, 6, 3, bias=False), (1, 4, 5), 20 * 18, 2 * 20 * 18 - 6 * 7),
+        ],
+    )
+    def test_conv(self, module, ipt_shape, expected_macs, expected_flops) -> None:
+        """Test the grouped, dilated and transposed convolutions"""
+        tree = measure(module, torch_randn(*ipt_shape))
+        assert tree.root.cal.Macs.val == expected_macs
+        assert tree.root.cal.Flops.val == expected_flops
+
+    @pytest.mark.parametrize(
+        argnames=("module", "expected_macs", "expected_flops"),
+        argvalues=[
+            (nn.Upsample(scale_factor=2), 0, 0),
+            (nn.Upsample(scale_factor=2, mode="bilinear"), 4 * 576, 7 * 576),
+            (nn.UpsamplingBilinear2d(scale_factor=2), 4 * 576, 7 * 576),
+            (nn.Upsample(scale_factor=2, mode="bicubic"), 16 * 576, 31 * 576),
+            (nn.Upsample(size=(2, 3), mode="area"), 4 * 36 - 24, 2 * 4 * 36 - 24),
+            (nn.PixelShuffle(2), 0, 0),
+        ],
+    )
+    def test_upsample(self, module, expected_macs, expected_flops) -> None:
+        """Test each output element of the interpolations is costed by the neighbours it weights"""
+        tree = measure(module, torch_randn(1, 4, 6, 6))
+        assert not tree.root.cal.is_not_supported
+        assert tree.root.cal.Macs.val == expected_macs
+        assert tree.root.cal.Flops.val == expected_flops
+
+    def test_adaptive_pool(self) -> None:
+        """Test the adaptive pooling whose windows are of different sizes"""
+        # the windows along the length of 8 are [0, 3), [2, 6) and [5, 8)
+        tree = measure(nn.AdaptiveAvgPool1d(3), torch_randn(2, 4, 8))
+        assert tree.root.cal.Macs.val == 2 * 4 * (10 - 3)
+        assert tree.root.cal.Flops.val == 2 * 4 * (2 * 10 - 3)
+        assert tree.root.cal.detail_val[0].Kernel_Size is None
+
+        tree = measure(nn.AdaptiveMaxPool2d((2, None), return_indices=True), torch_randn(1, 4, 6, 5))
+        assert tree.root.cal.Macs.val == tree.root.cal.Flops.val == 4 * 30 - 4 * 10
+        assert tree.root.cal.detail_val[0].Kernel_Size == [3, 1]
+
+    def test_interpolate_op(self) -> None:
+        """Test the functional interpolation is counted by the operators"""
+
+        class Resize(nn.Module):
+            def forward(self, x):
+                return F.interpolate(x, scale_factor=2, mode="bilinear")
+
+        model = Resize()
+        tree = OperationTree(model)
+        dispatcher = HookDispatcher()
+        counter = OpCounter(dispatcher)
+        tree.root.cal.measure(dispatcher=dispatcher, count_ops=True)
+        counter.track(model, tree.root.cal)
+        with dispatcher, counter:
+            model(torch_randn(1, 4, 6, 6))
+        assert tree.root.cal.Macs.val == 4 * 576
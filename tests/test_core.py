@@ -6,13 +6,15 @@ from rich import get_console
 from torch import equal as torch_equal
 from torch import randn as torch_randn
 from torch import float16, float32
+from torch import backends as torch_backends
 from rich.text import Text
 from torch.cuda import is_available as is_cuda
 from rich.layout import Layout
-from torch.utils.hooks import RemovableHandle
+from torch.nn.modules.module import _global_forward_hooks, _global_forward_pre_hooks
 
 from torchmeter.core import Meter, __cfg__, tc_device
 from torchmeter.core import __cfg__ as core_cfg
+from torchmeter.hooks import HookDispatcher
 from torchmeter.utils import data_repr, indent_str
 from torchmeter.engine import CalMeter, MemMeter, IttpMeter, ParamsMeter, OperationNode, OperationTree
 from torchmeter.display import TreeRenderer, TabularRenderer
@@ -639,10 +641,7 @@ class TestMeter:
         metered_model = Meter(ExampleModel())
         assert metered_model._Meter__measure_cal is False
 
-        # mock a RemovableHandle object
-        mock_handle = MagicMock(spec=RemovableHandle)
-        mock_handle.remove.return_value = "removed"
-        mock_measure.return_value = mock_handle
+        mock_measure.return_value = None
 
         # verify access the property when the input is unknown
         with pytest.raises(RuntimeError):
@@ -656,15 +655,15 @@ class TestMeter:
         assert isinstance(res, CalMeter)
         assert metered_model._Meter__measure_cal is True
         assert mock_measure.call_count == len(metered_model.subnodes)
-        assert mock_handle.remove.call_count == len(metered_model.subnodes)
+        assert {type(c.kwargs["dispatcher"]) for c in mock_measure.call_args_list} == {HookDispatcher}
+        assert not _global_forward_hooks
+        assert not _global_forward_pre_hooks
 
         # verify the result is cached
         mock_measure.reset_mock()
-        mock_handle.reset_mock()
         res2 = metered_model.cal
         assert res2 is res
         mock_measure.assert_not_called()
-        mock_handle.remove.assert_not_called()
 
     @patch("torchmeter.core.Meter._ipt2device")
     @patch("torchmeter.statistic.MemMeter.measure")
@@ -674,10 +673,7 @@ class TestMeter:
         metered_model = Meter(ExampleModel())
         assert metered_model._Meter__measure_mem is False
 
-        # mock a RemovableHandle object
-        mock_handle = MagicMock(spec=RemovableHandle)
-        mock_handle.remove.return_value = "removed"
-        mock_measure.return_value = mock_handle
+        mock_measure.return_value = None
 
         # verify access the property when the input is unknown
         with pytest.raises(RuntimeError):
@@ -691,15 +687,15 @@ class TestMeter:
         assert isinstance(res, MemMeter)
         assert metered_model._Meter__measure_mem is True
         assert mock_measure.call_count == len(metered_model.subnodes)
-        assert mock_handle.remove.call_count == len(metered_model.subnodes)
+        assert {type(c.kwargs["dispatcher"]) for c in mock_measure.call_args_list} == {HookDispatcher}
+        assert not _global_forward_hooks
+        assert not _global_forward_pre_hooks
 
         # verify the result is cached
         mock_measure.reset_mock()
-        mock_handle.reset_mock()
         res2 = metered_model.mem
         assert res2 is res
         mock_measure.assert_not_called()
-        mock_handle.remove.assert_not_called()
 
     @patch("torchmeter.core.Meter._ipt2device")
     @patch("torchmeter.statistic.IttpMeter.measure")
@@ -708,10 +704,7 @@ class TestMeter:
 
         metered_model = Meter(ExampleModel())
 
-        # mock a RemovableHandle object
-        mock_handle = MagicMock(spec=RemovableHandle)
-        mock_handle.remove.return_value = "removed"
-        mock_measure.return_value = mock_handle
+        mock_measure.return_value = None
 
         # verify access the property when the input is unknown
         with pytest.raises(RuntimeError):
@@ -745,19 +738,22 @@ class TestMeter:
             # verify the measurement is triggered for all operationnode
             assert isinstance(res, IttpMeter)
             assert mock_measure.call_count == len(metered_model.subnodes)
-            assert mock_handle.remove.call_count == len(metered_model.subnodes)
+            assert {type(c.kwargs["dispatcher"]) for c in mock_measure.call_args_list} == {HookDispatcher}
+            assert not _global_forward_hooks
+            assert not _global_forward_pre_hooks
 
             # verify the result is not cached
             mock_ipt2device.reset_mock()
             mock_call.reset_mock()
             mock_measure.reset_mock()
-            mock_handle.reset_mock()
             res2 = metered_model.ittp
             assert res2 is res
             mock_ipt2device.assert_called_once()
             assert mock_call.call_count == 10 + 1
             assert mock_measure.call_count == len(metered_model.subnodes)
-            assert mock_handle.remove.call_count == len(metered_model.subnodes)
+            assert {type(c.kwargs["dispatcher"]) for c in mock_measure.call_args_list} == {HookDispatcher}
+            assert not _global_forward_hooks
+            assert not _global_forward_pre_hooks
 
     @patch("torchmeter.utils.data_repr", wraps=data_repr)
     @patch("torchmeter.utils.indent_str", wraps=indent_str)
@@ -901,6 +897,259 @@ class TestMeter:
         with pytest.raises(ValueError):
             metered_model.rebase("10")
 
+    def test_rebase_view(self) -> None:
+        """Test the rebased Meter shares the operation tree and measurements"""
+
+        metered_model = Meter(ExampleModel(), device="cpu")
+        metered_model(torch_randn(1, 10))
+        metered_model.param
+        metered_model.cal
+
+        with patch.object(Meter, "__init__", wraps=Meter.__init__) as mock_new:
+            rebase_model = metered_model.rebase("2")
+            mock_new.assert_not_called()
+
+        subroot = metered_model.optree.get_node("2")
+        assert rebase_model.model is subroot.operation
+        assert rebase_model.optree.root is subroot
+        assert rebase_model.optree.base is metered_model.optree
+        assert rebase_model.device == metered_model.device
+        assert rebase_model.subnodes == ["(0) layer1", "(1) 0", "(2) 1", "(3) 2", "(4) 3"]
+
+        # reuse the measured statistics without any forward pass
+        with patch("torchmeter.statistic.ParamsMeter.measure") as mock_param_measure, \
+             patch("torchmeter.statistic.CalMeter.measure") as mock_cal_measure:  # fmt: skip
+            assert rebase_model.param is subroot.param
+            assert rebase_model.cal is subroot.cal
+            mock_param_measure.assert_not_called()
+            mock_cal_measure.assert_not_called()
+
+        # rebase on a rebased Meter with relative id
+        assert rebase_model.rebase("1").optree.root is metered_model.optree.get_node("2.1")
+        with pytest.raises(ValueError):
+            rebase_model.rebase("5")
+
+        # fresh rebase rescans the submodule
+        fresh_model = metered_model.rebase("2", fresh=True)
+        assert fresh_model.model is subroot.operation
+        assert fresh_model.optree.root is not subroot
+        assert fresh_model.subnodes == ["(0) Sequential", "(1) 0", "(2) 1", "(3) 2", "(4) 3"]
+
+    def test_call_reset_measurements(self) -> None:
+        """Test a new input discards the measurements depending on the input"""
+
+        metered_model = Meter(ExampleModel(), device="cpu")
+        metered_model(torch_randn(1, 10))
+        param, cal, mem = metered_model.param, metered_model.cal, metered_model.mem
+        assert cal.is_measured
+        assert mem.is_measured
+        stale_model = metered_model.rebase("2")
+        assert stale_model.cal.is_measured
+
+        metered_model(torch_randn(2, 10))
+        assert metered_model.optree.root.param is param
+        assert metered_model.optree.root.cal is not cal
+        assert metered_model.optree.root.mem is not mem
+        assert not metered_model.optree.root.cal.is_measured
+        assert metered_model.table_renderer.stats_data["cal"].is_empty()
+
+        # an existing rebased Meter notices its measurements are discarded, and remeasures with its own input
+        assert stale_model.param is metered_model.optree.get_node("2").param
+        with pytest.raises(RuntimeError):
+            stale_model.cal
+        with pytest.raises(RuntimeError):
+            stale_model.mem
+        stale_model(torch_randn(1, 10))
+        assert stale_model.cal.is_measured
+        assert stale_model.mem.is_measured
+
+        # a rebased Meter switches to its own operation tree, the origin is left untouched
+        rebase_model = metered_model.rebase("2")
+        subroot_cal = metered_model.optree.get_node("2").cal
+        rebase_model(torch_randn(1, 10))
+        assert rebase_model.optree.root is not metered_model.optree.get_node("2")
+        assert rebase_model.optree.root.operation is metered_model.layer1
+        assert metered_model.optree.get_node("2").cal is subroot_cal
+
+    def test_measure_all(self) -> None:
+        """Test param, cal and mem are measured together in a single feed-forward pass"""
+        from torch import is_grad_enabled
+
+        metered_model = Meter(ExampleModel(), device="cpu")
+        with pytest.raises(RuntimeError):
+            metered_model.measure_all()
+
+        metered_model(torch_randn(1, 10))
+        grad_modes = []
+        origin_forward = metered_model.model.forward
+
+        def forward(ipt):
+            grad_modes.append(is_grad_enabled())
+            return origin_forward(ipt)
+
+        with patch.object(metered_model.model, "forward", side_effect=forward):
+            metered_model.measure_all()
+            assert grad_modes == [False]
+
+            root = metered_model.optree.root
+            assert root.param.is_measured
+            assert root.cal.is_measured
+            assert root.mem.is_measured
+            assert metered_model.param is root.param
+            assert metered_model.cal.Macs.val > 0
+            assert metered_model.mem.TotalCost.val > 0
+            metered_model.measure_all()
+            assert len(grad_modes) == 1
+
+        # accessing cal measures mem along with it
+        metered_model(torch_randn(2, 10))
+        with patch.object(metered_model.model, "forward", side_effect=forward):
+            metered_model.cal
+            metered_model.mem
+            assert len(grad_modes) == 2
+
+    def test_transformer_fastpath(self) -> None:
+        """Test the fused fast path of the transformer layers, which skips their submodules, is not taken"""
+        layer = nn.TransformerEncoderLayer(d_model=16, nhead=2, dim_feedforward=32, batch_first=True).eval()
+        metered_model = Meter(layer, device="cpu")
+        metered_model(torch_randn(2, 5, 16))
+        cal = metered_model.cal
+
+        linear1 = metered_model.optree.get_node_by_name("linear1")
+        norm1 = metered_model.optree.get_node_by_name("norm1")
+        assert linear1.cal.Macs.val == 16 * 32
+        assert norm1.cal.Macs.val > 0
+        assert linear1.mem.OutputCost.val == 2 * 5 * 32 * 4
+        assert cal.Macs.val > linear1.cal.Macs.val + norm1.cal.Macs.val
+
+        # the switch of the fast path is restored
+        mha_backend = getattr(torch_backends, "mha", None)
+        if hasattr(mha_backend, "get_fastpath_enabled"):
+            assert mha_backend.get_fastpath_enabled()
+
+    def test_meta_device(self) -> None:
+        """Test param, cal and mem are measured on the meta device as on a real one"""
+
+        cpu_model = Meter(ExampleModel(), device="cpu")
+        cpu_model(torch_randn(4, 10))
+
+        meta_model = Meter(ExampleModel(), device="meta")
+        meta_model(torch_randn(4, 10))
+        assert meta_model.ipt["args"][0].is_meta
+        assert all(p.is_meta for p in meta_model.model.parameters())
+
+        assert meta_model.param.TotalNum.val == cpu_model.param.TotalNum.val
+        assert meta_model.cal.Macs.val == cpu_model.cal.Macs.val
+        assert meta_model.cal.Flops.val == cpu_model.cal.Flops.val
+        assert meta_model.mem.TotalCost.val == cpu_model.mem.TotalCost.val
+
+        with pytest.raises(RuntimeError):
+            meta_model.ittp
+        with pytest.raises(RuntimeError, match="meta"):
+            meta_model.sparsity()
+        with pytest.raises(RuntimeError):
+            meta_model.to("cpu")
+        meta_model.to("meta")
+
+    def test_update(self) -> None:
+        """Test only the mutated submodules are rebuilt and remeasured"""
+
+        model = ExampleModel()
+        metered_model = Meter(model, device="cpu")
+        metered_model(torch_randn(1, 10))
+        param, cal = metered_model.param, metered_model.cal
+        kept_cal = metered_model.optree.get_node("2.1").cal
+        metered_model.tree_fold_repeat = True
+        metered_model.structure
+        assert metered_model.update() == []
+        assert metered_model.tree_renderer.render_fold_tree is not None
+
+        model.layer1[2] = nn.Linear(10, 10, bias=False)
+        assert metered_model.update() == ["2.3"]
+        assert metered_model.tree_renderer.render_fold_tree is None
+        assert metered_model.table_renderer.stats_data["cal"].is_empty()
+
+        fresh_model = Meter(model, device="cpu")
+        fresh_model(torch_randn(1, 10))
+        assert metered_model.param is param
+        assert metered_model.param.TotalNum.val == fresh_model.param.TotalNum.val
+        assert metered_model.cal is cal
+        assert metered_model.cal.Flops.val == fresh_model.cal.Flops.val
+        assert metered_model.optree.get_node("2.1").cal is kept_cal
+
+        with pytest.raises(TypeError):
+            metered_model.update(1)
+        with pytest.raises(ValueError):
+            metered_model.update("3")
+
+        # rebuilding the root of a rebased Meter
+        rebase_model = metered_model.rebase("2")
+        assert rebase_model.update("0") == ["0"]
+        assert rebase_model.optree.root is metered_model.optree.get_node("2")
+        assert rebase_model.tree_renderer.opnode is rebase_model.optree.root
+        assert rebase_model.model is model.layer1
+
+    def test_extrapolate_repeat(self) -> None:
+        """Test the measurements of structurally identical modules with a same input are extrapolated"""
+
+        ipt = torch_randn(1, 10)
+        model = ExampleModel()
+        metered_model = Meter(model, device="cpu")
+        extra_model = Meter(model, device="cpu", extrapolate_repeat=True)
+        assert not metered_model.extrapolate_repeat
+        metered_model(ipt)
+        extra_model(ipt)
+
+        # the same totals as measuring each module
+        assert extra_model.cal.Macs.val == metered_model.cal.Macs.val
+        assert extra_model.cal.Flops.val == metered_model.cal.Flops.val
+        assert extra_model.mem.TotalCost.val == metered_model.mem.TotalCost.val
+        assert extra_model.mem.OutputCost.val == metered_model.mem.OutputCost.val
+
+        # layer1.0 and layer1.2 reuse the results of layer0, layer1.3 reuses those of layer1.1
+        for stat_name in ("cal", "mem"):
+            extrapolated = [n.node_id for n in extra_model.optree.all_nodes if getattr(n, stat_name).is_extrapolated]
+            assert extrapolated == ["2.1", "2.3", "2.4"]
+
+        node = extra_model.optree.get_node("2.3")
+        row = node.cal.detail_val[0]
+        assert row.Operation_Id == "2.3"
+        assert row.Operation_Type == "Linear(extrapolated)"
+        assert row.MACs is node.cal.Macs
+        assert node.cal.Macs.val == extra_model.optree.get_node("1").cal.Macs.val
+
+        # all the hooks are removed
+        assert not any(m._forward_pre_hooks or m._forward_hooks for m in model.modules())
+
+        extra_model.ittp_warmup = 1
+        extra_model.ittp_benchmark_time = 2
+        extra_model.ittp
+        assert [n.node_id for n in extra_model.optree.all_nodes if n.ittp.is_extrapolated] == ["2.1", "2.3", "2.4"]
+        assert len(extra_model.optree.get_node("2.3").ittp.InferTime.vals) == 2
+
+        # a module seeing a different input is measured on its own
+        conv_model = Meter(nn.Sequential(nn.Conv2d(3, 3, 3), nn.Conv2d(3, 3, 3)), device="cpu", extrapolate_repeat=True)
+        conv_model(torch_randn(1, 3, 8, 8))
+        assert not any(n.cal.is_extrapolated for n in conv_model.optree.all_nodes)
+
+    def test_lazy_init(self) -> None:
+        """Test the operation tree is materialized on demand in lazy mode"""
+
+        metered_model = Meter(ExampleModel(), device="cpu", lazy=True)
+        assert metered_model.optree.lazy
+        assert metered_model.optree.materialized_num == 1
+
+        rebase_model = metered_model.rebase("1")
+        assert rebase_model.optree.root.type == "Linear"
+        assert rebase_model.optree.lazy
+        assert metered_model.optree.materialized_num == 3  # root + 2 childs
+
+        with pytest.raises(ValueError):
+            metered_model.rebase("10")
+
+        # full materialization on traversal
+        assert len(metered_model.subnodes) == metered_model.optree.materialized_num
+
     def test_stat_info(self) -> None:
         """Test the logic of stat_info method"""
 
@@ -943,7 +1192,7 @@ class TestMeter:
             def __init__(self) -> None:
                 super(NotSupportModel, self).__init__()
                 self.layer0 = nn.Linear(10, 5)
-                self.layer1 = nn.AdaptiveAvgPool1d(1)
+                self.layer1 = nn.Identity()
 
             def forward(self, x):
                 return self.layer1(x)
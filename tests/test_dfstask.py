@@ -167,3 +167,53 @@ class TestDfsTask:
 
         assert result1 == ["test"]
         assert result2 == ["test"]  # fail if the default value is shared
+
+    def test_deep_traversal(self) -> None:
+        """Test the traversal is not limited by the recursion limit"""
+        import sys
+
+        depth = sys.getrecursionlimit() * 2
+        visited_nodes = []
+
+        dfs_task(
+            dfs_subject=0,
+            adj_func=lambda x: [x + 1] if x < depth else [],
+            task_func=lambda subject, pre_res=None: visited_nodes.append(subject),
+            visited=[],
+        )
+
+        assert visited_nodes == list(range(depth + 1))
+
+    def test_pre_res_passing(self, binary_tree_root) -> None:
+        """Test each subject receives the result of its own predecessor"""
+
+        paths = {}
+
+        def record_path(subject, pre_res=()):
+            paths[subject.val] = (*pre_res, subject.val)
+            return paths[subject.val]
+
+        res = dfs_task(
+            dfs_subject=binary_tree_root,
+            adj_func=lambda n: [child for child in (n.left, n.right) if child is not None],
+            task_func=record_path,
+        )
+
+        assert res == (1,)
+        assert paths == {1: (1,), 2: (1, 2), 4: (1, 2, 4), 5: (1, 2, 5), 3: (1, 3)}
+
+    def test_visited_update(self, binary_tree_root) -> None:
+        """Test the passed-in visited list is updated in place and visited subjects are skipped"""
+
+        visited = [id(binary_tree_root.right)]
+        traversal_order = []
+
+        dfs_task(
+            dfs_subject=binary_tree_root,
+            adj_func=lambda n: [child for child in (n.left, n.right) if child is not None],
+            task_func=lambda subject, pre_res=None: traversal_order.append(subject.val),
+            visited=visited,
+        )
+
+        assert traversal_order == [1, 2, 4, 5]
+        assert len(visited) == 5
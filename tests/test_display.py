@@ -1217,6 +1217,35 @@ class TestTreeRenderer:
         with pytest.raises(RuntimeError):
             tree_renderer()
 
+    def test_render_subtree(self, repeat_tree_renderer) -> None:
+        """Test rendering a subtree regards its root as the root of the display tree"""
+        from copy import deepcopy
+
+        oproot = repeat_tree_renderer.opnode
+        subroot = oproot.childs["2"]
+
+        # the repeat info of the subtree root is reset, and the ids and levels are re-rooted
+        copy_subroot = deepcopy(subroot)
+        copy_subroot.repeat_time = 3
+        TreeRenderer._TreeRenderer__reroot(copy_subroot)
+        assert copy_subroot.node_id == "0"
+        assert copy_subroot.display_root.label == "0"
+        assert copy_subroot.repeat_time == 1
+        assert copy_subroot._render_when_repeat is True
+        assert [c.node_id for c in copy_subroot.childs.values()] == ["1", "2", "3", "4"]
+        assert all(c.display_root.label == "1" for c in copy_subroot.childs.values())
+        assert copy_subroot.childs["2.1"].repeat_winsz == 2
+        assert copy_subroot.childs["2.1"].repeat_time == 2
+
+        # the origin tree is not changed
+        assert subroot.node_id == "2"
+        assert subroot.display_root.label == "1"
+        assert [c.node_id for c in subroot.childs.values()] == ["2.1", "2.2", "2.3", "2.4"]
+
+        res = TreeRenderer(subroot)()
+        assert isinstance(res, Tree)
+        assert subroot.node_id == "2"
+
 
 class TestTabularRenderer:
     tbval_getter = lambda _, row_idx, col_idx, tb: tb.columns[col_idx]._cells[row_idx]
@@ -1725,24 +1754,28 @@ class TestTabularRenderer:
                 return self.conv(x)
 
         # skipping when using a layer as a model
+        # a standalone node is explored through dfs
         simple_tabular_renderer.clear()
         with pytest.raises(RuntimeError):
             simple_tabular_renderer("param")
+        assert mock_dfs_task.call_count == 1
 
-        # fill dataframe through dfs in the first call
+        # fill dataframe with the cached preorder nodes of the operation tree in the first call
         optree = OperationTree(EasyModel())
         tabular_renderer = TabularRenderer(optree.root)
         tabular_renderer.clear()
-        _tb, data1 = tabular_renderer(stat_name="param")
+        with patch.object(optree, "subtree", wraps=optree.subtree) as mock_subtree:
+            _tb, data1 = tabular_renderer(stat_name="param")
+            mock_subtree.assert_called_once_with(optree.root)
         assert data1.shape == (2, 6)  # 2: weight + bias
-        assert mock_dfs_task.call_count == 2  # root + conv
+        assert mock_dfs_task.call_count == 1  # no extra tree walk
 
         stat_data = tabular_renderer.stats_data
         assert not stat_data["param"].is_empty()
 
         # reuse data in latter call
         _tb, _data2 = tabular_renderer(stat_name="param")
-        assert mock_dfs_task.call_count == 2  # stay no change
+        assert mock_dfs_task.call_count == 1  # stay no change
 
         # verify no-called module warning
         oproot = universal_tabular_renderer.opnode
@@ -1753,6 +1786,18 @@ class TestTabularRenderer:
             _tb, _data = universal_tabular_renderer(stat_name="cal")
         assert "not explicitly called" in str(w[0].message)
 
+    def test_call_subtree(self) -> None:
+        """Test the operation ids are re-rooted when rendering a subtree"""
+
+        optree = OperationTree(nn.Sequential(nn.Linear(2, 2), nn.Sequential(nn.ReLU(), nn.Linear(2, 2))))
+        list(map(lambda n: n.param.measure(), optree.all_nodes))
+
+        _tb, data = TabularRenderer(optree.root)(stat_name="param")
+        assert data["Operation_Id"].to_list() == ["1", "1", "2", "2.1", "2.2", "2.2"]
+
+        _tb, data = TabularRenderer(optree.get_node("2"))(stat_name="param")
+        assert data["Operation_Id"].to_list() == ["1", "2", "2"]
+
     def test_call_pick_col(self, universal_tabular_renderer) -> None:
         """Test the column selection logic"""
 
@@ -1,10 +1,22 @@
+import json
+from copy import deepcopy
 from collections import OrderedDict
 from unittest.mock import patch
 
 import pytest
 import torch.nn as nn
 
-from torchmeter.engine import CalMeter, MemMeter, IttpMeter, ParamsMeter, OperationNode, OperationTree
+from torchmeter.engine import (
+    TREE_FILE_VERSION,
+    CalMeter,
+    MemMeter,
+    IttpMeter,
+    ParamsMeter,
+    OperationNode,
+    OperationTree,
+    OperationTreeView,
+    module_struct_hash,
+)
 
 
 @pytest.fixture
@@ -68,6 +80,19 @@ class TestOPN:
         assert node._render_when_repeat is False
         assert node._is_folded is False
 
+    def test_compact_storage(self, linear_model) -> None:
+        """Test the node is stored compactly"""
+        node = OperationNode(module=linear_model, name="".join(["Test", "Linear"]))
+        other_node = OperationNode(module=nn.Linear(10, 5), name="".join(["Test", "Linear"]))
+
+        # all the attributes are kept in slots
+        assert node.__dict__ == {}
+
+        # strings shared by nodes are interned
+        assert node.type is other_node.type
+        assert node.name is other_node.name
+        assert node.module_repr is other_node.module_repr
+
     def test_module_repr(self, linear_model, sequential_model) -> None:
         """Test the module_repr attribute"""
 
@@ -128,6 +153,31 @@ class TestOPN:
         with pytest.raises(AttributeError):
             delattr(node, stat_name)
 
+    def test_lazy_statistic_attrs(self, linear_model) -> None:
+        """Test the statistics are instantiated on first access, together with the missing ones of the ancestors"""
+        root = OperationNode(module=nn.Sequential(nn.Sequential(linear_model)))
+        child = OperationNode(module=root.operation[0], parent=root, node_id="1")
+        grandchild = OperationNode(module=linear_model, parent=child, node_id="1.1")
+
+        for node in (root, child, grandchild):
+            assert all(getattr(node, f"_OperationNode__{stat_name}") is None for stat_name in node.statistics)
+
+        cal = grandchild.cal
+        assert grandchild.cal is cal
+        assert isinstance(root._OperationNode__cal, CalMeter)
+        assert isinstance(child._OperationNode__cal, CalMeter)
+        assert child._OperationNode__param is None
+        assert root._OperationNode__mem is None
+
+        # an instantiated ancestor is not overwritten
+        root_param = root.param
+        assert grandchild.param._opnode is grandchild
+        assert root.param is root_param
+
+        grandchild._discard_stat("cal")
+        assert grandchild._OperationNode__cal is None
+        assert grandchild.cal is not cal
+
     def test_repr(self, linear_model, sequential_model) -> None:
         """Test repr"""
         leaf_node = OperationNode(module=linear_model)
@@ -376,6 +426,395 @@ class TestOPT:
         assert root.childs["2"].childs["2.2"].name == "1"
         assert root.childs["2"].childs["2.2"].type == "Tanh"
 
+    def test_traversal_order(self, nested_model) -> None:
+        """Test the cached preorder and postorder node arrays"""
+        tree = OperationTree(nested_model)
+
+        preorder_ids = [n.node_id for n in tree.preorder]
+        postorder_ids = [n.node_id for n in tree.postorder]
+        assert preorder_ids == ["0", "1", "1.1", "1.2", "1.3", "1.4", "2"]
+        assert postorder_ids == ["1.1", "1.2", "1.3", "1.4", "1", "2", "0"]
+        assert all(n._optree is tree for n in tree.all_nodes)
+
+        # cached
+        assert tree.preorder is tree.preorder
+        assert tree.postorder is tree.postorder
+
+    def test_subtree(self, nested_model) -> None:
+        """Test getting the subtree nodes from the preorder array"""
+        tree = OperationTree(nested_model)
+        root = tree.root
+
+        assert tree.subtree(root) == tree.preorder
+        assert [n.node_id for n in tree.subtree(root.childs["1"])] == ["1", "1.1", "1.2", "1.3", "1.4"]
+        assert tree.subtree(root.childs["2"]) == [root.childs["2"]]
+
+        with pytest.raises(ValueError):
+            tree.subtree(OperationNode(module=nn.ReLU()))
+
+    def test_struct_hash(self, nested_model) -> None:
+        """Test the structural hash of each node"""
+        tree = OperationTree(nested_model)
+        root = tree.root
+        child_1 = root.childs["1"]
+
+        assert tree.struct_hash == root.struct_hash == module_struct_hash(nested_model)
+        assert all(isinstance(n.struct_hash, int) for n in tree.all_nodes)
+        assert all(n.struct_hash == module_struct_hash(n.operation) for n in tree.all_nodes)
+
+        # names are ignored, config and types are not
+        assert child_1.childs["1.1"].struct_hash == child_1.childs["1.3"].struct_hash
+        assert child_1.childs["1.2"].struct_hash == child_1.childs["1.4"].struct_hash
+        assert child_1.childs["1.1"].struct_hash != child_1.childs["1.2"].struct_hash
+        assert module_struct_hash(nn.Conv2d(3, 6, 3)) == child_1.childs["1.1"].struct_hash
+        assert module_struct_hash(nn.Conv2d(3, 6, 5)) != child_1.childs["1.1"].struct_hash
+
+        # children are hashed in order
+        seq_1 = nn.Sequential(nn.ReLU(), nn.Tanh())
+        seq_2 = nn.Sequential(nn.Tanh(), nn.ReLU())
+        assert module_struct_hash(seq_1) != module_struct_hash(seq_2)
+        assert module_struct_hash(seq_1) == module_struct_hash(nn.Sequential(OrderedDict(a=nn.ReLU(), b=nn.Tanh())))
+
+    def test_struct_hash_memo(self, sequential_model) -> None:
+        """Test each module is hashed only once with a shared memo"""
+        memo = {}
+        res = module_struct_hash(sequential_model, memo=memo)
+
+        assert len(memo) == 5
+        assert memo[id(sequential_model)] == res
+
+        with patch("torchmeter.engine.blake2b") as mock_hasher:
+            assert module_struct_hash(sequential_model, memo=memo) == res
+            mock_hasher.assert_not_called()
+
+        tree = OperationTree(sequential_model)
+        assert set(tree._hash_memo) == set(memo)
+
+    def test_deep_model_construction(self) -> None:
+        """Test the tree construction is not limited by the recursion limit"""
+        import sys
+
+        depth = sys.getrecursionlimit() + 10
+        model = nn.Sequential()
+        inner = model
+        for _ in range(depth):
+            inner.add_module("0", nn.Sequential())
+            inner = inner[0]
+
+        tree = OperationTree(model)
+
+        assert len(tree.all_nodes) == depth + 1
+        assert tree.postorder[0] is tree.preorder[-1]
+
+    def test_topology(self, nested_model) -> None:
+        """Test the struct-of-arrays representation of the tree"""
+        tree = OperationTree(nested_model)
+
+        assert [n.node_id for n in tree.preorder] == ["0", "1", "1.1", "1.2", "1.3", "1.4", "2"]
+        topology = tree.topology
+        assert list(topology.parent) == [-1, 0, 1, 1, 1, 1, 0]
+        assert list(topology.depth) == [0, 1, 2, 2, 2, 2, 1]
+        assert list(topology.first_child) == [1, 2, -1, -1, -1, -1, -1]
+        assert list(topology.next_sibling) == [-1, 6, 3, 4, 5, -1, -1]
+        assert list(topology.subtree_end) == [7, 6, 3, 4, 5, 6, 7]
+        assert tree.topology is topology
+
+    def test_lazy_display(self, nested_model) -> None:
+        """Test the display tree is created on first access"""
+        tree = OperationTree(nested_model)
+        root = tree.root
+        child_1 = root.childs["1"]
+
+        assert all(n._display_root is None for n in tree.all_nodes)
+
+        assert child_1.display_root.label == "1"
+        assert all(n._display_root is not None for n in tree.all_nodes)
+        assert [c.label for c in root.display_root.children] == ["1", "1"]
+        assert [c.label for c in child_1.display_root.children] == ["2"] * 4
+
+        # standalone node
+        node = OperationNode(module=nn.ReLU(), parent=child_1)
+        assert node.display_root.label == "2"
+
+    def test_memory_footprint(self, nested_model) -> None:
+        """Test the memory taken by the tree itself is measurable"""
+        tree = OperationTree(nested_model)
+        lazy_tree = OperationTree(nested_model, lazy=True)
+
+        footprint = tree.memory_footprint()
+        assert footprint > 0
+        assert lazy_tree.memory_footprint() < footprint
+
+        # independent of the number of parameters
+        small_tree = OperationTree(nn.Sequential(nn.Linear(10, 10), nn.ReLU()))
+        large_tree = OperationTree(nn.Sequential(nn.Linear(1000, 1000), nn.ReLU()))
+        assert abs(small_tree.memory_footprint() - large_tree.memory_footprint()) < 64
+
+    def test_reset_stats(self, nested_model) -> None:
+        """Test the statistics are registered to the tree on first access and can be discarded"""
+        tree = OperationTree(nested_model)
+        footprint = tree.memory_footprint()
+        assert all(not nodes for nodes in tree._stat_nodes.values())
+
+        # instantiating all statistics costs extra memory, which is saved until they are used
+        leaf = tree.get_node("1.2")
+        leaf_cal = leaf.cal
+        assert tree._stat_nodes["cal"] == [tree.root, tree.get_node("1"), leaf]
+        for node in tree.all_nodes:
+            for stat_name in node.statistics:
+                getattr(node, stat_name)
+        assert all(len(nodes) == len(tree.all_nodes) for nodes in tree._stat_nodes.values())
+        assert tree.memory_footprint() > footprint
+
+        tree.reset_stats("cal", "mem")
+        assert not tree._stat_nodes["cal"]
+        assert not tree._stat_nodes["mem"]
+        assert (tree.stat_generation("param"), tree.stat_generation("cal"), tree.stat_generation("mem")) == (0, 1, 1)
+        assert len(tree._stat_nodes["param"]) == len(tree.all_nodes)
+        assert leaf._OperationNode__cal is None
+        assert leaf.cal is not leaf_cal
+
+        # a view shares the registry with the underlying tree
+        view = tree.view(tree.get_node("1"))
+        view.reset_stats()
+        assert all(not nodes for nodes in tree._stat_nodes.values())
+        assert tree.stat_generation("cal") == view.stat_generation("cal") == 2
+        assert tree.root._OperationNode__param is None
+
+        with pytest.raises(ValueError):
+            tree.reset_stats("invalid")
+
+    def test_rebuild(self, nested_model) -> None:
+        """Test only the subtrees affected by a mutation of the model are rebuilt"""
+        tree = OperationTree(nested_model)
+        tree.build_display()
+        for node in tree.all_nodes:
+            node.param.measure()
+        kept_node = tree.get_node("1.1")
+        assert kept_node.repeat_time == 2
+        assert tree.sync() == []
+
+        # a replaced submodule only causes its own subtree to be rebuilt
+        nested_model.s.second_conv = nn.Conv2d(3, 6, 5)
+        rebuilt = tree.sync()
+        assert [n.node_id for n in rebuilt] == ["1.3"]
+        new_node = rebuilt[0]
+        assert new_node.operation is nested_model.s.second_conv
+        assert tree.get_node("1.3") is new_node
+        assert tree.get_node_by_name("s.second_conv") is new_node
+        assert tree.get_node("1.1") is kept_node
+        assert kept_node.param.is_measured
+        assert tree.root.param.TotalNum.val == (6 * 3 * 3 * 3 + 6) + (10 * 5 + 5)
+
+        new_node.param.measure()
+        assert tree.root.param.TotalNum.val == sum(p.numel() for p in nested_model.parameters())
+        assert tree.struct_hash == module_struct_hash(nested_model)
+        assert kept_node.repeat_time == 1
+        assert tree.get_node("1").display_root.children[2] is new_node.display_root
+
+        # an insertion or removal shifts the ids of the siblings, so all of them are rebuilt
+        del nested_model.s.first_relu
+        assert [n.node_id for n in tree.sync()] == ["1.1", "1.2", "1.3"]
+        assert [n.node_id for n in tree.preorder] == ["0", "1", "1.1", "1.2", "1.3", "2"]
+        assert [n.full_name for n in tree.get_node("1").childs.values()] == [
+            "s.first_conv", "s.second_conv", "s.second_relu"
+        ]  # fmt: skip
+        assert tree.materialized_num == len(tree.all_nodes) == 6
+        assert tree.get_node("1").display_root.children == [n.display_root for n in tree.get_node("1").childs.values()]
+        assert tree.root.param.TotalNum.val == 10 * 5 + 5
+        assert len(tree._stat_nodes["param"]) == 3
+        with pytest.raises(ValueError):
+            tree.get_node("1.4")
+
+        # a module mutated in place is rebuilt on demand, a discarded node cannot be rebuilt
+        with pytest.raises(ValueError):
+            tree.rebuild(kept_node)
+        rebuilt = tree.rebuild(tree.get_node("2"))
+        assert rebuilt[0].operation is nested_model.l
+        assert rebuilt[0] is tree.get_node("2")
+
+        # rebuilding the root of a view re-roots the view
+        view = tree.view(tree.get_node("1"))
+        rebuilt = view.rebuild(view.root)
+        assert view.root is rebuilt[0] is tree.get_node("1")
+        assert [n.node_id for n in view.preorder] == ["1", "1.1", "1.2", "1.3"]
+
+    def test_node_index(self, nested_model) -> None:
+        """Test looking up nodes by id and fully-qualified module name"""
+        tree = OperationTree(nested_model)
+        root = tree.root
+
+        assert root.full_name == ""
+        assert [n.full_name for n in tree.preorder] == [
+            "", "s", "s.first_conv", "s.first_relu", "s.second_conv", "s.second_relu", "l"
+        ]  # fmt: skip
+        assert [n.full_name for n in tree.preorder[1:]] == [name for name, _ in nested_model.named_modules()][1:]
+
+        assert tree.get_node("0") is root
+        assert tree.get_node("1.3") is root.childs["1"].childs["1.3"]
+        assert tree.get_node_by_name("") is root
+        assert tree.get_node_by_name("s.second_conv") is tree.get_node("1.3")
+        assert tree.get_node_by_name("l") is tree.get_node("2")
+
+        with pytest.raises(ValueError):
+            tree.get_node("1.5")
+        with pytest.raises(ValueError):
+            tree.get_node_by_name("s.third_conv")
+
+    def test_find(self, nested_model) -> None:
+        """Test glob and prefix queries"""
+        tree = OperationTree(nested_model)
+
+        def ids(nodes):
+            return [n.node_id for n in nodes]
+
+        assert ids(tree.find("1.*")) == ["1.1", "1.2", "1.3", "1.4"]
+        assert ids(tree.find("?")) == ["0", "1", "2"]
+        assert ids(tree.find("s.*_conv", by="name")) == ["1.1", "1.3"]
+        assert ids(tree.find("s.*conv", by="name", with_subtree=True)) == ["1.1", "1.3"]
+        assert ids(tree.find("s", by="name", with_subtree=True)) == ["1", "1.1", "1.2", "1.3", "1.4"]
+        assert ids(tree.find("*", with_subtree=True)) == ids(tree.preorder)
+        assert tree.find("3") == []
+
+        with pytest.raises(ValueError):
+            tree.find("1", by="type")
+
+    def test_dump_load(self, nested_model, tmpdir) -> None:
+        """Test the tree can be saved into a JSON file and rebuilt from it"""
+        tree = OperationTree(nested_model)
+        file_path = tmpdir.join("optree.json").strpath
+        tree.dump(file_path)
+
+        with open(file_path) as f:
+            content = json.load(f)
+        assert content["version"] == TREE_FILE_VERSION
+        assert content["struct_hash"] == f"{tree.struct_hash:016x}"
+        assert len(content["nodes"]) == len(tree.preorder)
+
+        # a structurally identical model with different module names
+        other_model = nn.Sequential(OrderedDict([("seq", deepcopy(nested_model.s)), ("fc", nn.Linear(10, 5))]))
+        loaded_tree = OperationTree(other_model, lazy=True)
+        with patch.object(OperationTree, "_OperationTree__mark_repeat") as mock_mark_repeat:
+            assert loaded_tree.load(file_path)
+            mock_mark_repeat.assert_not_called()
+
+        assert loaded_tree.materialized_num == len(tree.all_nodes)
+        for node, loaded_node in zip(tree.preorder, loaded_tree.preorder):
+            assert loaded_node.node_id == node.node_id
+            assert loaded_node.repeat_winsz == node.repeat_winsz
+            assert loaded_node.repeat_time == node.repeat_time
+            assert loaded_node._is_folded == node._is_folded
+            assert loaded_node._render_when_repeat == node._render_when_repeat
+            assert loaded_node.param.is_measured
+            assert loaded_node.param.TotalNum.val == node.param.TotalNum.val
+        assert loaded_tree.get_node("1.1")._repeat_body == [("1.1", "first_conv"), ("1.2", "first_relu")]
+        assert loaded_tree.get_node_by_name("seq.first_conv") is loaded_tree.get_node("1.1")
+        assert loaded_tree.root.param.TotalNum.val == sum(p.numel() for p in other_model.parameters())
+
+        # the ids of a view are re-rooted
+        view_path = tmpdir.join("view.json").strpath
+        tree.view(tree.get_node("1")).dump(view_path)
+        sub_tree = OperationTree(nested_model.s, lazy=True)
+        assert sub_tree.load(view_path)
+        assert sub_tree.get_node("1")._repeat_body == [("1", "first_conv"), ("2", "first_relu")]
+        assert sub_tree.root.repeat_time == 1
+
+        # invalid files are not loaded
+        assert not OperationTree(nn.Sequential(nn.ReLU()), lazy=True).load(file_path)
+        assert not OperationTree(nested_model, lazy=True).load(tmpdir.join("not_exist.json").strpath)
+        for key, val in (("version", TREE_FILE_VERSION + 1), ("nodes", content["nodes"][:-1]), ("nodes", None)):
+            with open(file_path, "w") as f:
+                json.dump({**content, key: val}, f)
+            assert not OperationTree(nested_model, lazy=True).load(file_path)
+
+    def test_view(self, nested_model) -> None:
+        """Test the subtree view shares nodes with the tree and re-roots ids"""
+        tree = OperationTree(nested_model)
+        root = tree.root
+        child_1 = root.childs["1"]
+
+        assert tree.view(root) is tree
+
+        view = tree.view(child_1)
+        assert isinstance(view, OperationTreeView)
+        assert view.base is tree
+        assert view.root is child_1
+        assert view.all_nodes == tree.subtree(child_1)
+        assert view.postorder == tree.postorder[:5]
+        assert list(view.topology.depth) == [0, 1, 1, 1, 1]
+        assert list(view.topology.subtree_end) == [5, 2, 3, 4, 5]
+        assert repr(view) == "0 s: Sequential"
+
+        # relative ids and names
+        assert [n.relative_id(child_1) for n in view.preorder] == ["0", "1", "2", "3", "4"]
+        assert [n.relative_name(child_1) for n in view.preorder][:2] == ["", "first_conv"]
+        assert view.get_node("0") is child_1
+        assert view.get_node("3") is tree.get_node("1.3")
+        assert view.get_node_by_name("") is child_1
+        assert view.get_node_by_name("second_relu") is tree.get_node("1.4")
+        assert [n.node_id for n in view.find("*_conv", by="name")] == ["1.1", "1.3"]
+        assert [n.node_id for n in view.find("?")] == ["1", "1.1", "1.2", "1.3", "1.4"]
+
+        with pytest.raises(ValueError):
+            view.get_node("5")
+        with pytest.raises(ValueError):
+            view.get_node_by_name("l")
+        with pytest.raises(ValueError):
+            view.subtree(root.childs["2"])
+        with pytest.raises(ValueError):
+            OperationTreeView(tree, OperationNode(module=nn.ReLU()))
+
+        # view of a view
+        subview = view.view(view.get_node("2"))
+        assert subview.base is tree
+        assert subview.all_nodes == [tree.get_node("1.2")]
+
+    def test_lazy_expansion(self, nested_model) -> None:
+        """Test the nodes are materialized only when reached in lazy mode"""
+        lazy_tree = OperationTree(nested_model, lazy=True)
+        root = lazy_tree.root
+
+        assert lazy_tree.materialized_num == 1
+        assert root._childs == OrderedDict()
+        assert not lazy_tree._hash_memo
+
+        # only the nodes along the path are materialized
+        assert lazy_tree.get_node("2").type == "Linear"
+        assert lazy_tree.materialized_num == 3
+        assert not root.childs["1"]._expanded
+
+        assert lazy_tree.get_node("1.3").name == "second_conv"
+        assert lazy_tree.get_node("0") is root
+        assert lazy_tree.materialized_num == 7
+
+        other_lazy_tree = OperationTree(nested_model, lazy=True)
+        assert other_lazy_tree.get_node_by_name("l").node_id == "2"
+        assert other_lazy_tree.materialized_num == 3
+        assert other_lazy_tree.get_node_by_name("s.first_relu").node_id == "1.2"
+        assert other_lazy_tree.materialized_num == 7
+        with pytest.raises(ValueError):
+            other_lazy_tree.get_node_by_name("l.weight")
+
+        with pytest.raises(ValueError):
+            lazy_tree.get_node("3")
+        with pytest.raises(ValueError):
+            lazy_tree.get_node("1.5")
+
+        # full expansion gives the same tree as eager mode
+        eager_tree = OperationTree(nested_model)
+
+        def tree_info(tree):
+            return [
+                (n.node_id, n.name, n.display_root.label, n.repeat_winsz, n.repeat_time, n._is_folded,
+                 n._render_when_repeat, n._repeat_body)
+                for n in tree.preorder
+            ]  # fmt: skip
+
+        assert len(lazy_tree.all_nodes) == len(eager_tree.all_nodes) == 7
+        assert tree_info(lazy_tree) == tree_info(eager_tree)
+        assert len(root.display_root.children) == 2
+        assert len(root.childs["1"].display_root.children) == 4
+
     def test_repr(self, nested_model) -> None:
         """Test __repr__ logic"""
 
@@ -0,0 +1,73 @@
+import pytest
+import torch.nn as nn
+from torch import randn as torch_randn
+from torch.nn.modules.module import _global_forward_hooks, _global_forward_pre_hooks
+
+from torchmeter.hooks import HookDispatcher
+
+
+@pytest.fixture
+def model():
+    return nn.Sequential(nn.Linear(4, 4), nn.ReLU())
+
+
+@pytest.mark.vital
+class TestHookDispatcher:
+    def test_dispatch(self, model) -> None:
+        """Test the hooks are called only for the modules they are added for"""
+        calls = []
+        dispatcher = HookDispatcher()
+        dispatcher.add(model[0], lambda m, ipt: calls.append(("pre", m)), pre=True)
+        dispatcher.add(model[0], lambda m, ipt, opt: calls.append(("post", m)))
+        dispatcher.add(model[1], lambda m, ipt, opt: calls.append(("post", m)))
+
+        # nothing is called outside the `with` block
+        model(torch_randn(1, 4))
+        assert not calls
+
+        with dispatcher:
+            assert dispatcher.is_active
+            assert len(_global_forward_hooks) == len(_global_forward_pre_hooks) == 1
+            model(torch_randn(1, 4))
+            nn.Linear(4, 4)(torch_randn(1, 4))
+
+        assert calls == [("pre", model[0]), ("post", model[0]), ("post", model[1])]
+        assert not model[0]._forward_hooks
+        assert not model[0]._forward_pre_hooks
+
+    def test_exit(self, model) -> None:
+        """Test the global hooks and all added hooks are removed on exit, even if an error is raised"""
+        dispatcher = HookDispatcher()
+        dispatcher.add(model, lambda m, ipt, opt: None)
+
+        with pytest.raises(RuntimeError), dispatcher:
+            model(torch_randn(1, 5))
+
+        assert not dispatcher.is_active
+        assert not _global_forward_hooks
+        assert not _global_forward_pre_hooks
+        assert not dispatcher._HookDispatcher__hooks
+
+    def test_remove(self, model) -> None:
+        """Test removing a hook, even while it is being called"""
+        calls = []
+
+        def once_hook(module, ipt, opt):  # noqa: ARG001
+            calls.append(module)
+            dispatcher.remove(module)
+            module(ipt[0])
+
+        dispatcher = HookDispatcher()
+        dispatcher.add(model[0], once_hook)
+        dispatcher.add(model[0], lambda m, ipt, opt: calls.append("second"))
+        kept_hook = dispatcher.add(model[1], lambda m, ipt, opt: calls.append(m))
+        dropped_hook = dispatcher.add(model[1], lambda m, ipt, opt: calls.append("dropped"))
+        dispatcher.remove(model[1], dropped_hook)
+        dispatcher.remove(model[1], dropped_hook)
+
+        with dispatcher:
+            model(torch_randn(1, 4))
+
+        # the hooks added for a module are called in order, those being iterated are not affected by the removal
+        assert calls == [model[0], "second", model[1]]
+        assert kept_hook is not dropped_hook
@@ -0,0 +1,49 @@
+import pytest
+import torch.nn as nn
+from torch import randn as torch_randn
+
+from torchmeter.core import Meter
+from torchmeter.engine import OperationTree
+from torchmeter.liveness import LivenessReport, trace_liveness
+
+
+class Residual(nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fc = nn.Linear(8, 8)
+
+    def forward(self, x):
+        return self.fc(x) + x
+
+
+@pytest.mark.vital
+class TestTraceLiveness:
+    def test_sequential(self) -> None:
+        """Test the activations are freed once consumed by the next module"""
+        metered_model = Meter(nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4)), device="cpu")
+        with pytest.raises(RuntimeError):
+            metered_model.liveness()
+
+        metered_model(torch_randn(2, 8))
+        report = metered_model.liveness()
+
+        # input: 64, outputs: 128, 128, 32
+        assert report.curve == [("1", 64 + 128), ("2", 64 + 128 + 128), ("3", 64 + 128 + 32), ("0", 64 + 32)]
+        assert report.peak_bytes == 320
+        assert report.peak_node_id == "2"
+        assert report.total_bytes == 352 == metered_model.mem.OutputCost.val + 64
+
+    def test_inplace(self) -> None:
+        """Test an in-place result shares the lifetime of its input"""
+        model = nn.Sequential(nn.Linear(8, 16), nn.ReLU(inplace=True), nn.Linear(16, 4))
+        report = trace_liveness(OperationTree(model), {"args": (torch_randn(2, 8),), "kwargs": {}})
+
+        assert [live for _, live in report.curve] == [192, 192, 224, 96]
+        assert report == LivenessReport(224, "3", 224, report.curve)
+
+    def test_residual(self) -> None:
+        """Test an output not consumed by any module is kept until the enclosing module returns"""
+        report = trace_liveness(OperationTree(Residual()), {"args": (torch_randn(2, 8),), "kwargs": {}})
+
+        assert report.curve == [("1", 64 + 64), ("0", 64 * 3)]
+        assert (report.peak_bytes, report.peak_node_id, report.total_bytes) == (192, "0", 192)
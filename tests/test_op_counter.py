@@ -0,0 +1,108 @@
+import pytest
+import torch.nn as nn
+import torch.nn.functional as F
+from torch import ops as torch_ops
+from torch import randn as torch_randn
+from torch import einsum as torch_einsum
+
+from torchmeter.core import Meter
+from torchmeter.hooks import HookDispatcher
+from torchmeter.engine import OperationTree
+from torchmeter.cal_rules import CalCost
+from torchmeter.op_counter import OpCounter, get_op_rule, register_op_rule, unregister_op_rule
+
+
+class MatMul(nn.Module):
+    """A leaf module without a rule in `torchmeter.cal_rules`"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.weight = nn.Parameter(torch_randn(8, 4))
+
+    def forward(self, x):
+        return x @ self.weight
+
+
+class Attention(nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.qkv = nn.Linear(8, 24)
+        self.proj = MatMul()
+
+    def forward(self, x):
+        q, k, v = self.qkv(x).chunk(3, dim=-1)
+        attn = torch_einsum("bld,bsd->bls", q, k).softmax(dim=-1)
+        return self.proj(attn @ v)
+
+
+class Conv(nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.weight = nn.Parameter(torch_randn(6, 2, 3, 3))
+
+    def forward(self, x):
+        return F.conv2d(x, self.weight, groups=2)
+
+
+def count(model, *ipt):
+    tree = OperationTree(model)
+    dispatcher = HookDispatcher()
+    counter = OpCounter(dispatcher)
+    for node in tree.all_nodes:
+        node.cal.measure(dispatcher=dispatcher, count_ops=True)
+        counter.track(node.operation, node.cal)
+    with dispatcher, counter:
+        model(*ipt)
+    return tree
+
+
+@pytest.mark.vital
+class TestOpCounter:
+    def test_register(self) -> None:
+        """Test registering a rule for an operator packet or overload"""
+        assert get_op_rule(torch_ops.aten.mm.default) is get_op_rule(torch_ops.aten.mm)
+
+        with pytest.raises(TypeError):
+            register_op_rule(torch_ops.aten.relu, "rule")
+
+        @register_op_rule(torch_ops.aten.relu.default)
+        def relu_rule(args, kwargs, opt):  # noqa: ARG001
+            return CalCost(macs=opt.numel(), flops=opt.numel())
+
+        assert get_op_rule(torch_ops.aten.relu) is relu_rule
+        unregister_op_rule(torch_ops.aten.relu)
+        assert get_op_rule(torch_ops.aten.relu) is None
+
+    def test_matmul(self) -> None:
+        """Test the functional calls are attributed to the innermost module"""
+        tree = count(Attention(), torch_randn(2, 5, 8))
+        root, qkv, proj = tree.root, tree.get_node("1"), tree.get_node("2")
+
+        assert not proj.cal.is_not_supported
+        assert proj.cal.Macs.val == 2 * 5 * 4 * 8
+        assert proj.cal.Flops.val == 2 * 5 * 4 * (2 * 8 - 1)
+
+        # the linear layer is measured by its rule, the `addmm` in it is not counted twice
+        assert qkv.cal.Macs.val == 24 * 8
+
+        # einsum and `@` in the forward of the root itself
+        assert root.cal.Macs.val == qkv.cal.Macs.val + proj.cal.Macs.val + 2 * (2 * 5 * 5 * 8)
+
+    def test_conv(self) -> None:
+        """Test the grouped convolution is counted by the weight shape"""
+        tree = count(Conv(), torch_randn(1, 4, 5, 5))
+        assert tree.root.cal.Macs.val == 6 * 3 * 3 * 2 * 3 * 3
+        assert tree.root.cal.Flops.val == 2 * tree.root.cal.Macs.val - 6 * 3 * 3
+
+    def test_meter(self) -> None:
+        """Test the operators are counted only if enabled"""
+        metered_model = Meter(Attention(), device="cpu")
+        metered_model(torch_randn(1, 5, 8))
+        assert metered_model.cal.Macs.val == 24 * 8
+        assert metered_model.optree.get_node("2").cal.is_not_supported
+
+        counted_model = Meter(Attention(), device="cpu", count_ops=True)
+        counted_model(torch_randn(1, 5, 8))
+        assert counted_model.cal.Macs.val == 24 * 8 + 5 * 5 * 8 + 5 * 5 * 8 + 5 * 4 * 8
+        assert not counted_model.optree.get_node("2").cal.is_not_supported
+        assert counted_model.rebase("1").count_ops
@@ -0,0 +1,84 @@
+import torch
+import pytest
+import torch.nn as nn
+from torch import randn as torch_randn
+
+from torchmeter.core import Meter
+from torchmeter.precision import PrecisionCost, precision_breakdown
+
+
+def build_model() -> nn.Module:
+    return nn.Sequential(nn.Linear(8, 16), nn.BatchNorm1d(16), nn.ReLU(), nn.Linear(16, 4))
+
+
+@pytest.mark.vital
+class TestPrecisionBreakdown:
+    def test_breakdown(self) -> None:
+        """Test the costs of a float32 model are attributed to the data types of the tensors"""
+        metered_model = Meter(build_model().eval(), device="cpu")
+        with pytest.raises(RuntimeError):
+            metered_model.precision_breakdown()
+
+        metered_model(torch_randn(2, 8))
+        res = metered_model.precision_breakdown()
+
+        assert set(res) == {"float32", "int64"}
+        assert res["float32"].macs == metered_model.cal.Macs.val
+        assert res["float32"].flops == metered_model.cal.Flops.val
+        assert res["float32"].param_cost == metered_model.mem.ParamCost.val
+        assert res["float32"].output_cost == metered_model.mem.OutputCost.val
+        assert res["float32"].buffer_cost == 16 * 2 * 4  # running mean and var of BatchNorm
+        assert res["int64"] == PrecisionCost(buffer_cost=8)  # num_batches_tracked
+
+    def test_float_projection(self) -> None:
+        """Test a floating point projection casts all floating point costs"""
+        metered_model = Meter(build_model().eval(), device="cpu")
+        metered_model(torch_randn(2, 8))
+        origin = metered_model.precision_breakdown()["float32"]
+
+        res = metered_model.precision_breakdown(torch.bfloat16)
+        assert set(res) == {"bfloat16", "int64"}
+        assert res["bfloat16"].macs == origin.macs
+        assert res["bfloat16"].flops == origin.flops
+        assert res["bfloat16"].param_cost * 2 == origin.param_cost
+        assert res["bfloat16"].output_cost * 2 == origin.output_cost
+        assert metered_model.precision_breakdown("bfloat16") == res
+
+    def test_int_projection(self) -> None:
+        """Test an integer projection only casts the linear and convolutional layers, except for their biases"""
+        model = build_model().eval()
+        metered_model = Meter(model, device="cpu")
+        metered_model(torch_randn(2, 8))
+
+        res = metered_model.precision_breakdown("qint8")
+        linear_macs = 8 * 16 + 16 * 4
+        linear_weights = 8 * 16 + 16 * 4
+        assert res["qint8"].macs == linear_macs
+        assert res["qint8"].param_cost == linear_weights
+        assert res["qint8"].output_cost == 2 * (16 + 4)
+        assert res["float32"].macs == metered_model.cal.Macs.val - linear_macs
+        assert res["float32"].param_cost == metered_model.mem.ParamCost.val - linear_weights * 4
+
+    def test_quantized(self) -> None:
+        """Test the quantized modules are counted as integer operations with their packed weights"""
+        nnq = pytest.importorskip("torch.ao.nn.quantized")
+
+        model = nn.Sequential(nnq.Quantize(0.1, 0, torch.quint8), nnq.Linear(8, 16), nnq.DeQuantize())
+        metered_model = Meter(model, device="cpu")
+        metered_model(torch_randn(2, 8))
+
+        res = metered_model.precision_breakdown()
+        assert res["quint8"].macs == 8 * 16
+        assert res["quint8"].output_cost >= 2 * 16
+        assert res["qint8"].param_cost == 8 * 16
+        assert res["float32"].param_cost == 16 * 4  # bias
+
+    def test_invalid(self) -> None:
+        """Test the invalid data type"""
+        metered_model = Meter(build_model(), device="cpu")
+        metered_model(torch_randn(2, 8))
+
+        with pytest.raises(TypeError):
+            metered_model.precision_breakdown("Tensor")
+        with pytest.raises(TypeError):
+            precision_breakdown(metered_model.optree, dtype=8)
@@ -0,0 +1,76 @@
+import torch
+import pytest
+import torch.nn as nn
+import torch.nn.utils.prune as prune
+from torch import randn as torch_randn
+
+from torchmeter.core import Meter
+from torchmeter.engine import OperationTree
+from torchmeter.sparsity import SparsityCost, sparsity_analysis
+
+
+@pytest.mark.vital
+class TestSparsityAnalysis:
+    def test_pruned(self) -> None:
+        """Test the masks of the pruned weights are applied and the costs in each format"""
+        model = nn.Sequential(nn.Linear(8, 16), nn.ReLU(), nn.Linear(16, 4))
+        prune.l1_unstructured(model[0], "weight", amount=0.5)
+
+        metered_model = Meter(model, device="cpu")
+        with pytest.raises(RuntimeError):
+            metered_model.sparsity()
+
+        metered_model(torch_randn(2, 8))
+        res = metered_model.sparsity()
+        assert set(res) == {"1", "3"}  # ReLU and the container have no weights
+
+        pruned = res["1"]
+        assert (pruned.numel, pruned.nonzero, pruned.density) == (128, 64, 0.5)
+        assert pruned.macs == 8 * 16
+        assert pruned.effective_macs == 8 * 16 // 2
+        assert pruned.dense_bytes == 128 * 4
+        assert pruned.coo_bytes == 64 * (4 + 2 * 8)
+        assert pruned.csr_bytes == 64 * (4 + 8) + 17 * 8
+        assert pruned.bitmask_bytes == 128 // 8 + 64 * 4
+
+        dense = res["3"]
+        assert dense.density == 1
+        assert dense.effective_macs == dense.macs == 16 * 4
+        assert dense.semi_structured_bytes is None
+
+        # the same after the pruning is made permanent
+        prune.remove(model[0], "weight")
+        assert sparsity_analysis(metered_model.optree)["1"] == pruned
+
+    def test_semi_structured(self) -> None:
+        """Test the weights following the 2:4 pattern and the modules not bound by the weights"""
+        model = nn.Sequential(nn.Conv2d(4, 8, 1), nn.BatchNorm2d(8), nn.Flatten(), nn.Linear(32, 4))
+        with torch.no_grad():
+            model[0].weight.view(-1, 4)[:, :2] = 0
+            model[3].weight.view(-1, 4)[:, 1:] = 0
+
+        optree = OperationTree(model)
+        for node in optree.all_nodes:
+            node.cal.measure()
+        model.eval()(torch_randn(1, 4, 2, 2))
+        res = sparsity_analysis(optree)
+        assert set(res) == {"1", "4"}  # the weights of BatchNorm have 1 dimension
+
+        conv = res["1"]
+        assert conv.density == 0.5
+        assert conv.effective_macs * 2 == conv.macs == 4 * 8 * 2 * 2
+        assert conv.semi_structured_bytes == 16 * 4 + 16 * 2 // 8
+
+        linear = res["4"]
+        assert linear.density == 0.25
+        assert linear.semi_structured_bytes == 64 * 4 + 64 * 2 // 8
+        assert isinstance(linear, SparsityCost)
+
+    def test_meta_device(self) -> None:
+        """Test the sparsity can't be analyzed on the meta device, whose weights have no values"""
+        metered_model = Meter(nn.Linear(8, 4), device="meta")
+        metered_model(torch_randn(2, 8))
+        assert metered_model.cal.Macs.val == 8 * 4
+
+        with pytest.raises(RuntimeError, match="meta"):
+            metered_model.sparsity()
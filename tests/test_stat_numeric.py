@@ -232,6 +232,7 @@ class TestUpperLinkData:
         base_upperlink_data.mark_access()
         base_upperlink_data.mark_access()
         assert base_upperlink_data._UpperLinkData__access_cnt == 3
+        assert base_upperlink_data.access_cnt == 3
 
     def test_inplace_addition(self, base_upperlink_data) -> None:
         """Test inplace addition"""
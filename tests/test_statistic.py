@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, PropertyMock, patch
 import numpy as np
 import pytest
 import torch.nn as nn
+from torch import Size
 from torch import int8 as torch_int8
 from torch import ones as torch_ones
 from torch import int16 as torch_int16
@@ -17,7 +18,9 @@ from torch import float64 as torch_float64
 from torch.cuda import is_available as is_cuda
 from pympler.asizeof import asizeof
 
+from torchmeter.hooks import HookDispatcher
 from torchmeter.engine import OperationNode, OperationTree
+from torchmeter.cal_rules import get_cal_rule
 from torchmeter.statistic import (
     CalMeter,
     MemMeter,
@@ -30,6 +33,8 @@ from torchmeter.statistic import (
     MetricsData,
     ParamsMeter,
     UpperLinkData,
+    TimingOverhead,
+    calibrate_overhead,
 )
 
 pytestmark = pytest.mark.vital
@@ -477,29 +482,33 @@ class TestCalMeter:
             (nn.Sequential(nn.Identity()), "__container_hook"),
             (nn.ModuleList([nn.Identity()]), "__container_hook"),
             (nn.ModuleDict({"example": nn.Identity()}), "__container_hook"),
-            (nn.Conv1d(10, 5, 3), "__conv_hook"),
-            (nn.Conv2d(10, 5, 3), "__conv_hook"),
-            (nn.Conv3d(10, 5, 3), "__conv_hook"),
-            (nn.Linear(10, 5), "__linear_hook"),
-            (nn.BatchNorm1d(10), "__BN_hook"),
-            (nn.BatchNorm2d(10), "__BN_hook"),
-            (nn.BatchNorm3d(10), "__BN_hook"),
-            (nn.MaxPool1d(3), "__pool_hook"),
-            (nn.MaxPool2d(3), "__pool_hook"),
-            (nn.MaxPool3d(3), "__pool_hook"),
-            (nn.AvgPool1d(3), "__pool_hook"),
-            (nn.AvgPool2d(3), "__pool_hook"),
-            (nn.AvgPool3d(3), "__pool_hook"),
-            (nn.Sigmoid(), "__activate_hook"),
-            (nn.Tanh(), "__activate_hook"),
-            (nn.ReLU(), "__activate_hook"),
-            (nn.ReLU6(), "__activate_hook"),
-            (nn.SiLU(), "__activate_hook"),
-            (nn.PReLU(), "__activate_hook"),
-            (nn.RReLU(), "__activate_hook"),
-            (nn.LeakyReLU(), "__activate_hook"),
-            (nn.Dropout(0.5), "__not_support_hook"),
-            (nn.AdaptiveAvgPool1d(1), "__not_support_hook"),
+            (nn.Conv1d(10, 5, 3), "__rule_hook"),
+            (nn.Conv2d(10, 5, 3), "__rule_hook"),
+            (nn.Conv3d(10, 5, 3), "__rule_hook"),
+            (nn.Linear(10, 5), "__rule_hook"),
+            (nn.BatchNorm1d(10), "__rule_hook"),
+            (nn.BatchNorm2d(10), "__rule_hook"),
+            (nn.BatchNorm3d(10), "__rule_hook"),
+            (nn.MaxPool1d(3), "__rule_hook"),
+            (nn.MaxPool2d(3), "__rule_hook"),
+            (nn.MaxPool3d(3), "__rule_hook"),
+            (nn.AvgPool1d(3), "__rule_hook"),
+            (nn.AvgPool2d(3), "__rule_hook"),
+            (nn.AvgPool3d(3), "__rule_hook"),
+            (nn.Sigmoid(), "__rule_hook"),
+            (nn.Tanh(), "__rule_hook"),
+            (nn.ReLU(), "__rule_hook"),
+            (nn.ReLU6(), "__rule_hook"),
+            (nn.SiLU(), "__rule_hook"),
+            (nn.PReLU(), "__rule_hook"),
+            (nn.RReLU(), "__rule_hook"),
+            (nn.LeakyReLU(), "__rule_hook"),
+            (nn.Dropout(0.5), "__rule_hook"),
+            (nn.GELU(), "__rule_hook"),
+            (nn.LayerNorm(10), "__rule_hook"),
+            (nn.AdaptiveAvgPool1d(1), "__rule_hook"),
+            (nn.ConvTranspose2d(10, 5, 3), "__rule_hook"),
+            (nn.Upsample(scale_factor=2), "__rule_hook"),
             (nn.Identity(), "__not_support_hook"),
         ],
     )
@@ -512,6 +521,8 @@ class TestCalMeter:
         assert cal_meter.is_measured
         assert len(module._forward_hooks) == 1
         assert next(iter(module._forward_hooks.values())).__name__ == target_hook
+        if target_hook == "__rule_hook":
+            assert cal_meter._CalMeter__rule is get_cal_rule(type(module))
 
     def test_measure_cache(self, simple_model_root) -> None:
         """Test whether the measure method will be revisited after the first call"""
@@ -687,8 +698,10 @@ class TestCalMeter:
             (nn.PReLU(), (1, 10), (1, 10), 20, 40),
             (nn.RReLU(), (1, 10), (1, 10), 20, 40),
             (nn.LeakyReLU(), (1, 10), (1, 10), 20, 40),
-            (nn.Dropout(0.5), (1, 10), (1, 10), 0, 0),
-            (nn.AdaptiveAvgPool1d(1), (1, 32, 8), (1, 32, 1), 0, 0),
+            (nn.Dropout(0.5), (1, 10), (1, 10), 10, 10),
+            (nn.LayerNorm(10), (1, 10), (1, 10), 30, 70),
+            (nn.Softmax(dim=-1), (1, 10), (1, 10), 30, 50),
+            (nn.AdaptiveAvgPool1d(1), (1, 32, 8), (1, 32, 1), 32 * 7, 32 * 15),
             (nn.Identity(), (1, 10), (1, 10), 0, 0),
         ],
     )
@@ -705,7 +718,8 @@ class TestCalMeter:
             list(map(lambda x: x.cal.measure(), oproot.childs.values()))
         opt = module(torch_randn(*ipt_shape))
         assert tuple(opt.shape) == expected_opt_shape
-        assert len(cal_meter._CalMeter__stat_ls) == 1
+        assert not cal_meter._CalMeter__stat_ls  # built on access
+        assert len(cal_meter.detail_val) == 1
 
         assert cal_meter.Macs.val == expected_macs
         assert cal_meter.Flops.val == expected_flops
@@ -730,6 +744,21 @@ class TestCalMeter:
         with pytest.raises(AttributeError):
             del cal_meter.is_not_supported
 
+    def test_deferred_format(self) -> None:
+        """Test the hooks only record the shapes, which are formatted on accessing the detail rows"""
+        oproot = OperationTree(nn.Linear(10, 5)).root
+        cal_meter = oproot.cal
+        cal_meter.measure()
+
+        with patch.object(CalMeter, "_CalMeter__iopt_repr", side_effect=str) as mock_repr:
+            oproot.operation(torch_randn(2, 10))
+            mock_repr.assert_not_called()
+            assert cal_meter._CalMeter__raw_row[2:] == ((Size([2, 10]),), Size([2, 5]))
+
+            cal_meter.detail_val
+            cal_meter.detail_val
+            assert mock_repr.call_count == 2
+
 
 @pytest.mark.usefixtures("toggle_to_mem")
 class TestMemMeter:
@@ -985,6 +1014,9 @@ class TestMemMeter:
             ((torch_randn(1, 2, 3, dtype=torch_float64), None), 6 * 8 + 16),
             ((torch_randn(1, 2, 3, dtype=torch_float16), np.array([1, 2, 3], dtype=np.int8)), 6 * 2 + 1 * 3),
             ((torch_randn(1, 2, 3, dtype=torch_float64), torch_ones(1, 2, 3, dtype=torch_int64)), 6 * 8 + 6 * 8),
+            # nested tensors, e.g. the hidden and cell states of LSTM
+            ((torch_randn(2, 3), (torch_ones(1, 3), torch_ones(1, 3))), 6 * 4 + 2 * 3 * 4),
+            ((1, [torch_ones(1, 3), None]), 32 + 3 * 4),
         ],
     )
     def test_multi_output_handling(self, opts, expected_opt_cost) -> None:
@@ -1130,14 +1162,15 @@ class TestMemMeter:
         if not oproot.is_leaf:
             list(map(lambda x: x.mem.measure(), oproot.childs.values()))
         module(torch_randn(*ipt_shape))
-        assert len(mem_meter._MemMeter__stat_ls) == 1
+        assert not mem_meter._MemMeter__stat_ls  # built on access
+        assert len(mem_meter.detail_val) == 1
 
         assert mem_meter.ParamCost.val == expected_param_cost
         assert mem_meter.BufferCost.val == expected_buffer_cost
         assert mem_meter.OutputCost.val == expected_output_cost
         assert mem_meter.TotalCost.val == expected_param_cost + expected_buffer_cost + expected_output_cost
 
-        record = mem_meter._MemMeter__stat_ls[0]
+        record = mem_meter.detail_val[0]
         if not oproot.is_leaf:
             assert all(
                 isinstance(getattr(record, field), UpperLinkData)
@@ -1398,3 +1431,47 @@ class TestIttpMeter:
                 message="No Nvidia GPU detected on this device, "
                 + "the test of ittp measuring logic on GPU will be skipped.",
             )
+
+    def test_calibrate_overhead(self) -> None:
+        """Test the self-cost of the benchmark is calibrated"""
+        overhead = calibrate_overhead(torch_device("cpu"), repeat=5)
+        assert isinstance(overhead, TimingOverhead)
+        assert overhead.timer >= 0
+        assert overhead.hook >= 0
+
+        with patch("torchmeter.statistic.perf_counter") as cpu_timer:
+            cpu_timer.side_effect = [0, 1] * 5 + [0, 3] * 5 + [0, 7] * 5
+            assert calibrate_overhead(torch_device("cpu"), repeat=5) == TimingOverhead(timer=1, hook=4)
+
+    def test_overhead_subtraction(self) -> None:
+        """Test the overhead is subtracted from each run and its fraction is reported"""
+        model = nn.Sequential(nn.Linear(10, 5), nn.ReLU())
+        optree = OperationTree(model)
+        ittp_meter = optree.root.ittp
+        dispatcher = HookDispatcher()
+        overhead = TimingOverhead(timer=1, hook=0.5)
+
+        ittp_meter.measure(device=torch_device("cpu"), repeat=3, dispatcher=dispatcher, overhead=overhead)
+        with dispatcher, patch("torchmeter.statistic.perf_counter") as cpu_timer:
+            cpu_timer.side_effect = [0, 4, 0, 5, 0, 6]
+            model(torch_randn(1, 10))
+
+        # the timer, and the global hooks of 3 modules
+        assert ittp_meter.InferTime.vals.tolist() == [1.5, 2.5, 3.5]
+        assert ittp_meter.overhead_ratio == pytest.approx(2.5 / 5)
+        assert ittp_meter.detail_val[0].Overhead == "50.0%"
+        assert "50.0%" in "".join(ittp_meter.crucial_data.values())
+
+        # never below zero
+        leaf_meter = optree.get_node("1").ittp
+        leaf_meter.measure(device=torch_device("cpu"), repeat=1, overhead=TimingOverhead(timer=2, hook=0))
+        with patch("torchmeter.statistic.perf_counter") as cpu_timer:
+            cpu_timer.side_effect = [0, 1]
+            model[0](torch_randn(1, 10))
+        assert 0 < leaf_meter.InferTime.vals[0] < 1e-6
+        assert leaf_meter.overhead_ratio == 1
+
+        # extrapolated from the source
+        twin_meter = OperationNode(nn.Linear(10, 5)).ittp
+        twin_meter.extrapolate(leaf_meter)
+        assert twin_meter.overhead_ratio == 1
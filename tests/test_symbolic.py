@@ -0,0 +1,80 @@
+from fractions import Fraction
+
+import pytest
+import torch.nn as nn
+from torch import randn as torch_randn
+
+from torchmeter.core import Meter
+from torchmeter.engine import OperationTree
+from torchmeter.symbolic import Formula, trace_formulas
+
+
+class SelfAttnScore(nn.Module):
+    def forward(self, x):
+        return x @ x.transpose(-1, -2)
+
+
+@pytest.mark.vital
+class TestFormula:
+    def test_eval(self) -> None:
+        """Test the formula is evaluated exactly"""
+        f = Formula(("B", "L"), {(1, 2): Fraction(2), (1, 1): Fraction(64), (0, 0): Fraction(0)})
+        assert f(B=8, L=512) == 2 * 8 * 512**2 + 64 * 8 * 512
+        assert Formula(("B",), {(1,): Fraction(1, 2)})(B=3) == 1.5
+        assert f.terms == {(1, 2): 2, (1, 1): 64}
+
+        with pytest.raises(ValueError):
+            f(B=8)
+
+    def test_repr(self) -> None:
+        """Test the formula is shown as a valid python expression"""
+        f = Formula(("B", "L"), {(1, 2): Fraction(2), (1, 1): Fraction(1), (0, 0): Fraction(-3, 2)})
+        assert str(f) == "2*B*L**2 + B*L - (3/2)"
+        assert eval(str(f), {"B": 2, "L": 3}) == f(B=2, L=3)
+        assert str(Formula(("B",), {(1,): Fraction(-1)})) == "-B"
+        assert str(Formula(("B",), {})) == "0"
+
+
+@pytest.mark.vital
+class TestTraceFormulas:
+    def test_linear_dims(self) -> None:
+        """Test the formulas of each node are solved from the samples"""
+        model = nn.Sequential(nn.Linear(8, 16), nn.ReLU())
+        ipt = {"args": (torch_randn(2, 3, 8),), "kwargs": {}}
+        formulas = trace_formulas(OperationTree(model), ipt, dims={"B": (0, 0), "L": (0, 1)})
+
+        assert str(formulas["1"]["Macs"]) == "128"
+        assert str(formulas["2"]["Macs"]) == "16*B*L"
+        assert formulas["0"]["OutputCost"](B=5, L=7) == 2 * 5 * 7 * 16 * 4
+        assert formulas["0"]["Flops"] == Formula(("B", "L"), {(0, 0): Fraction(16 * 16), (1, 1): Fraction(16)})
+
+    def test_meter(self) -> None:
+        """Test the quadratic cost of the operators and the measurements of the meter are left untouched"""
+        metered_model = Meter(SelfAttnScore(), device="cpu", count_ops=True)
+        with pytest.raises(RuntimeError):
+            metered_model.formulas({"L": (0, 1)})
+
+        metered_model(torch_randn(1, 4, 8))
+        macs = metered_model.cal.Macs.val
+        formulas = metered_model.formulas({"B": (0, 0), "L": (0, 1)})
+        assert str(formulas["0"]["Macs"]) == "8*B*L**2"
+        assert metered_model.cal.Macs.val == macs
+
+    def test_invalid(self) -> None:
+        """Test invalid dimensions and the warning on a non-polynomial cost"""
+        optree = OperationTree(nn.Conv2d(1, 1, 3, stride=2))
+        ipt = {"args": (torch_randn(1, 1, 5, 5),), "kwargs": {"scale": 1}}
+
+        with pytest.raises(ValueError):
+            trace_formulas(optree, ipt, dims={})
+        with pytest.raises(ValueError):
+            trace_formulas(optree, ipt, dims={"H": (0, 2)}, degree=0)
+        with pytest.raises(ValueError):
+            trace_formulas(optree, ipt, dims={"H": (1, 2)})
+        with pytest.raises(ValueError):
+            trace_formulas(optree, ipt, dims={"H": ("scale", 0)})
+        with pytest.raises(ValueError):
+            trace_formulas(optree, ipt, dims={"H": (0, 4)})
+
+        with pytest.warns(RuntimeWarning):
+            trace_formulas(optree, {"args": ipt["args"], "kwargs": {}}, dims={"H": (0, 2)}, degree=1)
@@ -11,7 +11,16 @@ from torch import rand as torch_rand
 from rich.text import Text
 from numpy.random import rand as np_rand
 
-from torchmeter.utils import Timer, Status, hasargs, data_repr, indent_str, resolve_savepath, match_polars_type
+from torchmeter.utils import (
+    Timer,
+    Status,
+    hasargs,
+    data_repr,
+    indent_str,
+    input_signature,
+    resolve_savepath,
+    match_polars_type,
+)
 from torchmeter._stat_numeric import MetricsData, UpperLinkData
 
 
@@ -439,6 +448,29 @@ class TestDataRepr:
         assert data_repr(mock_obj) == "[b green]obj[/] [dim]<unittest.mock.Mock>[/]"
 
 
+@pytest.mark.vital
+class TestInputSignature:
+    def test_hashable(self) -> None:
+        """Test the signature of any input is hashable"""
+        ipt = ((torch_rand(1, 3), [1, "a", None]), {"mask": np_rand(2, 2), "cfg": {"k": [1]}})
+        hash(input_signature(ipt))
+
+    def test_shape_based(self) -> None:
+        """Test the data with a shape is summarized by its meta info instead of its value"""
+        assert input_signature((torch_rand(1, 3),)) == input_signature((torch_rand(1, 3),))
+        assert input_signature((torch_rand(1, 3),)) != input_signature((torch_rand(2, 3),))
+        assert input_signature((torch_rand(1, 3),)) != input_signature((torch_rand(1, 3).half(),))
+        assert input_signature(np_rand(1, 3)) != input_signature(torch_rand(1, 3))
+
+    def test_value_based(self) -> None:
+        """Test the other data is summarized by its type and hashable value"""
+        assert input_signature((1, "a")) == input_signature((1, "a"))
+        assert input_signature((1,)) != input_signature((2,))
+        assert input_signature((1,)) != input_signature([1])
+        assert input_signature({"a": 1}) != input_signature({"a": 1.5})
+        assert input_signature(bytearray(b"a")) == input_signature(bytearray(b"b"))
+
+
 @pytest.mark.vital
 class TestMatchPolarsType:
     is_same_type = lambda _, val, pl_type: match_polars_type(val).is_(pl_type)
@@ -55,5 +55,6 @@ __version__ = "0.1.0"
 
 from torchmeter.core import Meter
 from torchmeter.config import get_config
+from torchmeter.cal_rules import register_cal_rule
 
-__all__ = ["Meter", "get_config"]
+__all__ = ["Meter", "get_config", "register_cal_rule"]
@@ -122,6 +122,10 @@ class UpperLinkData(NumericData):
     def raw_data(self) -> float:
         return float(self.val)
 
+    @property
+    def access_cnt(self) -> int:
+        return self.__access_cnt
+
     def mark_access(self) -> None:
         self.__access_cnt += 1
 
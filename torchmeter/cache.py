@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from hashlib import blake2b
+from contextlib import suppress
+
+from torchmeter.config import get_config
+
+if TYPE_CHECKING:
+    from typing import List
+
+    import torch.nn as nn
+
+    from torchmeter.engine import OperationTree
+
+__all__ = ["tree_cache_dir", "load_cached_tree", "save_cached_tree", "clear_tree_cache"]
+
+CACHE_FILE_EXT = ".optree.json"
+
+
+def tree_cache_dir() -> str:
+    """The directory of the cached operation trees, set by `tree_cache.cache_dir` in the global config.
+
+    Returns:
+        str: The absolute path of the directory, defaults to `~/.cache/torchmeter`.
+    """
+    cache_dir = get_config().tree_cache.cache_dir
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "torchmeter")
+    return os.path.abspath(os.path.expanduser(cache_dir))
+
+
+def tree_cache_key(model: nn.Module, struct_hash: int) -> str:
+    """The key of a model in the cache. Besides the structural hash, the shape and `requires_grad` flag of each
+    parameter are taken into account, since they are cached along with the tree but not covered by the hash.
+
+    Args:
+        model (nn.Module): The model whose operation tree is cached.
+        struct_hash (int): The structural hash of `model`, see `torchmeter.engine.module_struct_hash`.
+
+    Returns:
+        str: A hex string.
+    """
+    hasher = blake2b(struct_hash.to_bytes(8, "little"), digest_size=16)
+    hasher.update(repr([(tuple(p.shape), p.requires_grad) for p in model.parameters()]).encode())
+    return hasher.hexdigest()
+
+
+def tree_cache_path(optree: OperationTree) -> str:
+    """The path of the cache file of an operation tree, see `tree_cache_key()`.
+
+    Args:
+        optree (OperationTree): The operation tree, whose model has been hashed.
+
+    Returns:
+        str: The absolute path of the cache file, which may not exist.
+    """
+    return os.path.join(tree_cache_dir(), tree_cache_key(optree.root.operation, optree.struct_hash) + CACHE_FILE_EXT)
+
+
+def load_cached_tree(optree: OperationTree) -> bool:
+    """Rebuild an operation tree from the cache if a structurally identical model has been cached, the hit file
+    is marked as the most recently used one.
+
+    Args:
+        optree (OperationTree): The tree to be rebuilt, whose model has been hashed.
+
+    Returns:
+        bool: Whether the tree is rebuilt from the cache.
+    """
+    file_path = tree_cache_path(optree)
+    if not os.path.isfile(file_path) or not optree.load(file_path):
+        return False
+
+    with suppress(OSError):
+        os.utime(file_path)
+    return True
+
+
+def save_cached_tree(optree: OperationTree) -> None:
+    """Save a fully built operation tree into the cache, then remove the least recently used files if the number
+    of cached files exceeds `tree_cache.max_entries` in the global config. Failures in writing are ignored, as the
+    cache is only an accelerator.
+
+    Args:
+        optree (OperationTree): The tree to be cached.
+    """
+    file_path = tree_cache_path(optree)
+    cache_dir = os.path.dirname(file_path)
+
+    # write to a temporary file first, so that a concurrent reader never sees a partially written file
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        optree.dump(tmp_path)
+        os.replace(tmp_path, file_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    max_entries = get_config().tree_cache.max_entries
+    try:
+        cached_files = list_cached_files(cache_dir)
+    except OSError:  # removed by another process in the meantime
+        return
+
+    for stale_file in cached_files[: max(len(cached_files) - max_entries, 0)]:
+        with suppress(OSError):
+            os.remove(stale_file)
+
+
+def clear_tree_cache() -> None:
+    """Remove all the cached operation trees."""
+    cache_dir = tree_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+
+    for cached_file in list_cached_files(cache_dir):
+        os.remove(cached_file)
+
+
+def list_cached_files(cache_dir: str) -> List[str]:
+    """List the cached files in `cache_dir` from the least recently used to the most recently used one.
+
+    Returns:
+        List[str]: The paths of the cached files.
+    """
+    cached_files = [
+        os.path.join(cache_dir, file_name) for file_name in os.listdir(cache_dir) if file_name.endswith(CACHE_FILE_EXT)
+    ]
+    return sorted(cached_files, key=os.path.getmtime)
@@ -0,0 +1,659 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from operator import mul
+from functools import reduce, partial
+from threading import Lock
+from contextlib import suppress
+from collections import OrderedDict, namedtuple
+
+import torch.nn as nn
+from torch.nn.utils.rnn import PackedSequence
+
+if TYPE_CHECKING:
+    import sys
+
+    if sys.version_info >= (3, 10):
+        from typing import TypeAlias
+    else:
+        from typing_extensions import TypeAlias
+
+    from typing import Any, Set, Dict, Type, Tuple, Union, Callable, Optional
+
+    CAL_RULE_TYPE: TypeAlias = Callable[[nn.Module, Tuple[Any, ...], Any], "CalCost"]
+
+__all__ = [
+    "CalCost",
+    "CalRuleRegistry",
+    "CalCostCache",
+    "register_cal_rule",
+    "unregister_cal_rule",
+    "get_cal_rule",
+    "cal_cache_info",
+    "clear_cal_cache",
+]
+
+CalCost = namedtuple("CalCost", ["macs", "flops", "kernel_size", "bias", "steps"], defaults=(None, None, None))
+CalCost.__doc__ = """The calculation cost of a single call of a module, returned by a rule in `CalRuleRegistry`.
+
+Attributes:
+    macs (Union[int, float]): The number of multiply-accumulate operations.
+    flops (Union[int, float]): The number of floating point operations.
+    kernel_size (Optional[List[int]]): The kernel size shown in the table, `None` if not applicable.
+    bias (Optional[bool]): Whether a bias is added, shown in the table, `None` if not applicable.
+    steps (Optional[int]): The number of timesteps of a recurrent module, whose cost is then shown per timestep
+                           in the table as if the module was called once per timestep, `None` if not applicable.
+"""
+
+
+class CalRuleRegistry:
+    """
+    A registry that maps module types to the rules computing their calculation cost, used by `CalMeter` to
+    measure leaf modules. A rule is a callable taking the module, its positional inputs and its output of a
+    forward call, and returning a `CalCost`.
+
+    The rule of a module type is looked up along its MRO, so a rule registered for a base class applies to all
+    its subclasses unless they have their own. The lookup result is cached per type, so that resolving the rule
+    of a module costs a single dict lookup.
+
+    A rule registered for a module with submodules only counts what is computed outside the submodules called in
+    its forward, the costs of which are added on top of it. E.g. the rule of `nn.MultiheadAttention` counts the
+    output projection as well, since `out_proj` is not called but its weights are used directly.
+
+    The cost of a leaf module is cached and shared by the structurally identical modules seeing the same input (see
+    `CalCostCache`), so a rule should only depend on the input, the configuration shown in the repr of the module
+    and `module.training`. A rule reading any other state of the module (e.g. an attribute out of its
+    `extra_repr()`) should be registered with `cacheable=False`.
+
+    Example:
+        ```python
+        import torch.nn as nn
+        from torchmeter.cal_rules import CalCost, register_cal_rule
+
+        class Scale(nn.Module):
+            def forward(self, x):
+                return x * 2
+
+        @register_cal_rule(Scale)
+        def scale_rule(module, ipt, opt):
+            return CalCost(macs=opt.numel(), flops=opt.numel())
+        ```
+    """
+
+    def __init__(self) -> None:
+        self.__rules: Dict[Type[nn.Module], CAL_RULE_TYPE] = {}
+        self.__resolved: Dict[Type[nn.Module], Optional[CAL_RULE_TYPE]] = {}  # cache of `resolve()`
+        self.__uncacheable: Set[CAL_RULE_TYPE] = set()  # rules registered with `cacheable=False`
+
+    def register(
+        self,
+        module_type: Union[Type[nn.Module], Tuple[Type[nn.Module], ...]],
+        rule: Optional[CAL_RULE_TYPE] = None,
+        cacheable: bool = True,
+    ) -> Any:
+        """Register a rule for one or more module types, the existing rules of them are overwritten. It can be
+        used as a decorator if `rule` is omitted.
+
+        Args:
+            module_type (Union[Type[nn.Module], Tuple[Type[nn.Module], ...]]): A subclass of `nn.Module`, or a
+                                                                               tuple of them.
+            rule (Optional[CAL_RULE_TYPE]): The rule, see `CalRuleRegistry`. Defaults to `None`.
+            cacheable (bool): Whether the costs computed by the rule can be shared via `CalCostCache`, which should
+                              be `False` if the rule depends on any state of the module not shown in its repr.
+                              It applies to the rule wherever it is registered. Defaults to `True`.
+
+        Returns:
+            Any: `rule` itself, or a decorator registering the decorated function if `rule` is omitted.
+
+        Raises:
+            TypeError: If `module_type` is not a subclass of `nn.Module` (or a tuple of them), or `rule` is not
+                       callable.
+        """
+        if rule is None:
+            return partial(self.register, module_type, cacheable=cacheable)
+
+        module_types = module_type if isinstance(module_type, tuple) else (module_type,)
+        for mtype in module_types:
+            if not isinstance(mtype, type) or not issubclass(mtype, nn.Module):
+                raise TypeError(f"`module_type` must be a subclass of `nn.Module`, but got `{mtype}`.")
+        if not callable(rule):
+            raise TypeError(f"`rule` must be callable, but got `{type(rule).__name__}`.")
+
+        for mtype in module_types:
+            self.__rules[mtype] = rule
+        if cacheable:
+            self.__uncacheable.discard(rule)
+        else:
+            self.__uncacheable.add(rule)
+        self.__resolved.clear()
+        return rule
+
+    def unregister(self, module_type: Type[nn.Module]) -> None:
+        """Remove the rule registered for `module_type`, do nothing if there is not one. Its subclasses fall back
+        to the rule of the next base class in the MRO.
+
+        Args:
+            module_type (Type[nn.Module]): The module type whose rule is removed.
+        """
+        if self.__rules.pop(module_type, None) is not None:
+            self.__resolved.clear()
+
+    def resolve(self, module_type: Type[nn.Module]) -> Optional[CAL_RULE_TYPE]:
+        """Get the rule of a module type, which is the rule registered for the first class in its MRO.
+
+        Args:
+            module_type (Type[nn.Module]): The type of the module to be measured.
+
+        Returns:
+            Optional[CAL_RULE_TYPE]: The rule, `None` if the module type is not supported.
+        """
+        try:
+            return self.__resolved[module_type]
+        except KeyError:
+            rule = next((self.__rules[cls] for cls in module_type.__mro__ if cls in self.__rules), None)
+            self.__resolved[module_type] = rule
+            return rule
+
+    def is_cacheable(self, rule: CAL_RULE_TYPE) -> bool:
+        """Whether the costs computed by a rule can be cached, see the `cacheable` argument of `register()`.
+
+        Args:
+            rule (CAL_RULE_TYPE): A rule registered in the registry.
+
+        Returns:
+            bool: `False` if the rule is registered with `cacheable=False`, otherwise `True`.
+        """
+        return rule not in self.__uncacheable
+
+    def __contains__(self, module_type: Type[nn.Module]) -> bool:
+        return self.resolve(module_type) is not None
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CalCostCache:
+    """
+    A size-bounded LRU cache of the calculation cost computed by the rules in `CalRuleRegistry`, so that the
+    structurally identical modules seeing the same input are computed only once in the process, no matter whether
+    they are in the same model, in different `Meter` instances or measured again after the input changes.
+
+    `CalMeter` keys an entry by the rule, the structural hash of the module (i.e. its type and configuration, see
+    `torchmeter.engine.module_struct_hash`), whether the module is in training mode and the signatures of the input
+    and the output (see `torchmeter.utils.input_signature`). The output tells the configuration missing from the
+    `extra_repr()` of a module, e.g. the `ceil_mode` of `nn.AvgPool2d`. So a custom rule should only depend on
+    these, otherwise it should be registered with `cacheable=False` to be computed for each module, see
+    `CalRuleRegistry.register()`.
+
+    Example:
+        ```python
+        from torchmeter.cal_rules import cal_cache_info, clear_cal_cache
+
+        print(cal_cache_info())  # CacheInfo(hits=..., misses=..., maxsize=4096, currsize=...)
+        clear_cal_cache()
+        ```
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.__data: OrderedDict[Any, CalCost] = OrderedDict()
+        self.__lock = Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of entries, the least recently used ones are evicted when exceeded."""
+        return self.__maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(f"`maxsize` must be a non-negative integer, but got `{maxsize}`.")
+        self.__maxsize = maxsize
+        with self.__lock:
+            self.__evict()
+
+    def get(self, key: Any) -> Optional[CalCost]:
+        """Get the entry of `key` and mark it as the most recently used one, update the hit/miss counters.
+
+        Args:
+            key (Any): A hashable key.
+
+        Returns:
+            Optional[CalCost]: The cached cost, `None` if not cached.
+        """
+        with self.__lock:
+            entry = self.__data.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.__data.move_to_end(key)
+            return entry
+
+    def put(self, key: Any, entry: CalCost) -> None:
+        """Cache an entry, the least recently used one is evicted if the cache is full.
+
+        Args:
+            key (Any): A hashable key.
+            entry (CalCost): The cost to be cached.
+        """
+        with self.__lock:
+            self.__data[key] = entry
+            self.__data.move_to_end(key)
+            self.__evict()
+
+    def info(self) -> CacheInfo:
+        """The statistics of the cache, in the same form as `functools.lru_cache().cache_info()`.
+
+        Returns:
+            CacheInfo: A namedtuple of `hits`, `misses`, `maxsize` and `currsize`.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.__data))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __evict(self) -> None:
+        """
+        Private method.
+        Remove the least recently used entries until the size is within `maxsize`, the lock should be held.
+        """
+        while len(self.__data) > self.__maxsize:
+            self.__data.popitem(last=False)
+
+
+def conv_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:
+    """The rule of convolutions, including the grouped, dilated and transposed ones. The weight is of shape
+    `(C_out, C_in / groups, *kernel_size)`, or `(C_in, C_out / groups, *kernel_size)` if transposed.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    n = reduce(mul, _param(module, "weight").shape[1:])
+    m = opt.numel()
+    is_bias = 1 if _param(module, "bias") is not None else 0
+
+    # each output element of a convolution is a dot product of length `n`, while each input element of a
+    # transposed convolution is scattered to `n` output elements
+    macs = ipt[0].numel() * n if module.transposed else m * n
+    return CalCost(
+        macs=macs,
+        flops=2 * macs - m + is_bias * m,
+        kernel_size=list(module.kernel_size),
+        bias=bool(is_bias),
+    )
+
+
+def linear_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    k = module.in_features
+    l = module.out_features  # noqa
+    is_bias = 1 if _param(module, "bias") is not None else 0
+    n = k
+
+    return CalCost(macs=l * n, flops=l * (2 * n - 1 + is_bias), bias=bool(is_bias))
+
+
+def bn_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    flops = 4 * ipt[0].numel()
+    return CalCost(macs=0.5 * flops, flops=flops)
+
+
+def elementwise_rule(
+    module: nn.Module,  # noqa: ARG001
+    ipt: Tuple[Any, ...],
+    opt: Any,  # noqa: ARG001
+    macs_per_elem: int = 1,
+    flops_per_elem: int = 1,
+) -> CalCost:
+    """The rule of element-wise operations (e.g. activations), whose cost is proportional to the input size.
+    Bind the costs per element via `functools.partial` before registering.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    k = ipt[0].numel()
+    return CalCost(macs=macs_per_elem * k, flops=flops_per_elem * k)
+
+
+def pool_rule(
+    module: nn.Module,
+    ipt: Tuple[Any, ...],  # noqa: ARG001
+    opt: Any,
+    dim: int,
+    is_avg: bool = False,
+) -> CalCost:
+    """The rule of pooling over `dim` spatial dimensions, bind `dim` via `functools.partial` before registering.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    k = module.kernel_size
+    if isinstance(k, int):
+        k = (k,) * dim
+
+    n = reduce(mul, k) - 1
+    m = opt.numel()
+
+    return CalCost(macs=n * m, flops=(2 * n + 1) * m if is_avg else n * m, kernel_size=list(k))
+
+
+def adaptive_pool_rule(
+    module: nn.Module,  # noqa: ARG001
+    ipt: Tuple[Any, ...],
+    opt: Any,
+    dim: int,
+    is_avg: bool = False,
+) -> CalCost:
+    """The rule of adaptive pooling over `dim` spatial dimensions, whose windows vary in size. Along a dimension
+    of size `L_in`, the `i`-th of the `L_out` windows spans `[floor(i * L_in / L_out), ceil((i + 1) * L_in / L_out))`.
+    Bind `dim` via `functools.partial` before registering.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    opt = opt[0] if isinstance(opt, tuple) else opt  # with `return_indices`
+    in_sizes, out_sizes = ipt[0].shape[-dim:], opt.shape[-dim:]
+
+    window_elems = opt.numel() // reduce(mul, out_sizes, 1)  # the number of planes
+    for l_in, l_out in zip(in_sizes, out_sizes):
+        window_elems *= sum(-(-(i + 1) * l_in // l_out) - i * l_in // l_out for i in range(l_out))
+
+    # the same as `pool_rule()`, where each window of `k` elements takes `k - 1` comparisons or additions
+    m = opt.numel()
+    is_uniform = all(l_in % l_out == 0 for l_in, l_out in zip(in_sizes, out_sizes))
+    return CalCost(
+        macs=window_elems - m,
+        flops=2 * window_elems - m if is_avg else window_elems - m,
+        kernel_size=[l_in // l_out for l_in, l_out in zip(in_sizes, out_sizes)] if is_uniform else None,
+    )
+
+
+# the number of input elements weighted for each output element of each interpolation mode
+INTERP_TAPS = {"linear": 2, "bilinear": 4, "trilinear": 8, "bicubic": 16}
+
+
+def upsample_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:
+    """The rule of `nn.Upsample`, where each output element is a weighted sum of its neighbours in the input.
+    The nearest neighbour is copied without arithmetic, and the `area` mode is an adaptive average pooling.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    mode: str = module.mode  # type: ignore[assignment]
+    if mode == "area":
+        return adaptive_pool_rule(module, ipt, opt, dim=opt.dim() - 2, is_avg=True)
+
+    taps = INTERP_TAPS.get(mode, 0)
+    m = opt.numel()
+    return CalCost(macs=taps * m, flops=(2 * taps - 1) * m if taps else 0)
+
+
+def norm_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of the normalizations computing the statistics on the fly (e.g. `LayerNorm`, `GroupNorm`). Each
+    element takes 5 flops for the mean, the variance and the normalization, plus 2 for the optional affine.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    k = ipt[0].numel()
+    has_weight = 1 if getattr(module, "weight", None) is not None else 0
+    has_bias = 1 if getattr(module, "bias", None) is not None else 0
+
+    return CalCost(macs=(2 + has_weight) * k, flops=(5 + has_weight + has_bias) * k, bias=bool(has_bias))
+
+
+def gelu_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:
+    """The rule of `nn.GELU`, whose tanh approximation takes a cubic term more than the exact one.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    if getattr(module, "approximate", "none") == "tanh":
+        return elementwise_rule(module, ipt, opt, macs_per_elem=9, flops_per_elem=17)
+    return elementwise_rule(module, ipt, opt, macs_per_elem=7, flops_per_elem=13)
+
+
+def dropout_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:
+    """The rule of dropouts, which scale the kept elements in training and do nothing in evaluation.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    if not module.training or not module.p:
+        return CalCost(macs=0, flops=0)
+    return elementwise_rule(module, ipt, opt)
+
+
+def copy_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of the modules only moving data without arithmetic, e.g. `nn.Embedding` and `nn.PixelShuffle`.
+
+    Returns:
+        CalCost: A zero cost.
+    """
+    return CalCost(macs=0, flops=0)
+
+
+def mha_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:
+    """The rule of `nn.MultiheadAttention`, including the input projections, the scaled dot-product attention
+    of each head and the output projection (whose submodule `out_proj` is not called but its weights are used).
+    The projections are counted as `nn.Linear` is (see `linear_rule()`), i.e. once regardless of the number of
+    tokens, while the cost of the attention scales with the product of the query and key sequence lengths.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    mha: nn.MultiheadAttention = module  # type: ignore[assignment]
+    query = ipt[0] if ipt else opt[0]  # the inputs passed as keywords are not seen by the hook
+    key = ipt[1] if len(ipt) > 1 else query
+
+    e, h = mha.embed_dim, mha.num_heads
+    seq_dim = 1 if mha.batch_first and query.dim() == 3 else 0
+    l = query.shape[seq_dim]  # noqa
+    s = key.shape[seq_dim] + (mha.bias_k is not None) + bool(mha.add_zero_attn)
+    n = query.numel() // (l * e)
+    in_bias = mha.in_proj_bias is not None
+    out_bias = mha.out_proj.bias is not None
+
+    costs = [
+        _matmul_cost(1, e, e, in_bias),  # query projection
+        _matmul_cost(1, mha.kdim, e, in_bias),  # key projection
+        _matmul_cost(1, mha.vdim, e, in_bias),  # value projection
+        _matmul_cost(n * h * l, e // h, s),  # q @ k^T
+        _matmul_cost(n * h * l, s, e // h),  # attn @ v
+        _matmul_cost(1, e, e, out_bias),  # output projection
+    ]
+    attn_elems = n * h * l * s
+    return CalCost(
+        macs=sum(c[0] for c in costs) + 3 * attn_elems,  # softmax
+        flops=sum(c[1] for c in costs) + 5 * attn_elems + n * l * e,  # softmax and the scaling of queries
+        bias=in_bias or out_bias,
+    )
+
+
+def transformer_layer_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of `nn.TransformerEncoderLayer` and `nn.TransformerDecoderLayer`, which only counts what is
+    computed outside their submodules, i.e. the residual additions and the activation if it is a function.
+
+    Returns:
+        CalCost: The cost of the residual additions and the functional activation.
+    """
+    linear1: nn.Linear = module.linear1  # type: ignore[assignment]
+    d_model, dim_ff = linear1.in_features, linear1.out_features
+    tokens = ipt[0].numel() // d_model
+    n_residual = 3 if hasattr(module, "multihead_attn") else 2
+
+    macs = flops = n_residual * tokens * d_model
+    if not isinstance(module.activation, nn.Module):
+        # `F.relu` or `F.gelu` given by name, see `nn.TransformerEncoderLayer`
+        is_gelu = "gelu" in repr(module.activation)
+        macs += (7 if is_gelu else 1) * tokens * dim_ff
+        flops += (13 if is_gelu else 1) * tokens * dim_ff
+    return CalCost(macs=macs, flops=flops)
+
+
+def rnn_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of `nn.RNN`, `nn.LSTM` and `nn.GRU`, which counts the gates of each layer and direction at each
+    timestep of the actual input, i.e. only the valid timesteps of each sequence if it is packed.
+
+    Returns:
+        CalCost: The calculation cost of the module, along with the number of timesteps.
+    """
+    rnn: nn.RNNBase = module  # type: ignore[assignment]
+    x = ipt[0]
+    if isinstance(x, PackedSequence):
+        tokens, steps = x.data.shape[0], len(x.batch_sizes)
+    else:
+        seq_dim = 1 if rnn.batch_first and x.dim() == 3 else 0
+        tokens, steps = x.numel() // rnn.input_size, x.shape[seq_dim]
+
+    num_directions = 2 if rnn.bidirectional else 1
+    out_size: int = getattr(rnn, "proj_size", 0) or rnn.hidden_size
+
+    macs = flops = 0
+    for layer in range(rnn.num_layers):
+        in_size = rnn.input_size if layer == 0 else out_size * num_directions
+        cell_macs, cell_flops = _rnn_cell_cost(rnn.mode, in_size, rnn.hidden_size, out_size, rnn.bias)
+        macs += tokens * num_directions * cell_macs
+        flops += tokens * num_directions * cell_flops
+
+    return CalCost(macs=macs, flops=flops, bias=rnn.bias, steps=steps)
+
+
+def rnn_cell_rule(module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of `nn.RNNCell`, `nn.LSTMCell` and `nn.GRUCell`, i.e. a single timestep of a single layer.
+
+    Returns:
+        CalCost: The calculation cost of the module.
+    """
+    cell: nn.RNNCellBase = module  # type: ignore[assignment]
+    if isinstance(cell, nn.LSTMCell):
+        mode = "LSTM"
+    elif isinstance(cell, nn.GRUCell):
+        mode = "GRU"
+    else:
+        mode = "RNN_" + getattr(cell, "nonlinearity", "tanh").upper()  # `nn.RNNCell` only
+
+    tokens = ipt[0].numel() // cell.input_size
+    macs, flops = _rnn_cell_cost(mode, cell.input_size, cell.hidden_size, cell.hidden_size, cell.bias)
+    return CalCost(macs=tokens * macs, flops=tokens * flops, bias=cell.bias)
+
+
+# the (macs, flops) of the element-wise operations on each hidden unit in a timestep, i.e. the activations of the
+# gates (costed as `nn.Sigmoid` and `nn.Tanh`) and the updates of the hidden (and cell) states
+RNN_ELEMWISE_COSTS = {
+    "RNN_TANH": (5, 9),
+    "RNN_RELU": (1, 1),
+    "LSTM": (3 * 2 + 5 + 2 + 5 + 1, 3 * 4 + 9 + 3 + 9 + 1),
+    "GRU": (2 * 2 + 1 + 5 + 2, 2 * 4 + 1 + 9 + 4),
+}
+
+
+def _rnn_cell_cost(mode: str, in_size: int, hidden_size: int, out_size: int, bias: bool) -> Tuple[int, int]:
+    """The (macs, flops) of a timestep of a recurrent layer, whose hidden state is projected to `out_size`.
+
+    Returns:
+        Tuple[int, int]: The macs and flops of a timestep.
+    """
+    gates = {"LSTM": 4, "GRU": 3}.get(mode, 1)
+
+    # both products of the input and the hidden state, their sum and the two biases
+    macs = gates * hidden_size * (in_size + out_size)
+    flops = gates * hidden_size * (2 * (in_size + out_size) - 1 + 2 * bias)
+
+    elem_macs, elem_flops = RNN_ELEMWISE_COSTS[mode]
+    macs += elem_macs * hidden_size
+    flops += elem_flops * hidden_size
+
+    if out_size != hidden_size:  # the projection of `nn.LSTM`
+        proj_macs, proj_flops = _matmul_cost(1, hidden_size, out_size)
+        macs += proj_macs
+        flops += proj_flops
+    return macs, flops
+
+
+def _param(module: nn.Module, name: str) -> Any:
+    """The parameter `name` of the module, which is packed and got via a method in a quantized module.
+
+    Returns:
+        Any: The parameter, `None` if it is not set.
+    """
+    param = getattr(module, name)
+    return param() if callable(param) else param
+
+
+def _matmul_cost(m: int, k: int, n: int, bias: bool = False) -> Tuple[int, int]:
+    """The (macs, flops) of multiplying a `m x k` matrix by a `k x n` one, optionally adding a bias.
+
+    Returns:
+        Tuple[int, int]: The macs and flops of the product.
+    """
+    return m * n * k, m * n * (2 * k - 1 + bias)
+
+
+CAL_RULES = CalRuleRegistry()
+
+CAL_RULES.register(
+    (nn.Conv1d, nn.Conv2d, nn.Conv3d, nn.ConvTranspose1d, nn.ConvTranspose2d, nn.ConvTranspose3d), conv_rule
+)
+CAL_RULES.register(nn.Linear, linear_rule)
+CAL_RULES.register((nn.BatchNorm1d, nn.BatchNorm2d, nn.BatchNorm3d), bn_rule)
+for _dim, (_max_pool, _avg_pool, _adaptive_max_pool, _adaptive_avg_pool) in enumerate(
+    [
+        (nn.MaxPool1d, nn.AvgPool1d, nn.AdaptiveMaxPool1d, nn.AdaptiveAvgPool1d),
+        (nn.MaxPool2d, nn.AvgPool2d, nn.AdaptiveMaxPool2d, nn.AdaptiveAvgPool2d),
+        (nn.MaxPool3d, nn.AvgPool3d, nn.AdaptiveMaxPool3d, nn.AdaptiveAvgPool3d),
+    ],
+    start=1,
+):
+    CAL_RULES.register(_max_pool, partial(pool_rule, dim=_dim))
+    CAL_RULES.register(_avg_pool, partial(pool_rule, dim=_dim, is_avg=True))
+    CAL_RULES.register(_adaptive_max_pool, partial(adaptive_pool_rule, dim=_dim))
+    CAL_RULES.register(_adaptive_avg_pool, partial(adaptive_pool_rule, dim=_dim, is_avg=True))
+CAL_RULES.register(nn.Upsample, upsample_rule)
+CAL_RULES.register((nn.PixelShuffle, nn.PixelUnshuffle), copy_rule)
+CAL_RULES.register((nn.ReLU, nn.ReLU6), partial(elementwise_rule, macs_per_elem=1, flops_per_elem=1))
+CAL_RULES.register(
+    (nn.Sigmoid, nn.PReLU, nn.RReLU, nn.LeakyReLU), partial(elementwise_rule, macs_per_elem=2, flops_per_elem=4)
+)
+CAL_RULES.register(nn.Tanh, partial(elementwise_rule, macs_per_elem=5, flops_per_elem=9))
+CAL_RULES.register(nn.SiLU, partial(elementwise_rule, macs_per_elem=3, flops_per_elem=5))
+CAL_RULES.register(nn.GELU, gelu_rule)
+CAL_RULES.register(
+    (nn.Softmax, nn.Softmin, nn.LogSoftmax), partial(elementwise_rule, macs_per_elem=3, flops_per_elem=5)
+)
+CAL_RULES.register(
+    (nn.LayerNorm, nn.GroupNorm, nn.InstanceNorm1d, nn.InstanceNorm2d, nn.InstanceNorm3d), norm_rule
+)
+CAL_RULES.register((nn.Dropout, nn.Dropout2d, nn.Dropout3d, nn.AlphaDropout), dropout_rule)
+CAL_RULES.register(nn.Embedding, copy_rule)
+CAL_RULES.register(nn.MultiheadAttention, mha_rule)
+CAL_RULES.register((nn.TransformerEncoderLayer, nn.TransformerDecoderLayer), transformer_layer_rule)
+CAL_RULES.register((nn.RNN, nn.LSTM, nn.GRU), rnn_rule)
+CAL_RULES.register((nn.RNNCell, nn.LSTMCell, nn.GRUCell), rnn_cell_rule)
+
+# the quantized modules take the same rules, whose operations are integer ones
+with suppress(ImportError):
+    import torch.ao.nn.quantized as nnq
+
+    CAL_RULES.register(
+        (nnq.Conv1d, nnq.Conv2d, nnq.Conv3d, nnq.ConvTranspose1d, nnq.ConvTranspose2d, nnq.ConvTranspose3d), conv_rule
+    )
+    CAL_RULES.register(nnq.Linear, linear_rule)
+
+register_cal_rule = CAL_RULES.register
+unregister_cal_rule = CAL_RULES.unregister
+get_cal_rule = CAL_RULES.resolve
+
+CAL_COST_CACHE = CalCostCache()
+
+cal_cache_info = CAL_COST_CACHE.info
+clear_cal_cache = CAL_COST_CACHE.clear
@@ -36,6 +36,7 @@ DEFAULT_FIELDS = [
     "table_column_args",
     "table_display_args",
     "combine",
+    "tree_cache",
 ]
 
 DEFAULT_CFG = """\
@@ -124,6 +125,11 @@ table_display_args:
 
 combine:
     horizon_gap: 2
+
+tree_cache:
+    enabled: False
+    cache_dir: null
+    max_entries: 64
 """
 
 
@@ -426,6 +432,7 @@ class Config(metaclass=ConfigMeta):
     table_column_args: FlagNameSpace
     table_display_args: FlagNameSpace
     combine: FlagNameSpace
+    tree_cache: FlagNameSpace
 
     __slots__ = [*DEFAULT_FIELDS, "__cfg_file"]
 
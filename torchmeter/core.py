@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from functools import partial
+from contextlib import nullcontext
+from collections import Counter
 
 import torch.nn as nn
 from rich import get_console
@@ -8,21 +11,31 @@ from torch import Tensor
 from torch import device as tc_device
 from rich.columns import Columns
 
+from torchmeter.hooks import HookDispatcher
 from torchmeter.config import get_config
 from torchmeter.display import render_perline
-from torchmeter.statistic import Statistics
+from torchmeter.statistic import Statistics, calibrate_overhead
 
 if TYPE_CHECKING:
     import sys
-    from typing import Any, Dict, List, Tuple, Union, Optional
+    from typing import Any, Dict, List, Tuple, Union, Callable, Optional, Sequence
 
+    from tqdm import tqdm
+    from torch import dtype as tc_dtype
     from polars import DataFrame
     from rich.text import Text
     from rich.tree import Tree
     from rich.table import Table
+    from torch.utils.hooks import RemovableHandle
 
     from torchmeter.config import FlagNameSpace
+    from torchmeter.engine import OperationNode
+    from torchmeter.liveness import LivenessReport
+    from torchmeter.sparsity import SparsityCost
+    from torchmeter.symbolic import DIMS_TYPE, Formula
+    from torchmeter.precision import PrecisionCost
     from torchmeter.statistic import CalMeter, MemMeter, IttpMeter, ParamsMeter
+    from torchmeter.op_counter import OpCounter
 
     if sys.version_info >= (3, 8):
         from typing import TypedDict
@@ -147,7 +160,13 @@ class Meter:
         table_cols: Get all column names of the backend dataframe for the specified statistics.
         stat_info: Generates a formatted summary of the specified statistics.
         overview: Generates an overview of all statistics in a formatted layout.
+        measure_all: Measures `param`, `cal` and `mem` together in a single feed-forward pass.
+        formulas: Records `cal` and output memory of each node as formulas in the input dimensions.
+        precision_breakdown: Breaks `cal` and `mem` down by numeric precision, or projects them to a data type.
+        sparsity: Analyzes the sparsity of the weights of each node, with its effective `cal` and sparse storage.
+        liveness: Tracks the lifetime of the activations, to estimate the peak bytes they take at the same time.
         rebase: Rebases the Meter instance to a specific node in the operation tree.
+        update: Brings the Meter instance up to date after the underlying model is mutated.
 
     Note:
         - Requires at least one forward pass before most measurements become available.
@@ -182,7 +201,14 @@ class Meter:
         ```
     """
 
-    def __init__(self, model: nn.Module, device: Optional[Union[str, tc_device]] = None) -> None:
+    def __init__(
+        self,
+        model: nn.Module,
+        device: Optional[Union[str, tc_device]] = None,
+        lazy: bool = False,
+        extrapolate_repeat: bool = False,
+        count_ops: bool = False,
+    ) -> None:
         """Initialize a Meter instance for model performance measurement and visualization.
 
         Args:
@@ -190,7 +216,21 @@ class Meter:
             device (Optional[Union[str, torch.device]]): Target device for model execution and measurement.
                                                          Accepts either device string (e.g., `cuda:0`) or
                                                          `torch.device` object. If `None`, automatically detects
-                                                         model's current device via its parameters.
+                                                         model's current device via its parameters. Use `meta` to
+                                                         measure `param`, `cal` and `mem` from shapes only, see
+                                                         the notes below.
+            lazy (bool): Whether to build the operation tree lazily. If `True`, the nodes of the operation tree
+                         are materialized only when a traversal, rebase, render or measurement reaches them,
+                         which makes wrapping a huge model almost free. Defaults to `False`.
+            extrapolate_repeat (bool): Whether to measure only one representative among the structurally identical
+                                       modules that see a same input when measuring `cal`, `mem` and `ittp`. The
+                                       results of the representative are broadcast to the others, which are
+                                       flagged as `(extrapolated)` in the tables. Defaults to `False`.
+            count_ops (bool): Whether to count the aten operators (e.g. `matmul`, `einsum`, `conv2d` and
+                              `scaled_dot_product_attention`) called in the forward of each module itself when
+                              measuring `cal`, so that the functional calls in a custom `forward` are attributed
+                              to the calling module instead of being missed. Requires a torch that supports
+                              `TorchDispatchMode`. Defaults to `False`.
 
         Raises:
             TypeError: If provided model is not a `nn.Module` instance
@@ -206,14 +246,25 @@ class Meter:
 
         2. Measurement infrastructure setup:
             - Initializes input capture dictionary (`_ipt`)
-            - Builds operation tree (`optree`) for model structure analysis
+            - Builds operation tree (`optree`) for model structure analysis, or only its root if `lazy=True`
             - Prepares renderers for visualization (`tree_renderer`, `table_renderer`)
 
         3. Measurement state initialization:
             - Resets measurement flags (`param`/`cal`/`mem`)
             - Sets default benchmark parameters (`ittp_warmup`=50, `ittp_benchmark_time`=100)
+            - Records whether to extrapolate the measurements of repeated modules (`extrapolate_repeat`)
+            - Records whether to count the operators called in each module when measuring `cal` (`count_ops`)
             - Initializes accuracy warning trackers (`_has_nocall_nodes`, `_has_not_support_nodes`)
 
+        On the `meta` device, tensors have shapes and dtypes but no data, so no real kernel is run and no memory
+        is allocated for weights and activations, which makes it possible to measure `param`, `cal` and `mem` of
+        a model larger than the host memory in seconds. Note that:
+
+        - Moving a model to the `meta` device discards its weights, so it can't be moved back. To never allocate
+          them, build the model under `with torch.device("meta"):` (torch >= 2.0), whose device is auto-detected.
+        - `ittp` and `sparsity()` can't be measured, and a model whose forward depends on the values of tensors
+          will fail.
+
         Example:
             ```python
             from torchmeter import Meter
@@ -227,6 +278,9 @@ class Meter:
             # init a gpu model
             model = Meter(underlying_model, device="cuda")
             model = Meter(underlying_model, device="cuda:1")
+
+            # measure from shapes only
+            model = Meter(models.resnet18(), device="meta")
             ```
         """
 
@@ -242,7 +296,7 @@ class Meter:
 
         self._ipt: IPT_TYPE = {"args": tuple(), "kwargs": dict()}  # TODO: self.ipt_infer()
 
-        self.optree = OperationTree(self.model)
+        self.optree = OperationTree(self.model, lazy=lazy)
 
         self.tree_renderer = TreeRenderer(self.optree.root)
         self.table_renderer = TabularRenderer(self.optree.root)
@@ -250,8 +304,11 @@ class Meter:
         self.__measure_param = False
         self.__measure_cal = False
         self.__measure_mem = False
+        self.__stat_generations = self.__tree_generations()
         self.ittp_warmup = 50
         self.ittp_benchmark_time = 100
+        self.extrapolate_repeat = extrapolate_repeat
+        self.count_ops = count_ops
 
         self.__has_nocall_nodes: Optional[bool] = None
         self.__has_not_support_nodes: Optional[bool] = None
@@ -325,6 +382,7 @@ class Meter:
             self.__measure_param = False
             self.__measure_cal = False
             self.__measure_mem = False
+            self.__reset_measurements()
 
         self._ipt = new_ipt
         self._ipt2device()
@@ -517,13 +575,24 @@ class Meter:
             new_device (Union[str, torch.device]): The target device, which can be a string (e.g., "cpu" or "cuda:0")
                                                    or a torch.device object.
 
+        Raises:
+            RuntimeError: If the model is on the `meta` device and the new device is not, since the weights have
+                          been discarded.
+
         Notes:
             - The device property is updated to reflect the new device.
             - If any tensors are present in `self._ipt`, they will also be moved to the new device.
             - Moves the model to the new device using `model.to()` in PyTorch.
         """
 
-        self.__device = tc_device(new_device)
+        new_device = tc_device(new_device)
+        if self.__device.type == "meta" and new_device.type != "meta":
+            raise RuntimeError(
+                "The model is on the `meta` device and has no weights, so it can't be moved to "
+                + f"`{new_device}`. Wrap a model with real weights in a new Meter instead."
+            )
+
+        self.__device = new_device
         self.model.to(self.__device)
         if not self._is_ipt_empty():
             self._ipt2device()
@@ -947,6 +1016,7 @@ class Meter:
             will return the cached result.
         """
 
+        self.__sync_measurements()
         if not self.__measure_param:
             list(map(lambda node: node.param.measure(), self.optree.all_nodes))
             self.__measure_param = True
@@ -979,6 +1049,7 @@ class Meter:
               you want.
         """
 
+        self.__sync_measurements()
         if not self.__measure_cal:
             if self._is_ipt_empty():
                 raise RuntimeError(
@@ -986,16 +1057,8 @@ class Meter:
                     + "You should perform at least one feed-forward inference before measuring calculation!"
                 )
 
-            hook_ls = [node.cal.measure() for node in self.optree.all_nodes]
-
-            # feed forwad
-            self._ipt2device()
-            self.model(*self.ipt["args"], **self.ipt["kwargs"])
-
-            # remove hooks after measurement
-            list(map(lambda x: x.remove() if x is not None else None, hook_ls))
-
-            self.__measure_cal = True
+            # `mem` is measured along with it in the same feed-forward pass if it is not measured yet
+            self.__measure_fused()
 
         return self.optree.root.cal
 
@@ -1025,6 +1088,7 @@ class Meter:
               whenever you want.
         """
 
+        self.__sync_measurements()
         if not self.__measure_mem:
             if self._is_ipt_empty():
                 raise RuntimeError(
@@ -1032,16 +1096,8 @@ class Meter:
                     + "before measuring the memory cost!"
                 )
 
-            hook_ls = [node.mem.measure() for node in self.optree.all_nodes]
-
-            # feed forward
-            self._ipt2device()
-            self.model(*self.ipt["args"], **self.ipt["kwargs"])
-
-            # remove hooks after measurement
-            list(map(lambda x: x.remove() if x is not None else None, hook_ls))
-
-            self.__measure_mem = True
+            # `cal` is measured along with it in the same feed-forward pass if it is not measured yet
+            self.__measure_fused()
 
         return self.optree.root.mem
 
@@ -1060,6 +1116,7 @@ class Meter:
             RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty).
             TypeError: If `self.ittp_warmup` is not an integer.
             ValueError: If `self.ittp_warmup` is a negative integer.
+            RuntimeError: If the model is on the `meta` device, where no real kernel is run.
 
         Notes:
             - You must first invoke the Meter instance (via a forward pass) before accessing this property.
@@ -1076,6 +1133,11 @@ class Meter:
 
             - The benchmark phase runs for `meter_instance.ittp_benchmark_time` iterations per operation.
 
+            - The self-cost of the benchmark (the timer calls and the global hooks) is calibrated on the current
+              machine before each measurement, and subtracted from each inference time. The estimated fraction of
+              the raw time it takes is listed in the `Overhead` column, a high fraction means that the time of the
+              operation is too short to be measured reliably.
+
             - The measurement results depend on the model input, and different input tensor sizes will lead to
               varying latencies and throughput, which is **normal**. For consistent and comparable results, we
               recommend using **a single sample** for measuring all statistics including `ittp`. This can be
@@ -1094,6 +1156,8 @@ class Meter:
             raise TypeError(f"ittp_warmup must be an integer, but got `{type(self.ittp_warmup).__name__}`")
         if self.ittp_warmup < 0:
             raise ValueError(f"ittp_warmup must be greater than or equal to 0, but got `{self.ittp_warmup}`.")
+        if self.device.type == "meta":
+            raise RuntimeError("The inference time and throughput can't be measured on the `meta` device.")
 
         self._ipt2device()
 
@@ -1105,16 +1169,24 @@ class Meter:
             desc="Benchmark Inference Time & Throughput",
             unit="module",
         )
+        overhead = calibrate_overhead(self.device)
+        dispatcher = HookDispatcher()
         hook_ls = [
-            node.ittp.measure(device=self.device, repeat=self.ittp_benchmark_time, global_process=pb)
+            node.ittp.measure(
+                device=self.device,
+                repeat=self.ittp_benchmark_time,
+                global_process=pb,
+                dispatcher=dispatcher,
+                overhead=overhead,
+            )
             for node in self.optree.all_nodes
         ]
+        if self.extrapolate_repeat:
+            self.__regist_extrapolation("ittp", dispatcher, hook_ls, global_process=pb)
 
-        # feed forwad
-        self.model(*self.ipt["args"], **self.ipt["kwargs"])
-
-        # remove hooks after measurement
-        list(map(lambda x: x.remove() if x is not None else None, hook_ls))
+        # feed forwad, all hooks are removed on exit
+        with dispatcher:
+            self.model(*self.ipt["args"], **self.ipt["kwargs"])
 
         del pb
 
@@ -1175,7 +1247,7 @@ class Meter:
             A list of strings, each formatted as `(node_id) node_name`, representing all nodes
                        in the operation tree.
         """
-        return [f"({node.node_id}) {node.name}" for node in self.optree.all_nodes]
+        return [f"({node.relative_id(self.optree.root)}) {node.name}" for node in self.optree.all_nodes]
 
     def to(self, new_device: Union[str, tc_device]) -> None:
         """Move the model to the specified device while keeping input and model device synchronization.
@@ -1204,7 +1276,250 @@ class Meter:
         """
         self.device = new_device  # type: ignore
 
-    def rebase(self, node_id: str) -> Meter:
+    def measure_all(self) -> None:
+        """Measures `param`, `cal` and `mem` together in a single feed-forward pass.
+
+        The statistics already measured are skipped. All the nodes are visited only once to hook the modules,
+        and the feed-forward pass runs without autograd (see `torchmeter.utils.measure_mode`), so it is faster and
+        costs less memory than measuring them one by one.
+
+        Raises:
+            RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty).
+
+        Notes:
+            - Accessing `cal` or `mem` takes the same path, i.e. the other one is measured along with it if it is
+              not measured yet.
+            - `ittp` is not included, as the benchmark of each module would be disturbed by the other hooks.
+
+        Example:
+            ```python
+            import torch
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = Meter(models.resnet18())
+            model(torch.randn(1, 3, 224, 224))
+            model.measure_all()
+
+            print(model.param, model.cal, model.mem)  # no more feed-forward pass
+            ```
+        """
+        self.__sync_measurements()
+        if self._is_ipt_empty() and not (self.__measure_cal and self.__measure_mem):
+            raise RuntimeError(
+                "Input unknown! You should perform at least one feed-forward inference before measuring!"
+            )
+
+        self.__measure_fused()
+
+    def formulas(self, dims: DIMS_TYPE, degree: int = 2) -> Dict[str, Dict[str, Formula]]:
+        """Records the `Macs`, `Flops` and `OutputCost` of each node as formulas in the given input dimensions,
+        which can be evaluated for any input shape without another feed-forward pass.
+
+        The formulas are polynomials solved exactly from `(degree + 1) ** len(dims)` feed-forward passes with
+        inputs whose dimensions are multiples of the captured ones, see `torchmeter.symbolic.trace_formulas`
+        for details. The measurements of this instance are left untouched.
+
+        Args:
+            dims (DIMS_TYPE): A mapping from the name of a dimension to where it is in the input, i.e. a tuple of
+                              the position (or keyword) of the argument and the index of the dimension, or a list
+                              of such tuples if it is shared by multiple arguments.
+            degree (int): The maximum degree of each dimension. Defaults to `2`.
+
+        Returns:
+            Dict[str, Dict[str, Formula]]: A mapping from the node id to the formulas of `Macs`, `Flops` and
+                                           `OutputCost` of the node.
+
+        Raises:
+            RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty).
+            ValueError: If `dims` is invalid or `degree` is not a positive integer.
+
+        Notes:
+            - A formula of a dimension with a stride is only valid for the values divisible by the total stride.
+            - Measuring on the `meta` device is recommended, as the values of the inputs do not matter.
+
+        Example:
+            ```python
+            import torch
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = Meter(models.resnet18(), device="meta")
+            model(torch.randn(1, 3, 224, 224))
+
+            formulas = model.formulas({"B": (0, 0), "H": (0, 2), "W": (0, 3)}, degree=1)
+            print(formulas["0"]["Flops"])  # a polynomial in B, H and W
+            print(formulas["0"]["Flops"](B=8, H=512, W=512))
+            ```
+        """
+        from torchmeter.engine import OperationTree
+        from torchmeter.symbolic import trace_formulas
+
+        if self._is_ipt_empty():
+            raise RuntimeError(
+                "Input unknown! You should perform at least one feed-forward inference before recording formulas!"
+            )
+
+        self._ipt2device()
+        return trace_formulas(
+            OperationTree(self.model), self.ipt, dims=dims, degree=degree, count_ops=self.count_ops
+        )
+
+    def precision_breakdown(self, dtype: Optional[Union[str, tc_dtype]] = None) -> Dict[str, PrecisionCost]:
+        """Breaks the calculation and memory costs down by numeric precision, or projects them to a data type.
+
+        The calculation cost of each module is attributed to the data type of its output, so the quantized
+        modules (e.g. `torch.ao.nn.quantized.Linear`) are counted as integer operations. The parameters, buffers
+        and outputs are attributed to their own data types. See `torchmeter.precision.precision_breakdown` for
+        details. `cal` and `mem` are measured first if not yet.
+
+        Args:
+            dtype (Optional[Union[str, tc_dtype]]): The data type to project to, e.g. `"bfloat16"` or `"qint8"`,
+                                                       the costs are then reported as if the model ran in it.
+                                                       Defaults to `None`, i.e. no projection.
+
+        Returns:
+            Dict[str, PrecisionCost]: A mapping from the name of each data type to its `macs`, `flops`,
+                                      `param_cost`, `buffer_cost` and `output_cost` (the latter three in bytes).
+
+        Raises:
+            RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty).
+            TypeError: If `dtype` is not a data type of torch.
+
+        Notes:
+            - The parameters and buffers of all modules are counted, including those not called.
+
+            - For an integer or quantized `dtype`, only the linear and convolutional layers are projected, as in a
+              typical post-training quantization, while the others (as well as the biases) keep their precision.
+
+        Example:
+            ```python
+            import torch
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = Meter(models.resnet18())
+            model(torch.randn(1, 3, 224, 224))
+
+            print(model.precision_breakdown())  # {'float32': PrecisionCost(...), 'int64': PrecisionCost(...)}
+            print(model.precision_breakdown("qint8"))  # what if the convolutions and linear layers ran in int8
+            ```
+        """
+        from torchmeter.precision import precision_breakdown
+
+        self.__sync_measurements()
+        if not (self.__measure_cal and self.__measure_mem):
+            if self._is_ipt_empty():
+                raise RuntimeError(
+                    "Input unknown! You should perform at least one feed-forward inference before measuring!"
+                )
+            self.__measure_fused()
+
+        return precision_breakdown(self.optree, dtype=dtype)
+
+    def sparsity(self) -> Dict[str, SparsityCost]:
+        """Analyzes the sparsity of the weights of each node, i.e. the density of nonzero weights, the MACs
+        involving a nonzero weight, and the bytes of the weights in common sparse formats (COO, CSR, bitmask and
+        2:4 semi-structured). It helps to find the pruned layers worth deploying to sparse kernels.
+
+        The weights pruned via `torch.nn.utils.prune` are inspected with their masks applied. See
+        `torchmeter.sparsity.sparsity_analysis` for details. `cal` is measured first if not yet.
+
+        Returns:
+            Dict[str, SparsityCost]: A mapping from the id of each node having weights to its `numel`, `nonzero`,
+                                     `density`, `macs`, `effective_macs` and the bytes in each format.
+
+        Raises:
+            RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty), or the model is on the
+                          `meta` device, whose weights have no values.
+
+        Notes:
+            - Only the floating point weights with at least 2 dimensions are inspected, the biases are excluded.
+
+            - The effective MACs are scaled by the density only for the convolutional, linear and recurrent
+              layers, whose costs are proportional to their weights.
+
+        Example:
+            ```python
+            import torch
+            import torch.nn.utils.prune as prune
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = models.resnet18()
+            prune.l1_unstructured(model.fc, "weight", amount=0.9)
+
+            model = Meter(model)
+            model(torch.randn(1, 3, 224, 224))
+
+            fc = next(node for node in model.optree.all_nodes if node.name == "fc")
+            print(model.sparsity()[fc.node_id])  # SparsityCost(numel=512000, nonzero=51200, density=0.1, ...)
+            ```
+        """
+        from torchmeter.sparsity import sparsity_analysis
+
+        if self.device.type == "meta":
+            raise RuntimeError("The sparsity can't be analyzed on the `meta` device, whose weights have no values.")
+
+        self.__sync_measurements()
+        if not self.__measure_cal:
+            if self._is_ipt_empty():
+                raise RuntimeError(
+                    "Input unknown! "
+                    + "You should perform at least one feed-forward inference before measuring calculation!"
+                )
+            self.__measure_fused()
+
+        return sparsity_analysis(self.optree)
+
+    def liveness(self) -> LivenessReport:
+        """Tracks the lifetime of each activation in a feed-forward pass, from the module creating it to the last
+        one using it, and reports the peak bytes of the activations alive at the same time, the node where the peak
+        occurs, and the live bytes over the execution order.
+
+        Unlike `OutputCost` of `mem`, which sums the outputs of all modules, the peak excludes the activations freed
+        once consumed, so it is closer to the working set of the activations during inference. See
+        `torchmeter.liveness.trace_liveness` for how the lifetimes are inferred. The measurements of this instance
+        are left untouched.
+
+        Returns:
+            LivenessReport: The `peak_bytes`, `peak_node_id`, `total_bytes` (i.e. the bytes of all distinct
+                            activations) and `curve` (i.e. a list of the node id and the live bytes when it returns).
+
+        Raises:
+            RuntimeError: If no input data has been provided (i.e., `self._ipt` is empty).
+
+        Notes:
+            - The input of the model is counted as a live activation throughout.
+
+            - The parameters, buffers, workspaces of the operators and the memory cached by the allocator are not
+              included, so add them to size the deployment.
+
+        Example:
+            ```python
+            import torch
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = Meter(models.resnet18())
+            model(torch.randn(1, 3, 224, 224))
+
+            report = model.liveness()
+            print(report.peak_bytes, report.peak_node_id, report.total_bytes)
+            print(report.curve[:3])  # [('2', ...), ('3', ...), ('4', ...)]
+            ```
+        """
+        from torchmeter.liveness import trace_liveness
+
+        if self._is_ipt_empty():
+            raise RuntimeError(
+                "Input unknown! You should perform at least one feed-forward inference before tracking liveness!"
+            )
+
+        self._ipt2device()
+        return trace_liveness(self.optree, self.ipt)
+
+    def rebase(self, node_id: str, fresh: bool = False) -> Meter:
         """Rebases the Meter instance to a specific node in the operation tree.
 
         This method allows the Meter instance to focus on a specific node in the operation tree,
@@ -1213,6 +1528,9 @@ class Meter:
 
         Args:
             node_id (str): The ID of the node to rebase to. Must be a valid node ID in the operation tree.
+            fresh (bool): Whether to build an independent Meter instance by rescanning the submodule. If `False`,
+                          the returned instance is a view which shares the operation tree and all the measured
+                          statistics with the current one. Defaults to `False`.
 
         Returns:
             Meter: A new Meter instance with the specified node as the root.
@@ -1222,8 +1540,15 @@ class Meter:
             ValueError: If `node_id` does not exist in the operation tree.
 
         Notes:
-            - Use `Meter(your_model).subnodes` to retrieve a list of valid node IDs.
+            - Use `Meter(your_model).subnodes` to retrieve a list of valid node IDs, or use
+              `Meter(your_model).optree.find()` to query node IDs by glob patterns.
+            - The target node is looked up in O(1) time via the index of the operation tree.
             - If `node_id` is "0", the original Meter instance is returned without modification.
+            - For a lazy Meter, only the nodes along the path from root to the target node are materialized.
+            - A view is created instantly. The node IDs in it are re-rooted, i.e. the target node is regarded as
+              node "0". The `param`, `cal` and `mem` already measured on the current instance are reused directly,
+              so a view needs its own input (via a feed-forward inference) only for `ittp` or the statistics not
+              measured yet. Use `fresh=True` if you want the measurements to be totally independent.
 
         Example:
             ```python
@@ -1235,7 +1560,7 @@ class Meter:
             rebased_model = metered_model.rebase("5")
 
             print(model)  # Meter(model=0 ResNet: ResNet, device=cpu)
-            print(rebased_model)  # Meter(model=0 Sequential: Sequential, device=cpu)
+            print(rebased_model)  # Meter(model=0 layer1: Sequential, device=cpu)
             ```
         """
 
@@ -1245,14 +1570,98 @@ class Meter:
         if node_id == "0":
             return self
 
-        id_generator = ((node_idx, node.node_id) for node_idx, node in enumerate(self.optree.all_nodes))
+        try:
+            new_base = self.optree.get_node(node_id)
+        except ValueError:
+            raise ValueError(
+                f"Invalid node_id: {node_id}. Use `Meter(your_model).subnodes` to check valid ones."
+            ) from None
+
+        if fresh:
+            return self.__class__(
+                new_base.operation,
+                device=self.device,
+                lazy=self.optree.lazy,
+                extrapolate_repeat=self.extrapolate_repeat,
+                count_ops=self.count_ops,
+            )
+
+        return self.__view(new_base)
+
+    def update(self, node_id: Optional[str] = None) -> List[str]:
+        """Brings the Meter instance up to date after the underlying model is mutated, e.g. a submodule is replaced,
+        inserted or removed, without rescanning the whole model.
+
+        Only the subtrees of the operation tree affected by the mutation are rebuilt, and their measured data are
+        withdrawn from the ancestors. On next access of a statistics, only the rebuilt nodes are measured, while the
+        totals of the ancestors are updated accordingly. The cached tables and tree renders are invalidated as well.
+
+        Args:
+            node_id (Optional[str]): The ID of a node whose module is mutated in place (e.g. its attributes are
+                                     changed), whose subtree will be rebuilt. If `None`, the replaced, inserted and
+                                     removed submodules are detected automatically. Defaults to `None`.
+
+        Returns:
+            List[str]: The IDs of the roots of the rebuilt subtrees, empty if nothing has changed.
+
+        Raises:
+            TypeError: If `node_id` is neither a string nor `None`.
+            ValueError: If `node_id` does not exist in the operation tree.
+
+        Notes:
+            - The `cal` and `mem` of the unchanged nodes are kept, which assumes that their inputs are unchanged.
+              If the mutation changes the input or output shape of a submodule, perform a feed-forward inference
+              with a new input or use `optree.reset_stats()` to remeasure them.
+            - Other Meter instances created via `rebase()` become stale if the mutation takes place in them.
+
+        Example:
+            ```python
+            import torch.nn as nn
+            from torchmeter import Meter
+            from torchvision import models
+
+            model = Meter(models.resnet18())
+            model.param
+
+            model.model.relu = nn.GELU()
+            model.update()  # ['3']
+            model.param  # only the new node is measured
+            ```
+        """
+        from torchmeter.display import TreeRenderer, TabularRenderer
+
+        if node_id is None:
+            rebuilt = self.optree.sync()
+        elif not isinstance(node_id, str):
+            raise TypeError(f"node_id must be a string or None, but got `{type(node_id).__name__}`.")
+        else:
+            try:
+                node = self.optree.get_node(node_id)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid node_id: {node_id}. Use `Meter(your_model).subnodes` to check valid ones."
+                ) from None
+            rebuilt = self.optree.rebuild(node)
+
+        if not rebuilt:
+            return []
+
+        self.__measure_param = False
+        self.__measure_cal = False
+        self.__measure_mem = False
+        self.__has_nocall_nodes = None
+        self.__has_not_support_nodes = None
 
-        for idx, valid_id in id_generator:
-            if node_id == valid_id:
-                new_base = self.optree.all_nodes[idx]
-                return self.__class__(new_base.operation, device=self.device)
+        if self.tree_renderer.opnode is not self.optree.root:  # the root of a rebased instance is rebuilt
+            self.model = self.optree.root.operation
+            self.tree_renderer = TreeRenderer(self.optree.root)
+            self.table_renderer = TabularRenderer(self.optree.root)
         else:
-            raise ValueError(f"Invalid node_id: {node_id}. Use `Meter(your_model).subnodes` to check valid ones.")
+            self.tree_renderer.render_fold_tree = None
+            self.tree_renderer.render_unfold_tree = None
+            self.table_renderer.clear()
+
+        return [node.relative_id(self.optree.root) for node in rebuilt]
 
     def stat_info(self, stat_or_statname: Union[str, Statistics], *, show_warning: bool = True) -> Text:  # noqa: C901
         """Generates a formatted summary of the specified statistics.
@@ -1467,7 +1876,7 @@ class Meter:
                         "Param_Cost", "Buffer_Cost", "Output_Cost", "Total")
 
                 - ittp: ("Operation_Id", "Operation_Name", "Operation_Type",
-                         "Infer_Time", "Throughput")
+                         "Infer_Time", "Throughput", "Overhead")
 
         Example:
             ```python
@@ -1797,6 +2206,215 @@ class Meter:
 
         return tb, data
 
+    def __view(self, node: OperationNode) -> Meter:
+        """
+        Private method.
+        Create a Meter instance on the subtree rooted at `node` without rescanning, which shares the operation
+        tree as well as the measurements with the current instance.
+
+        Args:
+            node (OperationNode): The root of the subtree, must be a node in `self.optree`.
+
+        Returns:
+            Meter: A Meter instance whose `optree` is an `OperationTreeView` rooted at `node`.
+        """
+        from torchmeter.display import TreeRenderer, TabularRenderer
+
+        view = self.__class__.__new__(self.__class__)
+
+        view.__device = self.__device
+        view.model = node.operation
+
+        view._ipt = {"args": tuple(), "kwargs": dict()}
+
+        view.optree = self.optree.view(node)
+
+        view.tree_renderer = TreeRenderer(node)
+        view.table_renderer = TabularRenderer(node)
+
+        # all the nodes in the subtree have been measured if they are measured in the current instance
+        self.__sync_measurements()
+        view.__stat_generations = self.__stat_generations.copy()
+        view.__measure_param = self.__measure_param
+        view.__measure_cal = self.__measure_cal
+        view.__measure_mem = self.__measure_mem
+        view.ittp_warmup = self.ittp_warmup
+        view.ittp_benchmark_time = self.ittp_benchmark_time
+        view.extrapolate_repeat = self.extrapolate_repeat
+        view.count_ops = self.count_ops
+
+        view.__has_nocall_nodes = None
+        view.__has_not_support_nodes = None
+
+        return view
+
+    def __regist_extrapolation(
+        self,
+        stat_name: str,
+        dispatcher: HookDispatcher,
+        hook_ls: Sequence[Optional[Union[RemovableHandle, Callable]]],
+        global_process: Optional[tqdm] = None,
+    ) -> None:
+        """
+        Private method.
+        Add a forward pre-hook for each node that shares its structural hash with others. During the feed
+        forward, the first one among them that sees a given input signature is regarded as the representative
+        and measured as usual, while for the rest, the measurement hooks of the whole subtree are removed and the
+        results of the representative's subtree are broadcast via `Statistics.extrapolate()`.
+
+        Args:
+            stat_name (str): The statistics to be measured, one of `cal`, `mem` and `ittp`.
+            dispatcher (HookDispatcher): The dispatcher holding the measurement hooks, the pre-hooks are added
+                                         to it as well.
+            hook_ls (Sequence[Optional[Union[RemovableHandle, Callable]]]): The measurement hooks of
+                                                                          `self.optree.all_nodes` in order, as
+                                                                          returned by their `measure()` with
+                                                                          `dispatcher`.
+            global_process (Optional[tqdm]): The progress bar of `ittp` benchmark, the progress of each
+                                             extrapolated node is updated at once.
+        """
+        from torchmeter.utils import input_signature
+
+        all_nodes = self.optree.all_nodes
+        node_hooks = {id(node): hook for node, hook in zip(all_nodes, hook_ls)}
+        hash_cnt = Counter(node.struct_hash for node in all_nodes)
+
+        representatives: Dict[Tuple[int, bool, Tuple[Any, ...]], OperationNode] = {}
+        extrapolated = set()
+
+        def pre_hook(node: OperationNode, module: nn.Module, ipt: Any) -> None:
+            if id(node) in extrapolated:
+                return
+
+            # the training mode is out of the structural hash, but changes the cost of e.g. `nn.Dropout`
+            rep_node = representatives.setdefault((node.struct_hash, module.training, input_signature(ipt)), node)
+            if rep_node is node:
+                return
+
+            for src, dst in zip(self.optree.subtree(rep_node), self.optree.subtree(node)):
+                hook = node_hooks.get(id(dst))
+                if not callable(hook):  # measured before, e.g. kept in `update()`
+                    continue
+                dispatcher.remove(dst.operation, hook)
+                getattr(dst, stat_name).extrapolate(getattr(src, stat_name))
+                extrapolated.add(id(dst))
+
+                if global_process is not None:
+                    global_process.update(self.ittp_benchmark_time)
+
+        for node in all_nodes:
+            if node is not self.optree.root and hash_cnt[node.struct_hash] > 1:
+                dispatcher.add(node.operation, partial(pre_hook, node), pre=True)
+
+    def __measure_fused(self) -> None:
+        """
+        Private method.
+        Measure the unmeasured ones among `param`, `cal` and `mem` in one traversal of the nodes, where the hooks
+        of `cal` and `mem` are added to a same dispatcher, so that they are filled in a single feed-forward pass.
+        The input is assumed to be provided.
+        """
+        from torchmeter.utils import measure_mode
+
+        stat_names = [
+            stat_name
+            for stat_name, is_measured in (("cal", self.__measure_cal), ("mem", self.__measure_mem))
+            if not is_measured
+        ]
+
+        dispatcher = HookDispatcher()
+        op_counter: Optional[OpCounter] = None
+        if self.count_ops and "cal" in stat_names:
+            from torchmeter.op_counter import OpCounter
+
+            op_counter = OpCounter(dispatcher)
+
+        hook_lists: Dict[str, List[Optional[Union[RemovableHandle, Callable]]]] = {
+            stat_name: [] for stat_name in stat_names
+        }
+        for node in self.optree.all_nodes:
+            if not self.__measure_param:
+                node.param.measure()
+            for stat_name in stat_names:
+                if stat_name == "cal":
+                    hook = node.cal.measure(dispatcher=dispatcher, count_ops=self.count_ops)
+                    if op_counter is not None:
+                        op_counter.track(node.operation, None if hook is None else node.cal)
+                else:
+                    hook = getattr(node, stat_name).measure(dispatcher=dispatcher)
+                hook_lists[stat_name].append(hook)
+        self.__measure_param = True
+
+        if not stat_names:
+            return
+
+        if self.extrapolate_repeat:
+            for stat_name, hook_ls in hook_lists.items():
+                self.__regist_extrapolation(stat_name, dispatcher, hook_ls)
+
+        # feed forward, all hooks are removed on exit
+        self._ipt2device()
+        with measure_mode(), dispatcher, op_counter or nullcontext():
+            self.model(*self.ipt["args"], **self.ipt["kwargs"])
+
+        self.__measure_cal = True
+        self.__measure_mem = True
+
+    def __reset_measurements(self) -> None:
+        """
+        Private method.
+        Discard the measurements depending on the input (i.e. `cal` and `mem`), so that they will be remeasured
+        with the new input. A Meter created via `rebase()` shares the nodes with its origin, so it switches to
+        an operation tree of its own instead, leaving the measurements of the origin untouched.
+        """
+        from torchmeter.engine import OperationTree, OperationTreeView
+        from torchmeter.display import TreeRenderer, TabularRenderer
+
+        self.__has_nocall_nodes = None
+        self.__has_not_support_nodes = None
+
+        if isinstance(self.optree, OperationTreeView):
+            self.optree = OperationTree(self.model, lazy=self.optree.lazy)
+            self.tree_renderer = TreeRenderer(self.optree.root)
+            self.table_renderer = TabularRenderer(self.optree.root)
+        else:
+            self.optree.reset_stats("cal", "mem")
+            self.table_renderer.clear("cal")
+            self.table_renderer.clear("mem")
+        self.__stat_generations = self.__tree_generations()
+
+    def __sync_measurements(self) -> None:
+        """
+        Private method.
+        Invalidate the measurements discarded from the operation tree since they were taken, so that they will be
+        remeasured. This happens to a Meter created via `rebase()` when its origin, which shares the tree with it,
+        gets a new input.
+        """
+        generations = self.__tree_generations()
+        if generations == self.__stat_generations:
+            return
+
+        if generations["param"] != self.__stat_generations["param"]:
+            self.__measure_param = False
+        if generations["cal"] != self.__stat_generations["cal"]:
+            self.__measure_cal = False
+            self.table_renderer.clear("cal")
+        if generations["mem"] != self.__stat_generations["mem"]:
+            self.__measure_mem = False
+            self.table_renderer.clear("mem")
+        self.__has_nocall_nodes = None
+        self.__has_not_support_nodes = None
+        self.__stat_generations = generations
+
+    def __tree_generations(self) -> Dict[str, int]:
+        """
+        Private method.
+        The generations of the statistics measured by the Meter, see `OperationTree.stat_generation()`.
+
+        Returns:
+            Dict[str, int]: A mapping from the name of each statistics to its generation.
+        """
+        return {stat_name: self.optree.stat_generation(stat_name) for stat_name in ("param", "cal", "mem")}
+
     def _is_ipt_empty(self) -> bool:
         """Determine whether the model input has been provided
 
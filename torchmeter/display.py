@@ -155,6 +155,35 @@ def apply_setting(  # noqa: C901
     return obj
 
 
+def subtree_nodes(node: OperationNode) -> List[OperationNode]:
+    """Get all nodes of the subtree rooted at `node` in preorder.
+
+    The cached preorder array of the operation tree is reused when `node` belongs to one,
+    otherwise the subtree is collected through an iterative dfs traversal.
+
+    Args:
+        node (OperationNode): The root of the subtree.
+
+    Returns:
+        List[OperationNode]: The nodes of the subtree in preorder, starting with `node`.
+    """
+    optree = getattr(node, "_optree", None)
+    if optree is not None:
+        return optree.subtree(node)
+
+    nodes: List[OperationNode] = []
+
+    # task_func for `dfs_task`
+    def __collect(subject: OperationNode, pre_res: Any = None) -> None:  # noqa: ARG001
+        nodes.append(subject)
+
+    dfs_task(dfs_subject=node,
+             adj_func=lambda x: x.childs.values(),
+             task_func=__collect,
+             visited=[])  # fmt: skip
+    return nodes
+
+
 def render_perline(renderable: RenderableType) -> None:
     from time import sleep
 
@@ -379,6 +408,8 @@ class TreeRenderer:
         fold_repeat: bool = __cfg__.tree_fold_repeat
 
         copy_tree: OperationNode = deepcopy(self.opnode)
+        if copy_tree.parent is not None:
+            self.__reroot(copy_tree)
 
         # task_func for `dfs_task`
         def __render_per_node(subject: OperationNode, pre_res=None) -> None:  # noqa: ANN001, ARG001, C901
@@ -529,11 +560,9 @@ class TreeRenderer:
 
             return None
 
-        # apply display setting for each node by dfs traversal
-        dfs_task(dfs_subject=copy_tree,
-                 adj_func=lambda x: x.childs.values(),
-                 task_func=__render_per_node,
-                 visited=[])  # fmt: skip
+        # apply display setting for each node in preorder
+        for node in subtree_nodes(copy_tree):
+            __render_per_node(subject=node)
 
         # cache the rendered result
         if fold_repeat:
@@ -543,6 +572,31 @@ class TreeRenderer:
 
         return copy_tree.display_root
 
+    @staticmethod
+    def __reroot(copy_tree: OperationNode) -> None:
+        """
+        Private method.
+        Regard a non-root node as the root in a copied tree. The ids and the display levels of the nodes in its
+        subtree are re-rooted, and the repeat blocks are re-detected, because the repeat info of the new root
+        only makes sense among its siblings, which are out of the rendering scope.
+        """
+        nodes = subtree_nodes(copy_tree)
+
+        copy_tree.repeat_winsz = 1
+        copy_tree.repeat_time = 1
+        copy_tree._repeat_body = []
+        copy_tree._is_folded = False
+        copy_tree._render_when_repeat = True
+        if copy_tree._optree is not None:
+            list(map(copy_tree._optree.mark_repeat, nodes))
+
+        # the keys of `childs` and the ids in `_repeat_body` are kept, so that nodes can still be accessed by them
+        base_level = int(copy_tree.display_root.label)  # type: ignore
+        relative_ids = [node.relative_id(copy_tree) for node in nodes]
+        for node, node_id in zip(nodes, relative_ids):
+            node.node_id = node_id
+            node.display_root.label = str(int(node.display_root.label) - base_level)  # type: ignore
+
     def __resolve_argtext(
         self,
         text: LAZY_STR_TYPE,
@@ -562,7 +616,12 @@ class TreeRenderer:
         Returns:
             str: Text with all placeholders resolved.
         """
-        attr_dict = copy(attr_owner.__dict__)
+        # the attributes kept in slots, along with those in `__dict__` if any
+        owner_cls = attr_owner.__class__
+        slots = [p for p in getattr(owner_cls, "__slots__", ()) if p not in ("__dict__", "__weakref__")]
+        all_attrs = [f"_{owner_cls.__name__}{p}" if p.startswith("__") else p for p in slots]
+        attr_dict = {p: getattr(attr_owner, p) for p in all_attrs if hasattr(attr_owner, p)}
+        attr_dict.update(getattr(attr_owner, "__dict__", {}))
         attr_dict.update(kwargs)
 
         if callable(text):
@@ -812,7 +871,7 @@ class TabularRenderer:
         def __fill_cell(subject: OperationNode, pre_res: None = None) -> None:  # noqa: ARG001
             nonlocal val_collector, nocall_nodes, col_sample_data  # type: ignore
 
-            if subject.node_id == "0":
+            if subject is self.opnode:
                 return
 
             node_stat = getattr(subject, stat_name)
@@ -821,6 +880,9 @@ class TabularRenderer:
                 stat_infos: List[NamedTuple] = node_stat.detail_val
                 for info_nametuple in stat_infos:
                     info_dict = info_nametuple._asdict()
+                    if self.opnode.parent is not None and "Operation_Id" in info_dict:
+                        # re-root the ids when rendering a subtree
+                        info_dict["Operation_Id"] = subject.relative_id(self.opnode)
                     val_collector = {k: val_collector[k] + [v] for k, v in info_dict.items()}
 
                     if None in col_sample_data.values():
@@ -835,10 +897,8 @@ class TabularRenderer:
             val_collector: Dict[str, List[Any]] = defaultdict(list)
             col_sample_data: Dict[str, Any] = {col_name: None for col_name in valid_fields}
 
-            dfs_task(dfs_subject=self.opnode,
-                     adj_func=lambda x: x.childs.values(),
-                     task_func=__fill_cell,
-                     visited=[])  # fmt: skip
+            for node in subtree_nodes(self.opnode):
+                __fill_cell(subject=node)
 
             if not val_collector:
                 raise RuntimeError(
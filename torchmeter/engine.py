@@ -1,25 +1,156 @@
 from __future__ import annotations
 
-import re
+import sys
+import json
+from array import array
+from types import ModuleType
 from typing import TYPE_CHECKING
-from collections import OrderedDict
+from fnmatch import fnmatchcase
+from hashlib import blake2b
+from collections import OrderedDict, namedtuple
 
+import torch
 import torch.nn as nn
 from rich.tree import Tree
 
-from torchmeter.utils import Timer, dfs_task
+from torchmeter.cache import load_cached_tree, save_cached_tree
+from torchmeter.utils import Timer
+from torchmeter.config import get_config
 from torchmeter.statistic import CalMeter, MemMeter, IttpMeter, ParamsMeter
 
 if TYPE_CHECKING:
-    from typing import List, Tuple, Optional
+    from typing import Any, Dict, List, Type, Tuple, ClassVar, Optional
+
+    from torchmeter.statistic import Statistics
 
     OPNODE_LIST = List["OperationNode"]
 
-__all__ = ["OperationNode", "OperationTree"]
+__all__ = ["module_struct_hash", "OperationNode", "OperationTree", "OperationTreeView"]
+
+# struct-of-arrays view of a tree, each field is an `array('i')` indexed by the position in `OperationTree.preorder`.
+# `-1` means absent (e.g. the parent of root), and `subtree_end` is the exclusive end of each subtree in preorder.
+TreeTopology = namedtuple("TreeTopology", ["parent", "depth", "first_child", "next_sibling", "subtree_end"])
+
+# a node in the file written by `OperationTree.dump()`, nodes are stored in preorder as plain lists of these fields
+TreeRecord = namedtuple(
+    "TreeRecord",
+    ["node_id", "child_num", "repeat_winsz", "repeat_time", "render_when_repeat", "is_folded", "repeat_body", "param"],
+)
+TREE_FILE_VERSION = 1  # bump it whenever the layout of the file changes
+
+
+def module_struct_hash(module: nn.Module, memo: Optional[Dict[int, int]] = None) -> int:
+    """Compute the structural hash of a module in a bottom-up manner.
+
+    The hash of a module is derived from its type, its constructor configuration (i.e. `extra_repr()`, or the
+    whole repr for a leaf module) and the hashes of its children in order, while the names of the children are
+    ignored. So two modules share a same hash if and only if they are structurally identical. The hash is stable
+    across processes, so it can be used as a persistent key.
+
+    Args:
+        module (nn.Module): The module to be hashed.
+        memo (Optional[Dict[int, int]]): A cache mapping `id(module)` to its hash, will be updated in place.
+                                         Each (sub)module is hashed only once when the same memo is reused.
+
+    Returns:
+        int: A 64-bit unsigned integer hash.
+    """
+
+    memo = {} if memo is None else memo
+
+    # each item is (module, whether the hashes of its children are ready)
+    stack: List[Tuple[nn.Module, bool]] = [(module, False)]
+    while stack:
+        mod, is_exit = stack.pop()
+        if id(mod) in memo:
+            continue
+
+        childs = [child for child in mod._modules.values() if child is not None]
+        if childs and not is_exit:
+            stack.append((mod, True))
+            stack.extend((child, False) for child in childs)
+            continue
+
+        mod_cls = mod.__class__
+        hasher = blake2b(f"{mod_cls.__module__}.{mod_cls.__qualname__}".encode(), digest_size=8)
+        if childs:
+            hasher.update(mod.extra_repr().encode())
+            for child in childs:
+                hasher.update(memo[id(child)].to_bytes(8, "little"))
+        else:
+            hasher.update(str(mod).encode())
+        memo[id(mod)] = int.from_bytes(hasher.digest(), "little")
+
+    return memo[id(module)]
+
+
+def index_topology(root: OperationNode) -> Tuple[OPNODE_LIST, OPNODE_LIST, TreeTopology]:
+    """Compute the preorder and postorder node arrays as well as the compact topology arrays of the (sub)tree rooted
+    at `root` in one iterative pass. The depth of `root` is regarded as 0.
+
+    Args:
+        root (OperationNode): The root of the (sub)tree.
+
+    Returns:
+        Tuple[OPNODE_LIST, OPNODE_LIST, TreeTopology]: The preorder node array, the postorder node array and the
+                                                       topology arrays indexed by the position in preorder.
+    """
+    preorder: OPNODE_LIST = []
+    postorder: OPNODE_LIST = []
+    parent, depth, first_child, next_sibling, subtree_end = (array("i") for _ in range(5))
+    last_child = array("i")
+
+    # each item is (node, position of its parent in preorder, False) when entering a node,
+    # or (node, position of itself in preorder, True) after all of its descendants have been visited.
+    stack: List[Tuple[OperationNode, int, bool]] = [(root, -1, False)]
+    while stack:
+        node, idx, is_exit = stack.pop()
+
+        if is_exit:
+            subtree_end[idx] = len(preorder)
+            postorder.append(node)
+            continue
+
+        parent_idx, node_idx = idx, len(preorder)
+        preorder.append(node)
+
+        parent.append(parent_idx)
+        depth.append(depth[parent_idx] + 1 if parent_idx >= 0 else 0)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        subtree_end.append(-1)
+        last_child.append(-1)
+        if parent_idx >= 0:
+            if last_child[parent_idx] < 0:
+                first_child[parent_idx] = node_idx
+            else:
+                next_sibling[last_child[parent_idx]] = node_idx
+            last_child[parent_idx] = node_idx
+
+        stack.append((node, node_idx, True))
+        stack.extend((child, node_idx, False) for child in reversed(node.childs.values()))
+
+    return preorder, postorder, TreeTopology(parent, depth, first_child, next_sibling, subtree_end)
 
 
 class OperationNode:
     statistics: Tuple[str, ...] = ("param", "cal", "mem", "ittp")  # all statistics stored as attributes
+    __stat_types: ClassVar[Dict[str, Type[Statistics]]] = {
+        "param": ParamsMeter,
+        "cal": CalMeter,
+        "mem": MemMeter,
+        "ittp": IttpMeter,
+    }
+
+    # a model may contain a huge number of modules, so all the attributes of a node are kept in slots. `__dict__` is
+    # only an empty slot until an attribute outside them is set, e.g. one patched on an instance.
+    __slots__ = (
+        "operation", "type", "name", "full_name", "node_id",
+        "parent", "_childs", "is_leaf", "_expanded", "_optree", "_preorder_idx",
+        "_struct_hash", "repeat_winsz", "repeat_time", "_repeat_body",
+        "_display_root", "_render_when_repeat", "_is_folded", "module_repr",
+        "__param", "__cal", "__mem", "__ittp", "__dict__",
+    )  # fmt: skip
 
     def __init__(
         self,
@@ -34,162 +165,849 @@ class OperationNode:
                 + f"but got `{type(module).__name__}`."
             )
 
-        # basic info
+        # basic info, strings shared by many nodes are interned
         self.operation = module
-        self.type: str = module.__class__.__name__
-        self.name: str = name if name else self.type
+        self.type: str = sys.intern(module.__class__.__name__)
+        self.name: str = sys.intern(name) if name else self.type
+        self.full_name: str = ""  # fully-qualified module name in the model, e.g. 'layer1.0.conv1'
         self.node_id: str = node_id  # index in the model tree, e.g. '1.2.1'
 
         # hierarchical info
         self.parent: Optional[OperationNode] = parent
-        self.childs: OrderedDict[str, "OperationNode"] = OrderedDict()  # e.g. {'1.2.1': OperationNode, ...}
+        self._childs: OrderedDict[str, "OperationNode"] = OrderedDict()  # e.g. {'1.2.1': OperationNode, ...}
         self.is_leaf: bool = len(module._modules) == 0
+        self._expanded: bool = self.is_leaf  # whether the children have been materialized
+        self._optree: Optional[OperationTree] = None  # the tree the node belongs to, set in `OperationTree`
+        self._preorder_idx: int = -1  # position in `OperationTree.preorder`, set in `OperationTree`
 
         # repeat info
+        self._struct_hash: Optional[int] = None  # computed on first access of `struct_hash`
         self.repeat_winsz: int = 1  # size of repeat block
         self.repeat_time: int = 1
         self._repeat_body: List[Tuple[str, str]] = []  # the ids and names of the nodes in the same repeat block
 
         # display info
-        self.display_root: Tree  # set in `OperationTree.__build()`
-        # whether to render when the node in the repeat window, set in `OperationTree.__build()`
+        self._display_root: Optional[Tree] = None  # created on first access of `display_root`
+        # whether to render when the node in the repeat window, set in `OperationTree.expand_all()`
         self._render_when_repeat: bool = False
-        # whether the node is folded in a repeat block, set in `OperationTree.__build()`
+        # whether the node is folded in a repeat block, set in `OperationTree.expand_all()`
         self._is_folded = False
-        self.module_repr = str(self.type) if not self.is_leaf else str(self.operation)
+        self.module_repr = self.type if not self.is_leaf else sys.intern(str(self.operation))
+
+        # statistic info (all read-only), instantiated on first access in `__init_stat()`
+        self.__param: Optional[ParamsMeter] = None
+        self.__cal: Optional[CalMeter] = None
+        self.__mem: Optional[MemMeter] = None
+        self.__ittp: Optional[IttpMeter] = None
+
+    @property
+    def childs(self) -> OrderedDict[str, OperationNode]:
+        """Child nodes keyed by node id. If the node belongs to a lazy tree, they are materialized on first access."""
+        if not self._expanded and self._optree is not None:
+            self._optree.expand(self)
+        return self._childs
 
-        # statistic info (all read-only)
-        self.__param = ParamsMeter(opnode=self)
-        self.__cal = CalMeter(opnode=self)
-        self.__mem = MemMeter(opnode=self)
-        self.__ittp = IttpMeter(opnode=self)
+    @property
+    def display_root(self) -> Tree:
+        """
+        The `rich.Tree` node used to render the model structure, whose label is the level of the node. For a node
+        in an `OperationTree`, the display nodes of the whole tree are created together on first access.
+        """
+        if self._display_root is None:
+            if self._optree is not None:
+                self._optree.build_display()
+            else:
+                level, ancestor = 0, self.parent
+                while ancestor is not None:
+                    level, ancestor = level + 1, ancestor.parent
+                self._display_root = Tree(label=str(level))
+        return self._display_root  # type: ignore
+
+    @display_root.setter
+    def display_root(self, tree: Tree) -> None:
+        self._display_root = tree
+
+    @property
+    def struct_hash(self) -> int:
+        """Structural hash of the underlying module, see `torchmeter.engine.module_struct_hash`."""
+        if self._struct_hash is None:
+            memo = self._optree._hash_memo if self._optree is not None else None
+            self._struct_hash = module_struct_hash(self.operation, memo=memo)
+        return self._struct_hash
 
     @property
     def param(self) -> ParamsMeter:
-        return self.__param
+        return self.__param if self.__param is not None else self.__init_stat("param")  # type: ignore
 
     @property
     def cal(self) -> CalMeter:
-        return self.__cal
+        return self.__cal if self.__cal is not None else self.__init_stat("cal")  # type: ignore
 
     @property
     def mem(self) -> MemMeter:
-        return self.__mem
+        return self.__mem if self.__mem is not None else self.__init_stat("mem")  # type: ignore
 
     @property
     def ittp(self) -> IttpMeter:
-        return self.__ittp
+        return self.__ittp if self.__ittp is not None else self.__init_stat("ittp")  # type: ignore
+
+    def _discard_stat(self, stat_name: str) -> None:
+        """Drop the statistics `stat_name` of the node, it will be re-instantiated on next access. Note that the
+        data accumulated to the ancestors is not withdrawn, use `OperationTree.reset_stats()` instead.
+        """
+        setattr(self, f"_OperationNode__{stat_name}", None)
+
+    def _detach_stats(self) -> None:
+        """Withdraw the data of all instantiated statistics of the node from those of the ancestors, used before the
+        node is removed from the tree, see `Statistics.detach()`.
+        """
+        for stat_name in self.statistics:
+            stat: Optional[Statistics] = getattr(self, f"_OperationNode__{stat_name}")
+            if stat is not None:
+                stat.detach()
+
+    def __init_stat(self, stat_name: str) -> Statistics:
+        """
+        Private method.
+        Instantiate the statistics `stat_name` of the node and register it to the tree. Since the data of a
+        statistics is linked to that of the same statistics of the parent, the missing ones of the ancestors
+        are instantiated first in a top-down order.
+
+        Returns:
+            Statistics: The instantiated statistics of the node.
+        """
+        slot_name = f"_OperationNode__{stat_name}"
+        stat_cls = self.__stat_types[stat_name]
+
+        missing_nodes = [self]
+        ancestor = self.parent
+        while ancestor is not None and getattr(ancestor, slot_name) is None:
+            missing_nodes.append(ancestor)
+            ancestor = ancestor.parent
+
+        for node in reversed(missing_nodes):
+            setattr(node, slot_name, stat_cls(opnode=node))
+            if node._optree is not None:
+                node._optree._stat_nodes[stat_name].append(node)
+
+        return getattr(self, slot_name)
+
+    def relative_id(self, base: OperationNode) -> str:
+        """The id of the node as if `base` were the root, e.g. `'2.1'` is `'1'` relative to `'2'`.
+
+        Args:
+            base (OperationNode): The new root, must be the node itself or one of its ancestors.
+
+        Returns:
+            str: The re-rooted node id.
+        """
+        if base.parent is None:
+            return self.node_id
+        return "0" if self is base else self.node_id[len(base.node_id) + 1 :]
+
+    def relative_name(self, base: OperationNode) -> str:
+        """The fully-qualified module name of the node as if the module of `base` were the whole model.
+
+        Args:
+            base (OperationNode): The new root, must be the node itself or one of its ancestors.
+
+        Returns:
+            str: The re-rooted module name.
+        """
+        if self is base:
+            return ""
+        return self.full_name[len(base.full_name) + 1 :] if base.full_name else self.full_name
 
     def __repr__(self) -> str:
         return f"{self.node_id} {self.name}: {self.module_repr}"
 
 
 class OperationTree:
-    def __init__(self, model: nn.Module) -> None:
+    def __init__(self, model: nn.Module, lazy: bool = False) -> None:
         if not isinstance(model, nn.Module):
             raise TypeError(
                 f"You must use an `nn.Module` instance to instantiate `{self.__class__.__name__}`, "
                 + f"but got `{type(model).__name__}`."
             )
 
+        self.lazy = lazy
+        self._hash_memo: Dict[int, int] = {}  # id(module) -> structural hash, shared by all nodes
+        # statistics name -> nodes whose statistics has been instantiated, see `OperationNode.__init_stat()`
+        self._stat_nodes: Dict[str, OPNODE_LIST] = {stat_name: [] for stat_name in OperationNode.statistics}
+        # statistics name -> number of times it is discarded via `reset_stats()`, see `stat_generation()`
+        self._stat_generations: Dict[str, int] = dict.fromkeys(OperationNode.statistics, 0)
+
         self.root = OperationNode(module=model)
         self.root._render_when_repeat = True
+        self.root._optree = self
 
-        with Timer(task_desc="Scanning model"):
-            nonroot_nodes, *_ = dfs_task(
-                dfs_subject=self.root,
-                adj_func=lambda x: x.childs.values(),
-                task_func=OperationTree.__build,
-                visited=[],
-            )
+        self.__nodes: OPNODE_LIST = [self.root]  # all materialized nodes, in the order of materialization
+        self.__id_index: Dict[str, OperationNode] = {"0": self.root}  # node id -> node
+        self.__name_index: Dict[str, OperationNode] = {"": self.root}  # fully-qualified module name -> node
+        self.__fully_expanded = False
 
-        self.all_nodes: OPNODE_LIST = [self.root, *nonroot_nodes]
+        # topology caches, filled on first access in `__index_topology()`
+        self.__preorder: Optional[OPNODE_LIST] = None
+        self.__postorder: Optional[OPNODE_LIST] = None
+        self.__topology: Optional[TreeTopology] = None
 
-    @staticmethod
-    def __build(
-        subject: OperationNode,
-        pre_res: Tuple[Optional[OPNODE_LIST], Optional[Tree]] = (None, None),
-    ) -> Tuple[OPNODE_LIST, Optional[Tree]]:
+        if not lazy:
+            with Timer(task_desc="Scanning model"):
+                # hash all modules bottom-up in one pass, so that hashes of children are ready when building
+                module_struct_hash(model, memo=self._hash_memo)
+
+                use_cache = get_config().tree_cache.enabled
+                if not (use_cache and load_cached_tree(self)):
+                    self.expand_all()
+                    if use_cache:
+                        save_cached_tree(self)
+
+    @property
+    def all_nodes(self) -> OPNODE_LIST:
+        """All nodes of the tree. In lazy mode, accessing it materializes the whole tree."""
+        if not self.__fully_expanded:
+            self.expand_all()
+        return self.__nodes
+
+    @property
+    def materialized_num(self) -> int:
+        """Number of nodes materialized so far, which is always less than or equal to `len(all_nodes)`."""
+        return len(self.__nodes)
+
+    @property
+    def struct_hash(self) -> int:
+        """Structural hash of the whole model, see `torchmeter.engine.module_struct_hash`."""
+        return self.root.struct_hash
+
+    @property
+    def preorder(self) -> OPNODE_LIST:
+        """All nodes in depth-first preorder, computed once and shared by all renderers and meters."""
+        if self.__preorder is None:
+            self.__index_topology()
+        return self.__preorder  # type: ignore
+
+    @property
+    def postorder(self) -> OPNODE_LIST:
+        """All nodes in depth-first postorder, i.e. every node comes after all of its descendants."""
+        if self.__postorder is None:
+            self.__index_topology()
+        return self.__postorder  # type: ignore
+
+    @property
+    def topology(self) -> TreeTopology:
+        """The compact struct-of-arrays representation of the tree, indexed by the position in `preorder`."""
+        if self.__topology is None:
+            self.__index_topology()
+        return self.__topology  # type: ignore
+
+    def get_node(self, node_id: str) -> OperationNode:
+        """Get a node by its id in O(1) time. In lazy mode, only the nodes along the path from root to it will
+        be materialized if it is not materialized yet.
+
+        Args:
+            node_id (str): The id of the node, e.g. `'1.2.1'`. `'0'` refers to the root.
+
+        Returns:
+            OperationNode: The node with the given id.
+
+        Raises:
+            ValueError: If there is no node with the given id.
         """
-        Private method.
-        This function will explore the model structure, unfold all multi-layers modules, and organize them
-        into a tree structure. Finally, it will build a display tree and a operation tree in one DFS recursion,
-        simutaneously. With the built display tree, the terminal display of the model structure can be achieved.
-        With the built operation tree, the model statistic can be easily and quickly accessed.
+        node = self.__id_index.get(node_id)
+        if node is not None:
+            return node
+
+        path = node_id.split(".")
+        return self.__locate(path, key_index=self.__id_index, err_msg=f"Invalid node_id: {node_id}.")
+
+    def get_node_by_name(self, full_name: str) -> OperationNode:
+        """Get a node by the fully-qualified name of its module in O(1) time. In lazy mode, only the nodes along
+        the path from root to it will be materialized if it is not materialized yet.
 
         Args:
-            subject (OperationNode): the node to be traversed in the operation tree.
-            pre_res (Tuple[Optional[OPNODE_LIST], Optional[Tree]]): the container of all nodes and the father node
-                                                                   of the display tree
+            full_name (str): The fully-qualified module name as in `nn.Module.named_modules()`,
+                             e.g. `'layer1.0.conv1'`. An empty string refers to the root.
 
         Returns:
-            Tuple[Optional[OPNODE_LIST], Optional[Tree]]: the current traversed node of the operation tree and
-                                                          display tree
+            OperationNode: The node whose module has the given name.
 
-        Note: This function serves as the `task_func` in `torchmeter.utils.dfs_task`
+        Raises:
+            ValueError: If there is no node with the given name.
         """
+        node = self.__name_index.get(full_name)
+        if node is not None:
+            return node
 
-        all_nodes, *display_parent = pre_res
-        all_nodes = all_nodes if all_nodes else []
+        path = full_name.split(".")
+        return self.__locate(path, key_index=self.__name_index, err_msg=f"Invalid module name: {full_name}.")
 
-        # build display tree
-        if display_parent and display_parent[0] is not None:
-            display_parent_node = display_parent[0]
+    def find(self, pattern: str, by: str = "id", with_subtree: bool = False) -> OPNODE_LIST:
+        """Find all nodes whose id or fully-qualified module name matches a glob pattern.
 
-            # create a tree node of rich.Tree, and record the level of the node in attribute 'label'
-            display_node = Tree(label=str(int(display_parent_node.label) + 1))  # type: ignore
+        Args:
+            pattern (str): A glob pattern in the syntax of `fnmatch`, e.g. `'1.*'` or `'layer?.*.conv1'`.
+            by (str): What to match the pattern against, `'id'` for node id, `'name'` for the fully-qualified
+                      module name. Defaults to `'id'`.
+            with_subtree (bool): Whether to return the whole subtrees rooted at the matched nodes. This makes
+                                 prefix queries possible, e.g. `find('layer1', by='name', with_subtree=True)`.
+                                 Defaults to `False`.
 
-            # add the current node to the father node
-            display_parent_node.children.append(display_node)  # type: ignore
-        else:
-            # situation of root node
-            display_node = Tree(label="0")
-
-        # link the display node to the attribute `display_root` of operation node
-        subject.display_root = display_node
-
-        # build operation tree
-        copy_childs, str_childs = [], []
-        for access_idx, (module_name, module) in enumerate(subject.operation._modules.items()):
-            module_idx = (
-                (subject.node_id if subject.node_id != "0" else "")
-                + ("." if subject.node_id != "0" else "")
-                + str(access_idx + 1)
-            )
+        Returns:
+            OPNODE_LIST: The matched nodes in preorder without duplicates.
+
+        Raises:
+            ValueError: If `by` is neither `'id'` nor `'name'`.
+        """
+        if by not in ("id", "name"):
+            raise ValueError(f"`by` must be one of 'id' and 'name', but got `{by}`.")
+
+        preorder = self.preorder
+        subtree_end = self.topology.subtree_end
 
-            child = OperationNode(
-                module=module,  # type: ignore
+        res: OPNODE_LIST = []
+        idx = 0
+        while idx < len(preorder):
+            node = preorder[idx]
+            key = node.relative_id(self.root) if by == "id" else node.relative_name(self.root)
+            if fnmatchcase(key, pattern):
+                if with_subtree:
+                    res.extend(preorder[idx : subtree_end[idx]])
+                    idx = subtree_end[idx]
+                    continue
+                res.append(node)
+            idx += 1
+
+        return res
+
+    def subtree(self, node: OperationNode) -> OPNODE_LIST:
+        """Get the nodes of the subtree rooted at `node` in preorder, without walking the tree.
+
+        Args:
+            node (OperationNode): The root of the subtree, must be a node of this tree.
+
+        Returns:
+            OPNODE_LIST: A slice of `preorder`, starts with `node` itself.
+
+        Raises:
+            ValueError: If `node` does not belong to this tree.
+        """
+        preorder = self.preorder
+        start_idx = node._preorder_idx
+        if not 0 <= start_idx < len(preorder) or preorder[start_idx] is not node:
+            raise ValueError(f"Node `{node.node_id} {node.name}` does not belong to this operation tree.")
+        return preorder[start_idx : self.topology.subtree_end[start_idx]]
+
+    def view(self, node: OperationNode) -> OperationTree:
+        """Get a view of the subtree rooted at `node` without rescanning, see `OperationTreeView`.
+
+        Args:
+            node (OperationNode): The root of the view, must be a node of this tree.
+
+        Returns:
+            OperationTree: An `OperationTreeView` rooted at `node`, or this tree itself if `node` is its root.
+        """
+        return self if node is self.root else OperationTreeView(optree=self, root=node)
+
+    def expand(self, node: OperationNode) -> OPNODE_LIST:
+        """Materialize the direct children of `node`, do nothing if they have been materialized.
+
+        Note that the repeat blocks among the children are not detected here, see `expand_all()`.
+
+        Args:
+            node (OperationNode): The node to be expanded, must be a node of this tree.
+
+        Returns:
+            OPNODE_LIST: The children of `node`.
+        """
+        if node._expanded:
+            return list(node._childs.values())
+        node._expanded = True
+
+        id_prefix = node.node_id + "." if node.node_id != "0" else ""
+        for access_idx, (module_name, module) in enumerate(node.operation._modules.items()):
+            child = self.__new_node(
+                node,
+                node_id=id_prefix + str(access_idx + 1),
                 name=module_name,
-                parent=subject,
-                node_id=module_idx,
+                module=module,  # type: ignore[arg-type]  # a `None` submodule is rejected by `OperationNode`
+            )
+            node._childs[child.node_id] = child
+
+        return list(node._childs.values())
+
+    def expand_all(self) -> None:
+        """
+        Materialize all nodes in one DFS traversal, and then detect the repeat blocks level by level. With the
+        built operation tree, the model statistic can be easily and quickly accessed.
+        """
+        if self.__fully_expanded:
+            return
+
+        stack: OPNODE_LIST = [self.root]
+        while stack:
+            node = stack.pop()
+            childs = self.expand(node)
+            OperationTree.__mark_repeat(node, childs)
+            stack.extend(reversed(childs))
+
+        self.__fully_expanded = True
+
+    def build_display(self) -> None:
+        """
+        Create a `rich.Tree` node for each node that does not have one, and link it to the display node of its
+        parent. The label of each display node is its level in the tree. With the built display tree, the terminal
+        display of the model structure can be achieved.
+        """
+        topology = self.topology
+        for idx, node in enumerate(self.preorder):
+            if node._display_root is not None:
+                continue
+
+            node._display_root = Tree(label=str(topology.depth[idx]))
+
+            parent_idx = topology.parent[idx]
+            if parent_idx >= 0:
+                self.__preorder[parent_idx]._display_root.children.append(node._display_root)  # type: ignore
+
+    def dump(self, file_path: str) -> None:
+        """Save the tree into a compact JSON file, including the node ids, the repeat info and the parameter info of
+        each node, so that the tree of a structurally identical model can be rebuilt via `load()` without detecting
+        repeat blocks and measuring parameters again. The module names are not saved, as they are always taken from
+        the model being loaded.
+
+        Args:
+            file_path (str): The path of the file to be written.
+        """
+        root = self.root
+        id_offset = len(root.node_id) + 1 if root.parent is not None else 0  # re-root the ids for a view
+
+        records = [
+            TreeRecord(
+                node_id=node.relative_id(root),
+                child_num=len(node.childs),
+                repeat_winsz=node.repeat_winsz if node is not root else 1,
+                repeat_time=node.repeat_time if node is not root else 1,
+                render_when_repeat=node._render_when_repeat if node is not root else True,
+                is_folded=node._is_folded if node is not root else False,
+                repeat_body=[body_id[id_offset:] for body_id, _ in node._repeat_body] if node is not root else [],
+                param=node.param.dump(),
             )
+            for node in self.preorder
+        ]
+
+        content = {
+            "version": TREE_FILE_VERSION,
+            "struct_hash": f"{self.struct_hash:016x}",
+            "fields": TreeRecord._fields,
+            "nodes": records,
+        }
+        with open(file_path, "w") as f:
+            json.dump(content, f, separators=(",", ":"))
+
+    def load(self, file_path: str) -> bool:
+        """Rebuild the tree from a file written by `dump()`. The nodes are bound to the modules of the model, while
+        the repeat info and parameter info are filled in from the file. Nothing is loaded if the file is invalid,
+        written by another version, or not of a structurally identical model.
+
+        Args:
+            file_path (str): The path of the file written by `dump()`.
+
+        Returns:
+            bool: Whether the tree is loaded from the file. If not, the tree is still usable and built as usual.
+        """
+        try:
+            with open(file_path, "r") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (
+            not isinstance(content, dict)
+            or content.get("version") != TREE_FILE_VERSION
+            or content.get("struct_hash") != f"{self.struct_hash:016x}"
+            or content.get("fields") != list(TreeRecord._fields)
+        ):
+            return False
+
+        # validate the records against the model before filling in anything
+        loaded: List[Tuple[OperationNode, TreeRecord, OPNODE_LIST]] = []
+        stack: OPNODE_LIST = [self.root]
+        try:
+            for raw_record in content["nodes"]:
+                record = TreeRecord(*raw_record)
+                if not stack:
+                    return False
+
+                node = stack.pop()
+                childs = self.expand(node)
+                if node.relative_id(self.root) != record.node_id or len(childs) != record.child_num:
+                    return False
+
+                loaded.append((node, record, [self.get_node(body_id) for body_id in record.repeat_body]))
+                stack.extend(reversed(childs))
+        except (KeyError, TypeError, ValueError):
+            return False
 
-            all_nodes.append(child)
+        if stack:
+            return False
 
-            subject.childs[module_idx] = child
-            copy_childs.append(child)
-            str_childs.append(re.sub(r"\(.*?\):\s", repl="", string=str(module)))
+        for node, record, body_nodes in loaded:
+            if node is not self.root:
+                node.repeat_winsz = record.repeat_winsz
+                node.repeat_time = record.repeat_time
+                node._render_when_repeat = record.render_when_repeat
+                node._is_folded = record.is_folded
+                node._repeat_body = [(body_node.node_id, body_node.name) for body_node in body_nodes]
+            node.param.restore(record.param)
+
+        self.__fully_expanded = True
+        return True
+
+    def rebuild(self, node: OperationNode) -> OPNODE_LIST:
+        """Rebuild the subtree rooted at `node` after its module is mutated in place or replaced in the parent module,
+        while the rest of the tree is kept. The measured data of the subtree is withdrawn from the ancestors, so that
+        only the rebuilt nodes need to be measured again. The structural hashes of the ancestors are invalidated, and
+        the repeat blocks are re-detected where affected.
+
+        Args:
+            node (OperationNode): A node of this tree. If it is the root, all nodes except the root are rebuilt and
+                                  all statistics are discarded.
+
+        Returns:
+            OPNODE_LIST: The roots of the rebuilt subtrees.
+
+        Raises:
+            ValueError: If `node` does not belong to this tree, or its module has been removed from the parent module.
+        """
+        if node._optree is not self:
+            raise ValueError(f"Node `{node.node_id} {node.name}` does not belong to this operation tree.")
+
+        parent = node.parent
+        if parent is None:
+            self.reset_stats()
+            return self.__rebuild_childs(node)
+
+        module = parent.operation._modules.get(node.name)
+        if module is None:
+            raise ValueError(
+                f"Module `{node.full_name}` has been removed from its parent module, rebuild the parent instead."
+            )
+
+        self.__discard(node)
+        new_node = self.__new_node(parent, node_id=node.node_id, name=node.name, module=module)
+        parent._childs[node.node_id] = new_node  # an existing key keeps its position
+        self.__refresh(parent, [new_node])
+        return [new_node]
+
+    def sync(self, node: Optional[OperationNode] = None) -> OPNODE_LIST:
+        """Detect the submodules that have been replaced, inserted or removed since the tree was built, and rebuild
+        the affected subtrees via `rebuild()`. A replaced submodule only causes its own subtree to be rebuilt, while
+        an insertion or removal causes all the children of its parent to be rebuilt, as their ids are shifted. Only
+        the materialized nodes are checked, since the others will be built from the current model anyway.
+
+        Note that a module mutated in place (e.g. its attributes are changed) cannot be detected, use `rebuild()`.
+
+        Args:
+            node (Optional[OperationNode]): The root of the subtree to be checked. Defaults to the root of the tree.
+
+        Returns:
+            OPNODE_LIST: The roots of the rebuilt subtrees, empty if nothing has changed.
+        """
+        rebuilt: OPNODE_LIST = []
+        stack: OPNODE_LIST = [node if node is not None else self.root]
+        while stack:
+            parent = stack.pop()
+            if not parent._expanded:
+                continue
+
+            modules = parent.operation._modules
+            childs = list(parent._childs.values())
+            if [child.name for child in childs] != list(modules.keys()):
+                rebuilt.extend(self.__rebuild_childs(parent))
+                continue
+
+            for child in childs:
+                if child.operation is not modules[child.name]:
+                    rebuilt.extend(self.rebuild(child))
+                else:
+                    stack.append(child)
+
+        return rebuilt
+
+    def reset_stats(self, *stat_names: str) -> None:
+        """Discard the given statistics of all nodes, so that they will be re-instantiated and remeasured on next
+        access. If no statistics is given, all of them are discarded. For a view, the statistics of the whole
+        underlying tree are discarded, because the data of the subtree has been accumulated to the ancestors.
+
+        Args:
+            *stat_names (str): The names of the statistics to discard, must be in `OperationNode.statistics`.
+
+        Raises:
+            ValueError: If any of `stat_names` is not a valid statistics name.
+        """
+        stat_names = stat_names or OperationNode.statistics
+        invalid_names = [stat_name for stat_name in stat_names if stat_name not in OperationNode.statistics]
+        if invalid_names:
+            raise ValueError(f"Invalid statistics name: {invalid_names}, must be in {OperationNode.statistics}.")
+
+        for stat_name in stat_names:
+            for node in self._stat_nodes[stat_name]:
+                node._discard_stat(stat_name)
+            self._stat_nodes[stat_name].clear()
+            self._stat_generations[stat_name] += 1
+
+    def stat_generation(self, stat_name: str) -> int:
+        """The number of times the given statistics is discarded via `reset_stats()`, which is shared with the views
+        of the tree. A change of it tells the holders of the tree (e.g. the `Meter` instances created via `rebase()`)
+        that their measurements are gone and should be redone.
+
+        Args:
+            stat_name (str): The name of the statistics, must be in `OperationNode.statistics`.
+
+        Returns:
+            int: The generation of the statistics.
+        """
+        return self._stat_generations[stat_name]
+
+    def memory_footprint(self) -> int:
+        """Estimate the memory taken by the tree itself in bytes, i.e. all the materialized nodes, their statistics,
+        display nodes and caches. The model, as well as its parameters and buffers, is not counted.
+
+        Returns:
+            int: The estimated number of bytes.
+        """
+        # the model itself and the shared objects (classes, functions, modules) are not owned by the tree
+        skip_types = (nn.Module, torch.Tensor, ModuleType)
+
+        total_bytes = 0
+        seen = set()
+        stack: List[Any] = [self]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or isinstance(obj, skip_types) or callable(obj):
+                continue
+            seen.add(id(obj))
+            total_bytes += sys.getsizeof(obj)
+
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in obj.__class__.__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot in ("__dict__", "__weakref__"):
+                        continue
+                    slot = f"_{cls.__name__.lstrip('_')}{slot}" if slot.startswith("__") else slot
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+
+        return total_bytes
+
+    def __new_node(self, parent: OperationNode, node_id: str, name: str, module: nn.Module) -> OperationNode:
+        """
+        Private method.
+        Create a child node of `parent` and register it to the tree, the caller should link it to `parent`.
+
+        Returns:
+            OperationNode: The created node.
+        """
+        name_prefix = parent.full_name + "." if parent.full_name else ""
+
+        node = OperationNode(module=module, name=name, parent=parent, node_id=node_id)
+        node._optree = self
+        node.full_name = name_prefix + name
+
+        self.__nodes.append(node)
+        self.__id_index[node.node_id] = node
+        self.__name_index[node.full_name] = node
+        return node
+
+    def __rebuild_childs(self, parent: OperationNode) -> OPNODE_LIST:
+        """
+        Private method.
+        Discard all the children of `parent` along with their subtrees, and rebuild them from the current module.
+
+        Returns:
+            OPNODE_LIST: The new children of `parent`.
+        """
+        for child in parent._childs.values():
+            self.__discard(child)
+
+        parent._childs = OrderedDict()
+        parent.is_leaf = len(parent.operation._modules) == 0
+        parent.module_repr = parent.type if not parent.is_leaf else sys.intern(str(parent.operation))
+        parent._expanded = False
+        childs = self.expand(parent)
+
+        self.__refresh(parent, childs)
+        return childs
+
+    def __discard(self, node: OperationNode) -> None:
+        """
+        Private method.
+        Withdraw the measured data of the subtree rooted at `node` from the ancestors, and unregister all the nodes
+        of the subtree from the tree. The caller should unlink `node` from its parent.
+        """
+        node._detach_stats()
+
+        discarded: OPNODE_LIST = []
+        stack: OPNODE_LIST = [node]
+        while stack:
+            discarded_node = stack.pop()
+            discarded.append(discarded_node)
+            stack.extend(discarded_node._childs.values())
+
+        for discarded_node in discarded:
+            if self.__id_index.get(discarded_node.node_id) is discarded_node:
+                del self.__id_index[discarded_node.node_id]
+            if self.__name_index.get(discarded_node.full_name) is discarded_node:
+                del self.__name_index[discarded_node.full_name]
+            # the module may be mutated in place, or freed so that its id is reused by another module
+            self._hash_memo.pop(id(discarded_node.operation), None)
+            discarded_node._optree = None
+
+        discarded_ids = {id(discarded_node) for discarded_node in discarded}
+        self.__nodes = [n for n in self.__nodes if id(n) not in discarded_ids]
+        for stat_nodes in self._stat_nodes.values():
+            stat_nodes[:] = [n for n in stat_nodes if id(n) not in discarded_ids]
+
+    def __refresh(self, parent: OperationNode, new_nodes: OPNODE_LIST) -> None:
+        """
+        Private method.
+        Bring the tree up to date after the children `new_nodes` of `parent` are rebuilt, including the structural
+        hashes and repeat info of the affected nodes, the topology caches and the display tree.
+        """
+        path: OPNODE_LIST = []
+        ancestor: Optional[OperationNode] = parent
+        while ancestor is not None:
+            ancestor._struct_hash = None
+            self._hash_memo.pop(id(ancestor.operation), None)
+            path.append(ancestor)
+            ancestor = ancestor.parent
+
+        # materialize the new subtrees if the tree has been fully built, otherwise they are left to be expanded
+        if self.__fully_expanded:
+            stack = list(new_nodes)
+            while stack:
+                stack.extend(self.expand(stack.pop()))
+
+        self.__preorder = self.__postorder = self.__topology = None
+        if not self.__fully_expanded:  # the repeat blocks are detected when fully built
+            return
+
+        # the repeat blocks among the children of each ancestor may change with the hashes, descend into the
+        # subtrees of the children whose render strategy is changed, since it is inherited by their descendants
+        for ancestor in reversed(path):
+            stack = [ancestor]
+            while stack:
+                node = stack.pop()
+                childs = list(node._childs.values())
+                render_flags = [child._render_when_repeat for child in childs]
+                OperationTree.__mark_repeat(node, childs)
+                stack.extend(
+                    child
+                    for child, render_flag in zip(childs, render_flags)
+                    if child._expanded and child._render_when_repeat != render_flag
+                )
+
+        stack = [new_node for new_node in new_nodes if new_node._expanded]
+        while stack:
+            node = stack.pop()
+            childs = list(node._childs.values())
+            OperationTree.__mark_repeat(node, childs)
+            stack.extend(child for child in childs if child._expanded)
+
+        if parent._display_root is not None:
+            self.build_display()
+            parent._display_root.children = [child.display_root for child in parent._childs.values()]
+
+    def __locate(self, path: List[str], key_index: Dict[str, OperationNode], err_msg: str) -> OperationNode:
+        """
+        Private method.
+        Walk down from the root along `path` and materialize the nodes on the way, each prefix of `path` joined
+        by '.' is the key of a node on the way in `key_index`.
+
+        Returns:
+            OperationNode: The node at the end of `path`.
+
+        Raises:
+            ValueError: If a node on the way does not exist, with `err_msg` as the message.
+        """
+        node = self.root
+        for depth in range(1, len(path) + 1):
+            self.expand(node)
+            child = key_index.get(".".join(path[:depth]))
+            if child is None or child.parent is not node:
+                raise ValueError(err_msg)
+            node = child
+        return node
+
+    def __index_topology(self) -> None:
+        """
+        Private method.
+        Compute the preorder and postorder node arrays as well as the compact topology arrays,
+        and record the position of each node in the preorder array.
+        """
+        self.expand_all()
+
+        self.__preorder, self.__postorder, self.__topology = index_topology(self.root)
+        for node_idx, node in enumerate(self.__preorder):
+            node._preorder_idx = node_idx
+
+    def mark_repeat(self, node: OperationNode) -> None:
+        """(Re)detect the repeat blocks among the children of `node`, and overwrite their repeat info.
+
+        Args:
+            node (OperationNode): The node whose children are to be checked, its `_render_when_repeat`
+                                  must have been decided.
+        """
+        OperationTree.__mark_repeat(node, list(node.childs.values()))
+
+    @staticmethod
+    def __mark_repeat(parent: OperationNode, childs: OPNODE_LIST) -> None:
+        """
+        Private method.
+        Find all potential maximum repeat blocks among the children of `parent` using a greedy strategy, and
+        record the repeat info as well as the render strategy into the children.
+
+        Args:
+            parent (OperationNode): the node whose children are to be checked, its `_render_when_repeat` must
+                                    have been decided.
+            childs (OPNODE_LIST): the children of `parent` in order.
+        """
+        for child in childs:
+            child.repeat_winsz = 1
+            child.repeat_time = 1
+            child._repeat_body = []
+            child._is_folded = False
+            child._render_when_repeat = False
+
+        hash_childs = [child.struct_hash for child in childs]
 
-        # find all potantial maximum repeat block in currently traversed level using greedy strategy
         slide_start_idx = 0
-        while slide_start_idx < len(str_childs):
-            now_node = copy_childs[slide_start_idx]
-            now_node._render_when_repeat = True & subject._render_when_repeat
+        while slide_start_idx < len(hash_childs):
+            now_node = childs[slide_start_idx]
+            now_node._render_when_repeat = True & parent._render_when_repeat
 
-            # find the maximum window size `m` that satifies `str_childs[0:m] == str_childs[m:2*m]`
+            # find the maximum window size `m` that satifies `hash_childs[0:m] == hash_childs[m:2*m]`
             exist_repeat = False
-            for win_size in range((len(str_childs) - slide_start_idx) // 2, 0, -1):
+            for win_size in range((len(hash_childs) - slide_start_idx) // 2, 0, -1):
                 win1_start_end = [slide_start_idx, slide_start_idx + win_size]
                 win2_start_end = [slide_start_idx + win_size, slide_start_idx + win_size * 2]
 
-                if str_childs[slice(*win1_start_end)] == str_childs[slice(*win2_start_end)]:
+                if hash_childs[slice(*win1_start_end)] == hash_childs[slice(*win2_start_end)]:
                     exist_repeat = True
                     break
 
             # if the maximum window size `m` does exist, then try to explore the repeat time of the window
             if exist_repeat:
                 # whether all the modules in the window are the same
-                inner_repeat = len(set(str_childs[win1_start_end[0] : win2_start_end[1]])) == 1
+                inner_repeat = len(set(hash_childs[win1_start_end[0] : win2_start_end[1]])) == 1
 
                 # multiply the window size `m` by 2 if all the modules in the window are the same
                 repeat_time = win_size * 2 if inner_repeat else 2
@@ -198,7 +1016,7 @@ class OperationTree:
                 win2_start_end[0] += win_size
                 win2_start_end[1] += win_size
 
-                while str_childs[slice(*win1_start_end)] == str_childs[slice(*win2_start_end)]:
+                while hash_childs[slice(*win1_start_end)] == hash_childs[slice(*win2_start_end)]:
                     repeat_time += 1
 
                     win2_start_end[0] += win_size
@@ -207,8 +1025,8 @@ class OperationTree:
                 now_node.repeat_winsz = win_size
                 now_node.repeat_time = repeat_time
                 for idx in range(slide_start_idx, slide_start_idx + win_size):
-                    inwin_node = copy_childs[idx]
-                    inwin_node._render_when_repeat = True & subject._render_when_repeat
+                    inwin_node = childs[idx]
+                    inwin_node._render_when_repeat = True & parent._render_when_repeat
                     inwin_node._is_folded = bool(idx - slide_start_idx)
                     now_node._repeat_body.append((inwin_node.node_id, inwin_node.name))
 
@@ -220,7 +1038,159 @@ class OperationTree:
                 # then jump to the adjacent module and repeat such a procedure
                 slide_start_idx += 1
 
-        return (all_nodes, display_node)
-
     def __repr__(self) -> str:
         return self.root.__repr__()
+
+
+class OperationTreeView(OperationTree):
+    """
+    A view of the subtree rooted at a node of an `OperationTree`. It shares the nodes, and therefore their
+    measurements, with the underlying tree, while the node ids, module names and levels are re-rooted, i.e.
+    the root of the view is regarded as node `'0'` at level 0. Creating a view costs O(1), the subtree
+    is only materialized when traversed.
+    """
+
+    base: OperationTree  # the underlying tree, never a view
+
+    def __init__(self, optree: OperationTree, root: OperationNode) -> None:
+        optree = optree.base if isinstance(optree, OperationTreeView) else optree
+        if root._optree is not optree:
+            raise ValueError(f"Node `{root.node_id} {root.name}` does not belong to the given operation tree.")
+
+        self.base = optree
+        self.lazy = optree.lazy
+        self._hash_memo = optree._hash_memo
+        self._stat_nodes = optree._stat_nodes
+        self._stat_generations = optree._stat_generations
+
+        self.root = root
+
+        # topology caches of the subtree, filled on first access in `__index_topology()`
+        self.__preorder: Optional[OPNODE_LIST] = None
+        self.__postorder: Optional[OPNODE_LIST] = None
+        self.__topology: Optional[TreeTopology] = None
+
+    @property
+    def all_nodes(self) -> OPNODE_LIST:
+        """All nodes of the subtree in preorder."""
+        return self.preorder
+
+    @property
+    def materialized_num(self) -> int:
+        """Number of nodes materialized so far in the underlying tree."""
+        return self.base.materialized_num
+
+    @property
+    def preorder(self) -> OPNODE_LIST:
+        if self.__preorder is None:
+            self.__index_topology()
+        return self.__preorder  # type: ignore
+
+    @property
+    def postorder(self) -> OPNODE_LIST:
+        if self.__postorder is None:
+            self.__index_topology()
+        return self.__postorder  # type: ignore
+
+    @property
+    def topology(self) -> TreeTopology:
+        if self.__topology is None:
+            self.__index_topology()
+        return self.__topology  # type: ignore
+
+    def get_node(self, node_id: str) -> OperationNode:
+        """Get a node by its id relative to the root of the view, see `OperationTree.get_node()`.
+
+        Args:
+            node_id (str): The relative id of the node, `'0'` refers to the root of the view.
+
+        Returns:
+            OperationNode: The node with the given id.
+
+        Raises:
+            ValueError: If there is no node with the given id in the view.
+        """
+        if node_id == "0":
+            return self.root
+
+        id_prefix = self.root.node_id + "." if self.root.parent is not None else ""
+        try:
+            return self.base.get_node(id_prefix + node_id)
+        except ValueError:
+            raise ValueError(f"Invalid node_id: {node_id}.") from None
+
+    def get_node_by_name(self, full_name: str) -> OperationNode:
+        """Get a node by its module name relative to the root of the view, see `OperationTree.get_node_by_name()`.
+
+        Args:
+            full_name (str): The relative module name, an empty string refers to the root of the view.
+
+        Returns:
+            OperationNode: The node whose module has the given name.
+
+        Raises:
+            ValueError: If there is no node with the given name in the view.
+        """
+        if not full_name:
+            return self.root
+
+        name_prefix = self.root.full_name + "." if self.root.full_name else ""
+        try:
+            return self.base.get_node_by_name(name_prefix + full_name)
+        except ValueError:
+            raise ValueError(f"Invalid module name: {full_name}.") from None
+
+    def subtree(self, node: OperationNode) -> OPNODE_LIST:
+        ancestor: Optional[OperationNode] = node
+        while ancestor is not None and ancestor is not self.root:
+            ancestor = ancestor.parent
+        if ancestor is None:
+            raise ValueError(f"Node `{node.node_id} {node.name}` does not belong to this operation tree view.")
+        return self.base.subtree(node)
+
+    def expand(self, node: OperationNode) -> OPNODE_LIST:
+        return self.base.expand(node)
+
+    def expand_all(self) -> None:
+        """Materialize all nodes in the subtree."""
+        if self.__preorder is None:
+            self.__index_topology()
+
+    def build_display(self) -> None:
+        self.base.build_display()
+
+    def rebuild(self, node: OperationNode) -> OPNODE_LIST:
+        """Rebuild the subtree rooted at `node` in the underlying tree, see `OperationTree.rebuild()`. If `node` is
+        the root of the view, the view is re-rooted at the rebuilt node.
+
+        Returns:
+            OPNODE_LIST: The roots of the rebuilt subtrees.
+        """
+        self.subtree(node)  # check the membership
+        rebuilt = self.base.rebuild(node)
+        if node is self.root:
+            self.root = rebuilt[0]
+        self.__preorder = self.__postorder = self.__topology = None
+        return rebuilt
+
+    def sync(self, node: Optional[OperationNode] = None) -> OPNODE_LIST:
+        """Rebuild the changed subtrees in the view, see `OperationTree.sync()`.
+
+        Returns:
+            OPNODE_LIST: The roots of the rebuilt subtrees.
+        """
+        rebuilt = self.base.sync(node if node is not None else self.root)
+        if rebuilt:
+            self.__preorder = self.__postorder = self.__topology = None
+        return rebuilt
+
+    def __index_topology(self) -> None:
+        """
+        Private method.
+        Compute the preorder and postorder node arrays as well as the compact topology arrays of the subtree,
+        the positions in the arrays are local to the view.
+        """
+        self.__preorder, self.__postorder, self.__topology = index_topology(self.root)
+
+    def __repr__(self) -> str:
+        return f"0 {self.root.name}: {self.root.module_repr}"
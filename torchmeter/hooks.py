@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from torch.nn.modules.module import register_module_forward_hook, register_module_forward_pre_hook
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Callable, Optional
+
+    import torch.nn as nn
+    from torch.utils.hooks import RemovableHandle
+
+__all__ = ["HookDispatcher"]
+
+
+class HookDispatcher:
+    """
+    A measurement backend that installs a single global forward pre-hook and a single global forward hook
+    (see `torch.nn.modules.module.register_module_forward_hook`) instead of one hook per module. When a module
+    is called, the hooks added for it are looked up by `id(module)`, so the overhead is a constant per call no
+    matter how many modules are measured, and there is nothing to register on or remove from each module.
+
+    The global hooks only exist within the `with` block, all the added hooks are dropped on exit. They are
+    available since torch 1.9, which is therefore the minimum version required by torchmeter.
+
+    Example:
+        ```python
+        dispatcher = HookDispatcher()
+        dispatcher.add(model.fc, lambda module, ipt, opt: print(opt.shape))
+        with dispatcher:
+            model(x)
+        ```
+    """
+
+    def __init__(self) -> None:
+        # id(module) -> hooks of the module in order, a list is replaced rather than mutated on removal,
+        # so that a hook can safely remove itself while the list is being iterated
+        self.__pre_hooks: Dict[int, List[Callable]] = {}
+        self.__hooks: Dict[int, List[Callable]] = {}
+        self.__handles: List[RemovableHandle] = []
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the global hooks are installed."""
+        return bool(self.__handles)
+
+    def add(self, module: nn.Module, hook: Callable, pre: bool = False) -> Callable:
+        """Add a hook for `module`, which is called as if it is registered via `module.register_forward_hook()`
+        (or `module.register_forward_pre_hook()` if `pre` is `True`).
+
+        Args:
+            module (nn.Module): The module to be hooked.
+            hook (Callable): The hook, whose signature is `hook(module, ipt, opt)`, or `hook(module, ipt)` if
+                             `pre` is `True`.
+            pre (bool): Whether it is a forward pre-hook. Defaults to `False`.
+
+        Returns:
+            Callable: `hook` itself, which can be passed to `remove()`.
+        """
+        hook_map = self.__pre_hooks if pre else self.__hooks
+        hook_map[id(module)] = [*hook_map.get(id(module), ()), hook]
+        return hook
+
+    def remove(self, module: nn.Module, hook: Optional[Callable] = None, pre: bool = False) -> None:
+        """Remove a hook of `module` added via `add()`, do nothing if it does not exist.
+
+        Args:
+            module (nn.Module): The hooked module.
+            hook (Optional[Callable]): The hook to be removed. If `None`, all hooks of `module` are removed.
+            pre (bool): Whether it is a forward pre-hook. Defaults to `False`.
+        """
+        hook_map = self.__pre_hooks if pre else self.__hooks
+        if hook is None:
+            hook_map.pop(id(module), None)
+            return
+
+        hooks = [h for h in hook_map.get(id(module), ()) if h is not hook]
+        if hooks:
+            hook_map[id(module)] = hooks
+        else:
+            hook_map.pop(id(module), None)
+
+    def clear(self) -> None:
+        """Remove all the added hooks."""
+        self.__pre_hooks.clear()
+        self.__hooks.clear()
+
+    def __enter__(self) -> HookDispatcher:
+        if not self.__handles:
+            self.__handles = [
+                register_module_forward_pre_hook(self.__dispatch_pre),
+                register_module_forward_hook(self.__dispatch),
+            ]
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for handle in self.__handles:
+            handle.remove()
+        self.__handles = []
+        self.clear()
+
+    def __dispatch_pre(self, module: nn.Module, ipt: Any) -> None:
+        """
+        Private method.
+        The global forward pre-hook, which calls the pre-hooks added for `module`.
+        """
+        hooks = self.__pre_hooks.get(id(module))
+        if hooks is not None:
+            for hook in hooks:
+                hook(module, ipt)
+
+    def __dispatch(self, module: nn.Module, ipt: Any, opt: Any) -> None:
+        """
+        Private method.
+        The global forward hook, which calls the hooks added for `module`.
+        """
+        hooks = self.__hooks.get(id(module))
+        if hooks is not None:
+            for hook in hooks:
+                hook(module, ipt, opt)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+from collections import namedtuple
+
+import torch.nn as nn
+from torch import Tensor
+
+from torchmeter.hooks import HookDispatcher
+from torchmeter.utils import measure_mode
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Tuple
+
+    from torchmeter.core import IPT_TYPE
+    from torchmeter.engine import OperationTree
+
+__all__ = ["LivenessReport", "trace_liveness"]
+
+LivenessReport = namedtuple("LivenessReport", ["peak_bytes", "peak_node_id", "total_bytes", "curve"])
+LivenessReport.__doc__ = """The live activations over the execution of a model, see `trace_liveness()`.
+
+Attributes:
+    peak_bytes (int): The maximum bytes of the activations alive at the same time.
+    peak_node_id (str): The id of the node returning at the peak, `""` if no module is called.
+    total_bytes (int): The bytes of all distinct activations, as if none of them was freed.
+    curve (List[Tuple[str, int]]): The id of each node and the live bytes when it returns, in execution order.
+"""
+
+
+def trace_liveness(optree: OperationTree, ipt: IPT_TYPE) -> LivenessReport:
+    """Track the lifetime of each activation in a feed-forward pass, to estimate the peak bytes the activations
+    take at the same time, rather than the sum of all outputs (i.e. `OutputCost` of `MemMeter`).
+
+    An activation is a tensor passed into or returned by a module, which is identified by its storage, so that
+    views and in-place results are counted once. It is alive from the call that creates it until the last one
+    using it, and each module returning is a step of the execution. The use of a tensor outside the modules is
+    unknown, so it is assumed as follows:
+        - The input of a module is used until it returns, except for `nn.Sequential`, which only passes it to its
+          first submodule. The input of the model is used throughout.
+        - The output of a module which is not passed into any later module is used by the enclosing module until
+          it returns, e.g. the residual added to the output of a block.
+
+    The model is run without autograd (see `torchmeter.utils.measure_mode`), so the tensors saved for backward,
+    the workspaces of the operators and the tensors only passed as keyword arguments are not counted.
+
+    Args:
+        optree (OperationTree): The operation tree of the model.
+        ipt (IPT_TYPE): The input to feed the model, with keys `args` and `kwargs`, see `Meter.ipt`.
+
+    Returns:
+        LivenessReport: The peak live bytes, the node where the peak occurs, the total bytes and the curve.
+    """
+    tracker = _LivenessTracker(optree)
+
+    dispatcher = HookDispatcher()
+    for module in {id(node.operation): node.operation for node in optree.all_nodes}.values():
+        dispatcher.add(module, tracker.pre_hook, pre=True)
+        dispatcher.add(module, tracker.hook)
+
+    model: nn.Module = optree.root.operation
+    with measure_mode(), dispatcher:
+        model(*ipt["args"], **ipt["kwargs"])
+
+    return tracker.report()
+
+
+class _LivenessTracker:
+    """The hooks recording the lifetime of each activation, see `trace_liveness()`."""
+
+    def __init__(self, optree: OperationTree) -> None:
+        self.root = optree.root.operation
+        # id(module) -> id of its first node, a shared module is labeled by where it first appears
+        self.node_ids: Dict[int, str] = {}
+        for node in optree.all_nodes:
+            self.node_ids.setdefault(id(node.operation), node.node_id)
+
+        # each record is [bytes, step of creation, step of last use, whether used after being returned]
+        self.records: List[List[Any]] = []
+        # storage key -> index of the record and a weak reference to the latest tensor seen, which tells
+        # whether the storage is freed and its address reused by another tensor
+        self.storages: Dict[int, Tuple[int, weakref.ref]] = {}
+        # the records of the inputs of each running module and of the outputs of its submodules
+        self.input_stack: List[List[int]] = []
+        self.output_stack: List[List[int]] = []
+        self.steps: List[str] = []
+
+    def pre_hook(self, module: nn.Module, ipt: Any) -> None:  # noqa: ARG002
+        idxs = [self.__record(t, step=len(self.steps)) for t in _tensors(ipt)]
+        for idx in idxs:
+            self.records[idx][3] = True
+        self.input_stack.append(idxs)
+        self.output_stack.append([])
+
+    def hook(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002
+        step = len(self.steps)
+        self.steps.append(self.node_ids[id(module)])
+
+        input_idxs = self.input_stack.pop()
+        if module is self.root or not isinstance(module, nn.Sequential):
+            self.__use(input_idxs, step)
+        self.__use([idx for idx in self.output_stack.pop() if not self.records[idx][3]], step)
+
+        output_idxs = [self.__record(t, step=step) for t in _tensors(opt)]
+        self.__use(output_idxs, step)
+        for idx in output_idxs:
+            self.records[idx][3] = False
+        if self.output_stack:
+            self.output_stack[-1].extend(output_idxs)
+
+    def report(self) -> LivenessReport:
+        deltas = [0] * (len(self.steps) + 1)
+        for nbytes, created, last, _ in self.records:
+            deltas[min(created, len(self.steps))] += nbytes
+            deltas[last + 1] -= nbytes
+
+        curve: List[Tuple[str, int]] = []
+        live = 0
+        for node_id, delta in zip(self.steps, deltas):
+            live += delta
+            curve.append((node_id, live))
+
+        peak_node_id, peak_bytes = max(curve, key=lambda item: item[1], default=("", 0))
+        return LivenessReport(
+            peak_bytes=peak_bytes,
+            peak_node_id=peak_node_id,
+            total_bytes=sum(record[0] for record in self.records),
+            curve=curve,
+        )
+
+    def __record(self, tensor: Tensor, step: int) -> int:
+        """
+        Private method.
+        Get the index of the record of the storage of `tensor`, a new record created at `step` is added if the
+        storage is seen for the first time.
+
+        Returns:
+            int: The index of the record.
+        """
+        if tensor.device.type == "meta":  # no address
+            key, nbytes = id(tensor), tensor.numel() * tensor.element_size()
+        else:
+            storage = tensor.untyped_storage() if hasattr(tensor, "untyped_storage") else tensor.storage()
+            key = storage.data_ptr()
+            nbytes = storage.nbytes() if hasattr(storage, "nbytes") else storage.size() * tensor.element_size()
+
+        seen = self.storages.get(key)
+        if seen is not None and seen[1]() is not None:
+            idx = seen[0]
+        else:
+            idx = len(self.records)
+            self.records.append([nbytes, step, step, False])
+        self.storages[key] = (idx, weakref.ref(tensor))
+        return idx
+
+    def __use(self, idxs: List[int], step: int) -> None:
+        """
+        Private method.
+        Extend the lifetime of the records to `step`.
+        """
+        for idx in idxs:
+            record = self.records[idx]
+            record[2] = max(record[2], step)
+
+
+def _tensors(val: Any) -> List[Tensor]:
+    """The tensors in `val`, which is a tensor or a (nested) tuple, list or dict.
+
+    Returns:
+        List[Tensor]: The tensors in depth-first order.
+    """
+    if isinstance(val, Tensor):
+        return [val]
+    if isinstance(val, (tuple, list)):
+        return [t for item in val for t in _tensors(item)]
+    if isinstance(val, dict):
+        return [t for item in val.values() for t in _tensors(item)]
+    return []
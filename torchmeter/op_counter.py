@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from operator import mul
+from functools import reduce, partial
+from contextlib import suppress
+
+import torch
+from torch.utils._python_dispatch import TorchDispatchMode
+
+from torchmeter.cal_rules import INTERP_TAPS, CalCost
+
+if TYPE_CHECKING:
+    import sys
+
+    if sys.version_info >= (3, 10):
+        from typing import TypeAlias
+    else:
+        from typing_extensions import TypeAlias
+
+    from typing import Any, Dict, List, Tuple, Callable, Optional, Sequence
+
+    import torch.nn as nn
+
+    from torchmeter.hooks import HookDispatcher
+    from torchmeter.statistic import CalMeter
+
+    OP_RULE_TYPE: TypeAlias = Callable[[Tuple[Any, ...], Dict[str, Any], Any], CalCost]
+
+__all__ = ["OpCounter", "register_op_rule", "unregister_op_rule", "get_op_rule"]
+
+aten = torch.ops.aten
+
+# aten op packet -> the rule computing the cost of a call of it
+OP_RULES: Dict[Any, OP_RULE_TYPE] = {}
+
+
+def register_op_rule(op: Any, rule: Optional[OP_RULE_TYPE] = None) -> Any:
+    """Register a rule for an aten operator (e.g. `torch.ops.aten.mm`) counted by `OpCounter`, the existing rule
+    of it is overwritten. A rule is a callable taking the positional and keyword arguments and the output of a
+    call, and returning a `CalCost`. It can be used as a decorator if `rule` is omitted.
+
+    Args:
+        op (Any): An aten operator packet or one of its overloads (e.g. `torch.ops.aten.mm.default`), the rule
+                  applies to all the overloads of it.
+        rule (Optional[OP_RULE_TYPE]): The rule. Defaults to `None`.
+
+    Returns:
+        Any: `rule` itself, or a decorator registering the decorated function if `rule` is omitted.
+
+    Raises:
+        TypeError: If `rule` is not callable.
+    """
+    if rule is None:
+        return partial(register_op_rule, op)
+    if not callable(rule):
+        raise TypeError(f"`rule` must be callable, but got `{type(rule).__name__}`.")
+
+    OP_RULES[getattr(op, "overloadpacket", op)] = rule
+    return rule
+
+
+def unregister_op_rule(op: Any) -> None:
+    """Remove the rule registered for an aten operator, do nothing if there is not one.
+
+    Args:
+        op (Any): An aten operator packet or one of its overloads.
+    """
+    OP_RULES.pop(getattr(op, "overloadpacket", op), None)
+
+
+def get_op_rule(op: Any) -> Optional[OP_RULE_TYPE]:
+    """Get the rule of an aten operator.
+
+    Args:
+        op (Any): An aten operator packet or one of its overloads.
+
+    Returns:
+        Optional[OP_RULE_TYPE]: The rule, `None` if the operator is not counted.
+    """
+    return OP_RULES.get(getattr(op, "overloadpacket", op))
+
+
+class OpCounter(TorchDispatchMode):
+    """
+    A measurement backend for `CalMeter` that sees the aten operators instead of the modules. It counts what the
+    module hooks miss, i.e. the functional calls in a custom `forward` such as `torch.matmul`, `@`, `einsum`,
+    `F.conv2d` and `F.scaled_dot_product_attention`, which are all dispatched to the aten operators costed here.
+
+    The modules being called are tracked as a stack via the hooks added to a `HookDispatcher`, and the cost of an
+    operator is added to the `CalMeter` of the innermost one, from which it is summed up to all the ancestors.
+    Since the cost only depends on the shapes, it works on the `meta` device as well.
+
+    Example:
+        ```python
+        dispatcher = HookDispatcher()
+        counter = OpCounter(dispatcher)
+        for node in optree.all_nodes:
+            counter.track(node.operation, node.cal)
+        with dispatcher, counter:
+            model(x)
+        ```
+    """
+
+    def __init__(self, dispatcher: HookDispatcher) -> None:
+        super().__init__()
+        self.__dispatcher = dispatcher
+        self.__stack: List[Optional[CalMeter]] = []
+
+    def track(self, module: nn.Module, cal: Optional[CalMeter]) -> None:
+        """Add the cost of the operators called by `module` itself (i.e. not by its submodules) to `cal`.
+
+        Args:
+            module (nn.Module): The module to be tracked.
+            cal (Optional[CalMeter]): The statistics of `module`, the operators are dropped if it is `None`, e.g.
+                                      if `module` was measured before.
+        """
+        self.__dispatcher.add(module, partial(self.__enter_module, cal), pre=True)
+        self.__dispatcher.add(module, self.__exit_module)
+
+    def __torch_dispatch__(
+        self,
+        func: Any,
+        types: Sequence[type],
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        kwargs = kwargs or {}
+        opt = func(*args, **kwargs)
+
+        if self.__stack and self.__stack[-1] is not None:
+            rule = OP_RULES.get(func.overloadpacket)
+            if rule is not None:
+                self.__stack[-1].count_op(rule(args, kwargs, opt))
+
+        return opt
+
+    def __enter_module(self, cal: Optional[CalMeter], module: nn.Module, ipt: Any) -> None:  # noqa: ARG002
+        """
+        Private method.
+        The forward pre-hook of a tracked module.
+        """
+        self.__stack.append(cal)
+
+    def __exit_module(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002
+        """
+        Private method.
+        The forward hook of a tracked module.
+        """
+        self.__stack.pop()
+
+
+def _numel(shape: Sequence[int]) -> int:
+    return reduce(mul, shape, 1)
+
+
+def matmul_rule(
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],  # noqa: ARG001
+    opt: Any,
+    mat_idx: int = 0,
+    has_bias: bool = False,
+) -> CalCost:
+    """The rule of matrix products (e.g. `mm`, `bmm`, `addmm`), each output element is the dot product of two
+    vectors, whose length is the last dimension of the first matrix at `args[mat_idx]`.
+
+    Returns:
+        CalCost: The calculation cost of the operator.
+    """
+    k = args[mat_idx].shape[-1]
+    m = opt.numel()
+    return CalCost(macs=m * k, flops=m * (2 * k - 1 + has_bias))
+
+
+def convolution_rule(args: Tuple[Any, ...], kwargs: Dict[str, Any], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of `aten.convolution`, whose arguments are `(input, weight, bias, stride, padding, dilation,
+    transposed, output_padding, groups)`. The weight is of shape `(C_out, C_in / groups, *kernel_size)`, or
+    `(C_in, C_out / groups, *kernel_size)` if transposed.
+
+    Returns:
+        CalCost: The calculation cost of the operator.
+    """
+    ipt, weight, bias, transposed = args[0], args[1], args[2], args[6]
+    n = _numel(weight.shape[1:])
+    m = opt.numel()
+
+    # each output element of a convolution is a dot product of length `n`, while each input element of a
+    # transposed convolution is scattered to `n` output elements
+    macs = ipt.numel() * n if transposed else m * n
+    return CalCost(macs=macs, flops=2 * macs - m * (bias is None))
+
+
+def sdpa_rule(args: Tuple[Any, ...], kwargs: Dict[str, Any], opt: Any) -> CalCost:  # noqa: ARG001
+    """The rule of the fused scaled dot product attention, i.e. `softmax(Q @ K^T / scale) @ V`, where the two
+    matrix products are counted, while the scaling and softmax are not.
+
+    Returns:
+        CalCost: The calculation cost of the operator.
+    """
+    query, key, value = args[:3]
+    *batch, q_len, qk_dim = query.shape
+    kv_len, v_dim = key.shape[-2], value.shape[-1]
+    m = _numel(batch) * q_len
+    return CalCost(
+        macs=m * kv_len * (qk_dim + v_dim),
+        flops=m * (kv_len * (2 * qk_dim - 1) + v_dim * (2 * kv_len - 1)),
+    )
+
+
+def interpolate_rule(
+    args: Tuple[Any, ...],  # noqa: ARG001
+    kwargs: Dict[str, Any],  # noqa: ARG001
+    opt: Any,
+    mode: str,
+) -> CalCost:
+    """The rule of the interpolations called by `F.interpolate`, see `torchmeter.cal_rules.upsample_rule`.
+
+    Returns:
+        CalCost: The calculation cost of the operator.
+    """
+    taps = INTERP_TAPS[mode]
+    m = opt.numel()
+    return CalCost(macs=taps * m, flops=(2 * taps - 1) * m)
+
+
+def _registrable(*names: str) -> List[Any]:
+    """The aten operators of the given names which exist in the installed torch.
+
+    Returns:
+        List[Any]: The existing operators, in the order of `names`.
+    """
+    ops = []
+    for name in names:
+        with suppress(AttributeError, RuntimeError):
+            ops.append(getattr(aten, name))
+    return ops
+
+
+for _op in _registrable("mm", "bmm", "mv", "dot", "vdot"):
+    register_op_rule(_op, matmul_rule)
+for _op in _registrable("addmm", "baddbmm", "addmv"):
+    register_op_rule(_op, partial(matmul_rule, mat_idx=1, has_bias=True))
+for _op in _registrable("convolution", "_convolution"):
+    register_op_rule(_op, convolution_rule)
+for _op in _registrable(
+    "_scaled_dot_product_flash_attention",
+    "_scaled_dot_product_flash_attention_for_cpu",
+    "_scaled_dot_product_efficient_attention",
+    "_scaled_dot_product_cudnn_attention",
+):
+    register_op_rule(_op, sdpa_rule)
+for _mode, _name in (
+    ("linear", "upsample_linear1d"),
+    ("bilinear", "upsample_bilinear2d"),
+    ("trilinear", "upsample_trilinear3d"),
+    ("bicubic", "upsample_bicubic2d"),
+):
+    for _op in _registrable(_name):
+        register_op_rule(_op, partial(interpolate_rule, mode=_mode))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from collections import namedtuple
+
+import torch
+
+from torchmeter.utils import packed_params
+from torchmeter.cal_rules import CAL_RULES, conv_rule, linear_rule
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Tuple, Union, Optional
+
+    import torch.nn as nn
+
+    from torchmeter.engine import OperationNode, OperationTree
+
+__all__ = ["PrecisionCost", "precision_breakdown"]
+
+PrecisionCost = namedtuple(
+    "PrecisionCost", ["macs", "flops", "param_cost", "buffer_cost", "output_cost"], defaults=(0, 0, 0, 0, 0)
+)
+PrecisionCost.__doc__ = """The costs spent in a numeric precision, see `precision_breakdown()`.
+
+Attributes:
+    macs (Union[int, float]): The number of multiply-accumulate operations computed in the precision.
+    flops (Union[int, float]): The number of operations computed in the precision, which are integer ones for an
+                               integer data type.
+    param_cost (int): The bytes of the parameters, including the packed weights of the quantized modules.
+    buffer_cost (int): The bytes of the buffers.
+    output_cost (int): The bytes of the outputs.
+"""
+
+# the rules of the modules which have quantized counterparts, i.e. those projected to an integer data type
+QUANTIZABLE_RULES = (conv_rule, linear_rule)
+
+
+def precision_breakdown(
+    optree: OperationTree,
+    dtype: Optional[Union[str, torch.dtype]] = None,
+) -> Dict[str, PrecisionCost]:
+    """Break the calculation and memory costs of a measured model down by numeric precision.
+
+    The calculation cost of a module is attributed to the data type of its output, so that the quantized modules
+    are counted as integer operations. The parameters and buffers of all modules are attributed to their own
+    data types. The `cal` and `mem` statistics of the nodes should be measured beforehand.
+
+    If `dtype` is given, the costs are projected as if the model ran in it, with the calculation cost given by
+    the same rules and the bytes scaled by the element size:
+        - For a floating point `dtype`, all floating point computations, parameters, buffers and outputs are cast.
+        - For an integer or quantized `dtype`, only the modules having quantized counterparts (i.e. linear and
+          convolutional layers) are cast, as in a typical post-training quantization. Their biases are kept in
+          floating point, as the quantized modules do.
+
+    Args:
+        optree (OperationTree): The operation tree of the model, whose `cal` and `mem` are measured.
+        dtype (Optional[Union[str, torch.dtype]]): The data type to project to, e.g. `"bfloat16"` or `torch.qint8`.
+                                                   Defaults to `None`, i.e. no projection.
+
+    Returns:
+        Dict[str, PrecisionCost]: A mapping from the name of each data type (e.g. `"float32"`) to its costs. The
+                                  calculation cost of a module whose output has no tensor is keyed by `"unknown"`.
+
+    Raises:
+        TypeError: If `dtype` is not a data type of torch.
+    """
+    target = _to_dtype(dtype) if dtype is not None else None
+
+    costs: Dict[str, List[Union[int, float]]] = {}
+
+    def add(src_dtype: Optional[torch.dtype], field: int, val: Union[int, float], castable: bool) -> None:
+        if not val:
+            return
+        if castable and target is not None and src_dtype is not None and src_dtype.is_floating_point:
+            if field >= 2:  # bytes
+                val = val * _element_size(target) // _element_size(src_dtype)
+            src_dtype = target
+        costs.setdefault(_dtype_name(src_dtype), [0] * len(PrecisionCost._fields))[field] += val
+
+    seen_tensors = set()
+    for node in optree.all_nodes:
+        module: nn.Module = node.operation
+        castable = (
+            target is None or target.is_floating_point or CAL_RULES.resolve(type(module)) in QUANTIZABLE_RULES
+        )
+
+        add(node.cal.dtype, 0, _own_val(node, "cal", "Macs"), castable)
+        add(node.cal.dtype, 1, _own_val(node, "cal", "Flops"), castable)
+        add(node.mem.dtype, 4, _own_val(node, "mem", "OutputCost"), castable)
+
+        tensors: List[Tuple[int, Any]] = [(2, p) for p in module._parameters.values() if p is not None]
+        tensors += [(2, p) for p in packed_params(module)]
+        tensors += [(3, b) for b in module._buffers.values() if b is not None]
+        for field, tensor in tensors:
+            if id(tensor) not in seen_tensors:  # shared ones
+                seen_tensors.add(id(tensor))
+                # the biases of the quantized modules stay in floating point
+                is_bias = field == 2 and tensor.dim() < 2
+                tensor_castable = castable and not (is_bias and target is not None and not target.is_floating_point)
+                add(tensor.dtype, field, tensor.numel() * tensor.element_size(), tensor_castable)
+
+    return {name: PrecisionCost(*vals) for name, vals in costs.items()}
+
+
+def _own_val(node: OperationNode, stat_name: str, attr_name: str) -> Union[int, float]:
+    """The part of a linked data of a node excluding that accumulated from its children.
+
+    Returns:
+        Union[int, float]: The value of the node itself.
+    """
+    val = getattr(getattr(node, stat_name), attr_name).val
+    return val - sum(getattr(getattr(child, stat_name), attr_name).val for child in node.childs.values())
+
+
+def _to_dtype(dtype: Union[str, torch.dtype]) -> torch.dtype:
+    """Resolve a data type of torch from itself or its name.
+
+    Returns:
+        torch.dtype: The data type.
+
+    Raises:
+        TypeError: If `dtype` is neither a data type of torch nor its name.
+    """
+    res = getattr(torch, dtype, None) if isinstance(dtype, str) else dtype
+    if not isinstance(res, torch.dtype):
+        raise TypeError(f"`dtype` must be a data type of torch or its name, but got `{dtype}`.")
+    return res
+
+
+def _dtype_name(dtype: Optional[torch.dtype]) -> str:
+    """The name of a data type without the `torch.` prefix, or `"unknown"` for `None`.
+
+    Returns:
+        str: The name of the data type.
+    """
+    return "unknown" if dtype is None else str(dtype).split(".")[-1]
+
+
+def _element_size(dtype: torch.dtype) -> int:
+    """The number of bytes of an element of the data type, including the quantized ones.
+
+    Returns:
+        int: The number of bytes.
+    """
+    size = getattr(dtype, "itemsize", None)  # torch >= 2.1
+    return size if size is not None else torch._utils._element_size(dtype)
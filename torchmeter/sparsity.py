@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from collections import namedtuple
+
+from torchmeter.cal_rules import CAL_RULES, rnn_rule, conv_rule, linear_rule, rnn_cell_rule
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Tuple, Optional
+
+    import torch.nn as nn
+    from torch import Tensor
+
+    from torchmeter.engine import OperationTree
+
+__all__ = ["SparsityCost", "sparsity_analysis"]
+
+SparsityCost = namedtuple(
+    "SparsityCost",
+    [
+        "numel",
+        "nonzero",
+        "density",
+        "macs",
+        "effective_macs",
+        "dense_bytes",
+        "coo_bytes",
+        "csr_bytes",
+        "bitmask_bytes",
+        "semi_structured_bytes",
+    ],
+)
+SparsityCost.__doc__ = """The sparsity of the weights of a module and its effective costs, see `sparsity_analysis()`.
+
+Attributes:
+    numel (int): The number of elements of the weights.
+    nonzero (int): The number of nonzero elements of the weights, with the pruning masks applied.
+    density (float): The ratio of `nonzero` to `numel`.
+    macs (int): The number of multiply-accumulate operations measured by `cal`, as if the weights were dense.
+    effective_macs (int): The number of multiply-accumulate operations involving a nonzero weight, which is
+                          `macs` itself for a module whose cost is not proportional to its weights (e.g. norms).
+    dense_bytes (int): The bytes of the weights stored densely.
+    coo_bytes (int): The bytes in COO format, i.e. the nonzero values and their coordinates.
+    csr_bytes (int): The bytes in CSR format, with each weight viewed as a matrix of its first dimension by the rest.
+    bitmask_bytes (int): The bytes of the nonzero values along with a bitmask of their locations.
+    semi_structured_bytes (Optional[int]): The bytes in 2:4 semi-structured format, i.e. the two kept values out of
+                                           every four consecutive ones along the rows, plus a 2-bit index of each.
+                                           `None` if any weight does not follow the 2:4 pattern.
+"""
+
+# the rules whose MACs are proportional to the number of weights, i.e. those skipped by a sparse kernel
+WEIGHT_BOUND_RULES = (conv_rule, linear_rule, rnn_rule, rnn_cell_rule)
+
+# the bytes of an index, which is `torch.int64` in the sparse tensors of torch
+INDEX_BYTES = 8
+
+
+def sparsity_analysis(optree: OperationTree) -> Dict[str, SparsityCost]:
+    """Analyze the sparsity of the weights of each node and the costs it would take with sparse kernels and formats.
+
+    The weights are the floating point parameters with at least 2 dimensions owned by a module, e.g. those of the
+    convolutional, linear and recurrent layers, while the biases are excluded. For a module pruned via
+    `torch.nn.utils.prune`, the original weight with its mask applied is inspected. The `cal` statistics of the
+    nodes should be measured beforehand.
+
+    Args:
+        optree (OperationTree): The operation tree of the model, whose `cal` is measured.
+
+    Returns:
+        Dict[str, SparsityCost]: A mapping from the id of each node having weights to its sparsity and costs.
+    """
+    res: Dict[str, SparsityCost] = {}
+    for node in optree.all_nodes:
+        module: nn.Module = node.operation
+        weights = _weights(module)
+        if not weights:
+            continue
+
+        macs = node.cal.Macs.val
+        is_weight_bound = CAL_RULES.resolve(type(module)) in WEIGHT_BOUND_RULES
+
+        numel = nonzero = 0
+        nbytes: List[Optional[int]] = [0] * 5  # dense, coo, csr, bitmask and semi-structured
+        for weight in weights:
+            nnz = int(weight.count_nonzero())
+            numel += weight.numel()
+            nonzero += nnz
+            for idx, val in enumerate(_format_bytes(weight, nnz)):
+                prev = nbytes[idx]
+                nbytes[idx] = None if val is None or prev is None else prev + val
+
+        density = nonzero / numel
+        res[node.node_id] = SparsityCost(
+            numel,
+            nonzero,
+            density,
+            macs,
+            round(macs * density) if is_weight_bound else macs,
+            *nbytes,
+        )
+
+    return res
+
+
+def _weights(module: nn.Module) -> List[Tensor]:
+    """The floating point weights owned by the module, with the masks of `torch.nn.utils.prune` applied.
+
+    Returns:
+        List[Tensor]: The detached weights, empty if the module owns none.
+    """
+    weights = []
+    for name, param in module._parameters.items():
+        if param is None or param.dim() < 2 or not param.is_floating_point():
+            continue
+        # a pruned parameter `weight` is kept as `weight_orig`, with a buffer `weight_mask`
+        mask = module._buffers.get(name[: -len("_orig")] + "_mask") if name.endswith("_orig") else None
+        weights.append(param.detach() if mask is None else param.detach() * mask)
+    return weights
+
+
+def _format_bytes(weight: Tensor, nnz: int) -> Tuple[int, int, int, int, Optional[int]]:
+    """The bytes of the weight with `nnz` nonzero elements in dense, COO, CSR, bitmask and 2:4 semi-structured
+    formats, the last one is `None` if the weight does not follow the 2:4 pattern.
+
+    Returns:
+        Tuple[int, int, int, int, Optional[int]]: The bytes in each format.
+    """
+    elem_size = weight.element_size()
+    mat = weight.reshape(weight.shape[0], -1)
+
+    semi_structured: Optional[int] = None
+    if not mat.shape[1] % 4 and not (mat.reshape(mat.shape[0], -1, 4) != 0).sum(dim=-1).gt(2).any():
+        kept = mat.numel() // 2
+        semi_structured = kept * elem_size + -(-kept * 2 // 8)  # the kept values and their 2-bit indices
+
+    return (
+        weight.numel() * elem_size,
+        nnz * (elem_size + weight.dim() * INDEX_BYTES),
+        nnz * (elem_size + INDEX_BYTES) + (mat.shape[0] + 1) * INDEX_BYTES,
+        -(-weight.numel() // 8) + nnz * elem_size,
+        semi_structured,
+    )
@@ -1,38 +1,49 @@
 from __future__ import annotations
 
-import re
 from abc import ABC, abstractmethod
 from time import perf_counter
 from typing import TYPE_CHECKING
-from operator import mul, attrgetter
-from functools import reduce, partial
+from operator import attrgetter
+from functools import partial
 from collections import namedtuple
 
 import numpy as np
 import torch.nn as nn
-from torch import Tensor, no_grad
+from torch import Size, Tensor, zeros, no_grad
 from torch.cuda import Event as cuda_event
 from torch.cuda import synchronize as cuda_sync
 from pympler.asizeof import asizeof
 
+from torchmeter.utils import iopt_shapes, packed_params, input_signature
+from torchmeter.cal_rules import CAL_RULES, CAL_COST_CACHE
 from torchmeter._stat_numeric import TimeUnit, CountUnit, SpeedUnit, BinaryUnit, MetricsData, UpperLinkData
 
 if TYPE_CHECKING:
-    from typing import Any, Dict, List, Tuple, Optional, Sequence, NamedTuple
+    from typing import Any, Dict, List, Tuple, Union, Callable, Optional, Sequence, NamedTuple
 
     from tqdm import tqdm
+    from torch import dtype as tc_dtype
     from torch import device as tc_device
     from torch.cuda import Event
     from torch.utils.hooks import RemovableHandle
 
+    from torchmeter.hooks import HookDispatcher
     from torchmeter.engine import OperationNode
+    from torchmeter.cal_rules import CAL_RULE_TYPE, CalCost
 
-__all__ = ["ParamsMeter", "CalMeter", "MemMeter", "IttpMeter"]
+__all__ = ["ParamsMeter", "CalMeter", "MemMeter", "IttpMeter", "TimingOverhead", "calibrate_overhead"]
+
+# the self-cost of a benchmark in seconds, i.e. a pair of timer calls and a module call through empty global hooks
+TimingOverhead = namedtuple("TimingOverhead", ["timer", "hook"])
+
+# lower bound of a benchmarked time after the overhead is subtracted, in seconds
+MIN_ELAPSE = 1e-9
 
 
 class Statistics(ABC):
     detail_val_container: NamedTuple
     overview_val_container: NamedTuple
+    link_fields: Tuple[str, ...] = ()  # names of the data linked to that of the parent, see `init_linkdata()`
 
     def __new__(cls, *args, **kwargs) -> Statistics:  # noqa: ARG004
         if not hasattr(cls, "detail_val_container"):
@@ -102,6 +113,84 @@ class Statistics(ABC):
             )
         return link_data
 
+    def hook_model(
+        self,
+        hook: Callable,
+        dispatcher: Optional[HookDispatcher] = None,
+    ) -> Union[RemovableHandle, Callable]:
+        """Register a forward hook on the module of the current statistics, or add it to `dispatcher` if given.
+
+        Args:
+            hook (Callable): The forward hook, whose signature is `hook(module, ipt, opt)`.
+            dispatcher (Optional[HookDispatcher]): The global hook dispatcher, see `torchmeter.hooks`.
+
+        Returns:
+            Union[RemovableHandle, Callable]: The handle of the registered hook, or the hook itself if it is added
+                                              to `dispatcher`, which can be removed via `dispatcher.remove()`.
+        """
+        model: nn.Module = self._model  # type: ignore[attr-defined]
+        if dispatcher is not None:
+            return dispatcher.add(model, hook)
+        return model.register_forward_hook(hook)
+
+    def detach(self) -> None:
+        """Withdraw the linked data of the current statistics from those of the ancestors, used before its node is
+        removed from the tree. The data of the descendants goes along with it, since it has been accumulated here.
+        """
+        opparent = self._opnode.parent  # type: ignore[attr-defined]
+        if opparent is None:
+            return
+
+        upper_stat = getattr(opparent, self.name)
+        for attr_name in self.link_fields:
+            upper_data: UpperLinkData = getattr(upper_stat, attr_name)
+            upper_data += -getattr(self, attr_name).val
+
+    def extrapolate_linkdata(self, src: Statistics, *attr_names: str) -> None:
+        """Accumulate the own part of the linked data of `src`, i.e. excluding the part accumulated from its
+        children, to the corresponding data of the current statistics. The access count is copied as well.
+
+        Args:
+            src (Statistics): A statistics of the same kind, whose node is structurally identical to the current one.
+            *attr_names (str): Names of the linked data to be extrapolated.
+        """
+        src_childs = src._opnode.childs.values()  # type: ignore[attr-defined]
+        for attr_name in attr_names:
+            src_data: UpperLinkData = getattr(src, attr_name)
+            dst_data: UpperLinkData = getattr(self, attr_name)
+
+            child_val = sum(getattr(getattr(child, self.name), attr_name).val for child in src_childs)
+            dst_data += src_data.val - child_val
+
+            for _ in range(src_data.access_cnt - dst_data.access_cnt):
+                dst_data.mark_access()
+
+    def extrapolate_rows(self, src_rows: Sequence[NamedTuple], data_map: Dict[int, Any]) -> List[NamedTuple]:
+        """Copy the detail rows of another statistics to the current node. The data in `data_map` (keyed by the
+        `id()` of the data of the other statistics) is replaced, and the operation type is flagged as extrapolated.
+
+        Args:
+            src_rows (Sequence[NamedTuple]): The detail rows of the other statistics.
+            data_map (Dict[int, Any]): Maps the `id()` of each data of the other statistics to the corresponding
+                                       data of the current statistics.
+
+        Returns:
+            List[NamedTuple]: The copied rows.
+        """
+        opnode: OperationNode = self._opnode  # type: ignore[attr-defined]
+        dst_rows = []
+        for row in src_rows:
+            fields = {field: data_map[id(val)] for field, val in zip(row._fields, row) if id(val) in data_map}
+            dst_rows.append(
+                row._replace(  # type: ignore[attr-defined]
+                    Operation_Id=opnode.node_id,
+                    Operation_Name=opnode.name,
+                    Operation_Type=row.Operation_Type + "(extrapolated)",  # type: ignore[attr-defined]
+                    **fields,
+                )
+            )
+        return dst_rows
+
     def __repr__(self) -> str:
         repr_str = self.val.__class__.__name__ + "\n"
 
@@ -132,6 +221,8 @@ class ParamsMeter(Statistics):
         defaults=[None] * 5,  # type: ignore
     )  # fmt: skip
 
+    link_fields = ("RegNum", "TotalNum")
+
     def __init__(self, opnode: OperationNode) -> None:
         if opnode.__class__.__name__ != "OperationNode":
             raise TypeError(
@@ -192,7 +283,38 @@ class ParamsMeter(Statistics):
         if self.is_measured:
             return
 
-        if not self._model._parameters:
+        self.__record([
+            (param_name, param_val.requires_grad, param_val.numel())
+            for param_name, param_val in self._model._parameters.items()
+            if param_val is not None
+        ], no_param=not self._model._parameters)
+
+    def dump(self) -> List[Tuple[str, bool, int]]:
+        """Export the parameter info of the node as plain records, which can be restored via `restore()`.
+
+        Returns:
+            List[Tuple[str, bool, int]]: A record `(param_name, requires_grad, numel)` for each parameter.
+        """
+        self.measure()
+        return [
+            (row.Param_Name, row.Requires_Grad, row.Numeric_Num.val)  # type: ignore
+            for row in self.__stat_ls
+            if row.Param_Name is not None  # type: ignore
+        ]
+
+    def restore(self, records: Sequence[Sequence[Any]]) -> None:
+        """Fill in the parameter info exported by `dump()` without measuring, do nothing if already measured.
+
+        Args:
+            records (Sequence[Sequence[Any]]): A record `(param_name, requires_grad, numel)` for each parameter.
+        """
+        if self.is_measured:
+            return
+
+        self.__record(records, no_param=not records)
+
+    def __record(self, records: Sequence[Sequence[Any]], no_param: bool) -> None:
+        if no_param:
             self.__stat_ls.append(
                 self.detail_val_container(  # type: ignore
                     Operation_Id=self._opnode.node_id,  # type: ignore
@@ -202,13 +324,9 @@ class ParamsMeter(Statistics):
                 )
             )
         else:
-            for param_name, param_val in self._model._parameters.items():
-                if param_val is None:
-                    continue
-                p_num = param_val.numel()
-
+            for param_name, requires_grad, p_num in records:
                 p_reg = False
-                if param_val.requires_grad:
+                if requires_grad:
                     p_reg = True
                     self.__RegNum += p_num
 
@@ -249,6 +367,8 @@ class CalMeter(Statistics):
         defaults=(None,) * 5, # type: ignore
     )  # fmt: skip
 
+    link_fields = ("Macs", "Flops")
+
     def __init__(self, opnode: OperationNode) -> None:
         if opnode.__class__.__name__ != "OperationNode":
             raise TypeError(
@@ -259,7 +379,14 @@ class CalMeter(Statistics):
 
         self.__stat_ls: List[NamedTuple] = []  # record the flops and macs information of each operation
         self.is_measured = False
+        self.is_extrapolated = False  # whether the measurement is reused from a structurally identical node
         self.__is_not_supported = False
+        # (kernel size, bias, input shapes, output shapes) of the first call, the hooks only fill this slot and
+        # the detail row is built from it on access, so that no string is formatted during the feed-forward
+        self.__raw_row: Optional[Tuple[Any, Any, Any, Any]] = None
+        self.__rule: Optional[CAL_RULE_TYPE] = None  # resolved on measuring, see `torchmeter.cal_rules`
+        self.__is_cacheable = False  # whether the cost of the rule is shared via `CAL_COST_CACHE`
+        self.dtype: Optional[tc_dtype] = None  # the precision of the computation, i.e. the data type of the output
 
         _opparent: Optional[OperationNode] = opnode.parent
         self.__Macs = self.init_linkdata(
@@ -290,7 +417,7 @@ class CalMeter(Statistics):
     @property
     def detail_val(self) -> List[NamedTuple]:
         self.__is_valid_access()
-        return self.__stat_ls
+        return self.__build_rows()
 
     @property
     def val(self) -> NamedTuple:
@@ -314,20 +441,53 @@ class CalMeter(Statistics):
         res_dict = {key.ljust(max_keylen): value for key, value in res_dict.items()}
         return res_dict
 
-    def measure(self) -> Optional[RemovableHandle]:
+    def measure(
+        self,
+        dispatcher: Optional[HookDispatcher] = None,
+        count_ops: bool = False,
+    ) -> Optional[Union[RemovableHandle, Callable]]:
+        """Hook the module to measure its calculation cost in the next feed-forward.
+
+        Args:
+            dispatcher (Optional[HookDispatcher]): The dispatcher the hook is added to, or `None` to register the
+                                                   hook on the module itself. Defaults to `None`.
+            count_ops (bool): Whether the aten operators called in the forward are counted via
+                              `torchmeter.op_counter.OpCounter` along with the hook, in which case a leaf module
+                              without a rule in `torchmeter.cal_rules` is measured by the operators it calls
+                              rather than marked as not supported. Defaults to `False`.
+
+        Returns:
+            Optional[Union[RemovableHandle, Callable]]: The handle of the hook, or the hook itself if `dispatcher`
+                                                        is provided. `None` if measured before.
+        """
         if self.is_measured:
             return None
 
-        hook = self.__regist_hook(self._model)  # torch.utils.hooks.RemovableHandle
+        hook = self.hook_model(self.__select_hook(self._model, count_ops), dispatcher=dispatcher)
 
         self.is_measured = True
 
         return hook
 
+    def extrapolate(self, src: CalMeter) -> None:
+        """Reuse the measurement of `src` instead of measuring, the node of `src` should be structurally
+        identical to the current one and see the same input. It should be applied to each node in the subtree.
+        """
+        self.extrapolate_linkdata(src, *self.link_fields)
+        self.__is_not_supported = src.is_not_supported
+        self.dtype = src.dtype
+        self.__stat_ls.extend(
+            self.extrapolate_rows(src.__build_rows(), {id(src.Macs): self.Macs, id(src.Flops): self.Flops})
+        )
+
+        self.is_measured = True
+        self.is_extrapolated = True
+
     def __is_valid_access(self) -> bool:
         if self.is_measured:
             if (
                 not (self.Flops.val + self.Macs.val)
+                and self.__raw_row is None
                 and not self.__stat_ls
                 and not isinstance(self._model, (nn.ModuleDict, nn.ModuleList))
             ):
@@ -338,11 +498,40 @@ class CalMeter(Statistics):
             )
         return True
 
+    def __build_rows(self) -> List[NamedTuple]:
+        """
+        Private method.
+        Build the detail row from the raw data recorded by the hooks, which is done only once.
+
+        Returns:
+            List[NamedTuple]: The detail rows, empty if the module has not been measured.
+        """
+        if self.__raw_row is not None and not self.__stat_ls:
+            kernel_size, bias, ipt_shapes, opt_shapes = self.__raw_row
+            linked_data = {} if self.__is_not_supported else {"MACs": self.Macs, "FLOPs": self.Flops}
+            self.__stat_ls.append(
+                self.detail_val_container(  # type: ignore
+                    Operation_Id=self._opnode.node_id,  # type: ignore
+                    Operation_Name=self._opnode.name,  # type: ignore
+                    Operation_Type=self._opnode.type,  # type: ignore
+                    Kernel_Size=kernel_size,  # type: ignore
+                    Bias=bias,  # type: ignore
+                    Input=self.__iopt_repr(ipt_shapes),  # type: ignore
+                    Output=self.__iopt_repr(opt_shapes),  # type: ignore
+                    **linked_data,  # type: ignore
+                )
+            )
+        return self.__stat_ls
+
     def __iopt_repr(self, iopt: Any) -> str:
         item_repr: Sequence[str]
 
-        if isinstance(iopt, Tensor):
-            return str(list(iopt.shape))
+        # the shapes of the tensors are recorded by `iopt_shapes()`, which are tuples as well
+        if isinstance(iopt, (Tensor, Size)):
+            return str(list(getattr(iopt, "shape", iopt)))
+
+        elif isinstance(iopt, type):
+            return iopt.__name__
 
         elif iopt is None:
             return "None"
@@ -360,211 +549,79 @@ class CalMeter(Statistics):
         else:
             return type(iopt).__name__
 
-    def __regist_hook(self, module: nn.Module) -> RemovableHandle:
-        if not self._opnode.is_leaf:
-            h = module.register_forward_hook(self.__container_hook)
-
-        elif isinstance(module, (nn.Conv1d, nn.Conv2d, nn.Conv3d)):
-            h = module.register_forward_hook(self.__conv_hook)
-
-        elif isinstance(module, (nn.Sigmoid, nn.Tanh, nn.ReLU, nn.ReLU6, nn.SiLU, nn.PReLU, nn.RReLU, nn.LeakyReLU)):
-            h = module.register_forward_hook(self.__activate_hook)
-
-        elif isinstance(module, (nn.BatchNorm1d, nn.BatchNorm2d, nn.BatchNorm3d)):
-            h = module.register_forward_hook(self.__BN_hook)
-
-        elif isinstance(module, nn.Linear):
-            h = module.register_forward_hook(self.__linear_hook)
-
-        elif isinstance(module, (nn.MaxPool1d, nn.AvgPool1d, nn.MaxPool2d, nn.AvgPool2d, nn.MaxPool3d, nn.AvgPool3d)):
-            h = module.register_forward_hook(self.__pool_hook)
-
-        else:
-            h = module.register_forward_hook(self.__not_support_hook)
-
-        return h
-
-    def __conv_hook(self, module: nn.Module, ipt: Tuple[Tensor], opt: Tensor) -> None:
-        c_in = ipt[0].shape[1]
-        n = c_in * reduce(mul, module.kernel_size)
-        m = opt.numel()
-        is_bias = 1 if module.bias is not None else 0
+    def count_op(self, cost: CalCost) -> None:
+        """Add the cost of an operator called by the module itself, see `torchmeter.op_counter.OpCounter`. It is
+        ignored if the module is measured by a rule or extrapolated, whose cost is known already.
 
-        FLOPs = m * (2 * n - 1 + is_bias)
-        MACs = m * n
-        self.__Macs += MACs
-        self.__Flops += FLOPs
+        Args:
+            cost (CalCost): The cost of the operator.
+        """
+        if self.__rule is not None or self.is_extrapolated:
+            return
+        self.__Macs += cost.macs
+        self.__Flops += cost.flops
 
-        if len(self.__stat_ls):
-            self.Macs.mark_access()
-            self.Flops.mark_access()
-        else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Kernel_Size=list(module.kernel_size),  # type: ignore
-                    Bias=bool(is_bias),  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
+    def __select_hook(self, module: nn.Module, count_ops: bool = False) -> Callable:
+        # the rule is resolved once here, so that nothing is dispatched in each call of the hook
+        self.__rule = CAL_RULES.resolve(module.__class__)
+        self.__is_cacheable = self.__rule is not None and CAL_RULES.is_cacheable(self.__rule)
+        if not self._opnode.is_leaf:
+            # the rule of a module with submodules counts what is computed outside them, see `CalRuleRegistry`
+            return self.__container_hook if self.__rule is None else self.__rule_hook
+
+        if self.__rule is None:
+            # the cost is summed up from the operators, the hook only records the row
+            return self.__container_hook if count_ops else self.__not_support_hook
+        return self.__rule_hook
+
+    def __rule_hook(self, module: nn.Module, ipt: Tuple[Any, ...], opt: Any) -> None:
+        if self._opnode.is_leaf and self.__is_cacheable:
+            # structurally identical modules seeing a same input share the cost, see `CalCostCache`
+            # the training mode is out of the structural hash, but changes the cost of e.g. `nn.Dropout`, so does
+            # the configuration missed by `extra_repr()`, which is told by the output, e.g. `ceil_mode` of pooling
+            cache_key = (
+                self.__rule,
+                self._opnode.struct_hash,
+                module.training,
+                input_signature(ipt),
+                input_signature(opt),
             )
-
-    def __linear_hook(self, module: nn.Module, ipt: Tuple[Tensor], opt: Tensor) -> None:
-        k = module.in_features
-        l = module.out_features  # noqa
-        is_bias = 1 if module.bias is not None else 0
-        n = k
-
-        FLOPs = l * (2 * n - 1 + is_bias)
-        MACs = l * n
-        self.__Macs += MACs
-        self.__Flops += FLOPs
-
-        if len(self.__stat_ls):
-            self.Macs.mark_access()
-            self.Flops.mark_access()
+            cost = CAL_COST_CACHE.get(cache_key)
+            if cost is None:
+                cost = self.__rule(module, ipt, opt)  # type: ignore[misc]
+                CAL_COST_CACHE.put(cache_key, cost)
         else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Bias=bool(is_bias),  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
-            )
-
-    def __BN_hook(self, module: nn.Module, ipt: Tuple[Tensor], opt: Tensor) -> None:  # noqa: ARG002
-        FLOPs = 4 * ipt[0].numel()
-        MACs = 0.5 * FLOPs
-        self.__Macs += MACs
-        self.__Flops += FLOPs
-
-        if len(self.__stat_ls):
+            # the structural hash of a module with submodules misses the configuration out of its `extra_repr()`,
+            # e.g. the number of heads of `nn.MultiheadAttention`, so does that of a rule registered as uncacheable
+            cost = self.__rule(module, ipt, opt)  # type: ignore[misc]
+
+        self.__Macs += cost.macs
+        self.__Flops += cost.flops
+
+        # each timestep of a recurrent module is counted as an access, so that the cost per step is shown
+        access_cnt = cost.steps or 1
+        if self.__raw_row is None:
+            self.__raw_row = (cost.kernel_size, cost.bias, iopt_shapes(ipt), iopt_shapes(opt))
+            self.dtype = _tensor_dtype(opt)
+            access_cnt -= 1
+        for _ in range(access_cnt):
             self.Macs.mark_access()
             self.Flops.mark_access()
-        else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
-            )
-
-    def __activate_hook(self, module: nn.Module, ipt: Tuple[Tensor], opt: Tensor) -> None:
-        k = ipt[0].numel()
-        if isinstance(module, (nn.Sigmoid, nn.PReLU, nn.RReLU, nn.LeakyReLU)):
-            FLOPs = 4 * k
-            MACs = 2 * k
-
-        elif isinstance(module, nn.Tanh):
-            FLOPs = 9 * k
-            MACs = 5 * k
-
-        elif isinstance(module, (nn.ReLU, nn.ReLU6)):
-            FLOPs = k
-            MACs = k
-
-        else:  # SiLU
-            FLOPs = 5 * k
-            MACs = 3 * k
-
-        self.__Macs += MACs
-        self.__Flops += FLOPs
-
-        if len(self.__stat_ls):
-            self.Macs.mark_access()
-            self.Flops.mark_access()
-        else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
-            )
-
-    def __pool_hook(self, module: nn.Module, ipt: Tuple[Tensor], opt: Tensor) -> None:
-        k = module.kernel_size
-        if isinstance(k, int):
-            dimension = int(re.findall(r"\d+", module.__class__.__name__)[0])
-            k = (k,) * dimension
-
-        n = reduce(mul, k) - 1
-        m = opt.numel()
-
-        if isinstance(module, (nn.MaxPool1d, nn.MaxPool2d, nn.MaxPool3d)):  # noqa: SIM108
-            FLOPs = n * m
-        else:  # avgpool
-            FLOPs = (2 * n + 1) * m
-        MACs = n * m
-
-        self.__Macs += MACs
-        self.__Flops += FLOPs
-
-        if len(self.__stat_ls):
-            self.Macs.mark_access()
-            self.Flops.mark_access()
-        else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Kernel_Size=list(k),  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
-            )
 
     def __container_hook(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002
-        if len(self.__stat_ls):
+        if self.__raw_row is None:
+            self.__raw_row = (None, None, iopt_shapes(ipt), iopt_shapes(opt))
+            self.dtype = _tensor_dtype(opt)
+        else:
             self.Macs.mark_access()
             self.Flops.mark_access()
-        else:
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                    MACs=self.Macs,  # type: ignore
-                    FLOPs=self.Flops,  # type: ignore
-                )
-            )
 
     def __not_support_hook(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002
         self.__is_not_supported = True
 
-        if not len(self.__stat_ls):
-            self.__stat_ls.append(
-                self.detail_val_container(  # type: ignore
-                    Operation_Id=self._opnode.node_id,  # type: ignore
-                    Operation_Name=self._opnode.name,  # type: ignore
-                    Operation_Type=self._opnode.type,  # type: ignore
-                    Input=self.__iopt_repr(ipt),  # type: ignore
-                    Output=self.__iopt_repr(opt),  # type: ignore
-                )
-            )
+        if self.__raw_row is None:
+            self.__raw_row = (None, None, iopt_shapes(ipt), iopt_shapes(opt))
+            self.dtype = _tensor_dtype(opt)
 
 
 class MemMeter(Statistics):
@@ -588,6 +645,8 @@ class MemMeter(Statistics):
         defaults=(None,) * 7, # type: ignore
     )  # fmt: skip
 
+    link_fields = ("ParamCost", "BufferCost", "OutputCost", "TotalCost")
+
     def __init__(self, opnode: OperationNode) -> None:
         if opnode.__class__.__name__ != "OperationNode":
             raise TypeError(
@@ -600,6 +659,13 @@ class MemMeter(Statistics):
 
         self.__stat_ls: List[NamedTuple] = []  # record the flops and macs information of each operation
         self.is_measured = False  # used for cache
+        self.is_extrapolated = False  # whether the measurement is reused from a structurally identical node
+        # (param cost, buffer cost, output cost, total cost) of the first call, the detail row is built from it
+        # on access, so that the hook only does arithmetic
+        self.__raw_row: Optional[Tuple[int, int, int, int]] = None
+        # whether the output is produced by the module itself, decided on the first call, see `__is_whole()`
+        self.__owns_output: bool = opnode.is_leaf
+        self.dtype: Optional[tc_dtype] = None  # the data type of the output
 
         _opparent: Optional[OperationNode] = opnode.parent
         self.__ParamCost = self.init_linkdata(
@@ -638,7 +704,7 @@ class MemMeter(Statistics):
     @property
     def detail_val(self) -> List[NamedTuple]:
         self.__is_valid_access()
-        return self.__stat_ls
+        return self.__build_rows()
 
     @property
     def val(self) -> NamedTuple:
@@ -669,69 +735,122 @@ class MemMeter(Statistics):
         res_dict = {key.ljust(max_keylen): value for key, value in res_dict.items()}
         return res_dict
 
-    def measure(self) -> Optional[RemovableHandle]:
+    def measure(self, dispatcher: Optional[HookDispatcher] = None) -> Optional[Union[RemovableHandle, Callable]]:
         if self.is_measured:
             return None
 
-        hook = self._model.register_forward_hook(self.__hook_func)
+        hook = self.hook_model(self.__hook_func, dispatcher=dispatcher)
 
         self.is_measured = True
 
         return hook
 
-    def __hook_func(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002, C901
-        opt_cost = 0
-        if self._opnode.is_leaf and not self.is_inplace:
-            outs = opt if isinstance(opt, tuple) else (opt,)
-            for opt in outs:
-                if isinstance(opt, Tensor):
-                    opt_cost += opt.numel() * opt.element_size()  # byte
-                elif isinstance(opt, np.ndarray):
-                    opt_cost += opt.nbytes
-                elif isinstance(opt, str):
-                    # Note: string storage is optimized after python 3.12, so the value changes with the version,
-                    # but it is not significantly changed, which does not affect the macro measurement results.
-                    opt_cost += opt.__sizeof__()
-                else:
-                    opt_cost += asizeof(opt)
+    def extrapolate(self, src: MemMeter) -> None:
+        """Reuse the measurement of `src` instead of measuring, the node of `src` should be structurally
+        identical to the current one and see the same input. It should be applied to each node in the subtree.
+        """
+        self.extrapolate_linkdata(src, *self.link_fields)
+        self.__owns_output = src.__owns_output
+        self.dtype = src.dtype
+        self.__stat_ls.extend(
+            self.extrapolate_rows(
+                src.__build_rows(), {id(getattr(src, name)): getattr(self, name) for name in self.link_fields}
+            )
+        )
+
+        self.is_measured = True
+        self.is_extrapolated = True
+
+    def __hook_func(self, module: nn.Module, ipt: Any, opt: Any) -> None:  # noqa: ARG002
+        if self.__raw_row is None:
+            self.__owns_output = self.__is_whole()
+
+        opt_cost = _output_bytes(opt) if self.__owns_output and not self.is_inplace else 0
         self.__OutputCost += opt_cost
 
-        if len(self.__stat_ls):
+        if self.__raw_row is not None:
             # duplicated access
             self.OutputCost.mark_access()
             total_cost = opt_cost
         else:
+            # the submodules of a module measured as a whole are never called, so they are taken into account here
+            is_composite = self.__owns_output and not self._opnode.is_leaf
+
             param_cost = 0  # byte
-            for param in module._parameters.values():
+            for param in module.parameters() if is_composite else module._parameters.values():
                 if param is None:
                     continue
                 param_cost += param.numel() * param.element_size()
+            if self.__owns_output:
+                param_cost += sum(t.numel() * t.element_size() for t in packed_params(module))
             self.__ParamCost += param_cost
 
             buffer_cost = 0  # byte
-            for buffer in module._buffers.values():
+            for buffer in module.buffers() if is_composite else module._buffers.values():
                 if buffer is not None:
                     buffer_cost += buffer.numel() * buffer.element_size()
             self.__BufferCost += buffer_cost
 
             total_cost = param_cost + buffer_cost + opt_cost
+            self.__raw_row = (param_cost, buffer_cost, opt_cost, total_cost)
+            self.dtype = _tensor_dtype(opt)
+
+        self.__TotalCost += total_cost
+
+    def __build_rows(self) -> List[NamedTuple]:
+        """
+        Private method.
+        Build the detail row from the raw data recorded by the hook, which is done only once.
+
+        Returns:
+            List[NamedTuple]: The detail rows, empty if the module has not been measured.
+        """
+        if self.__raw_row is not None and not self.__stat_ls:
+            param_cost, buffer_cost, opt_cost, total_cost = self.__raw_row
+            is_leaf = self.__owns_output
             self.__stat_ls.append(
                 self.detail_val_container(  # type: ignore
                     Operation_Id=self._opnode.node_id,  # type: ignore
                     Operation_Name=self._opnode.name,  # type: ignore
                     Operation_Type=self._opnode.type + ("(inplace)" if self.is_inplace else ""),  # type: ignore
-                    Param_Cost=None if self._opnode.is_leaf and not param_cost else self.ParamCost,  # type: ignore
-                    Buffer_Cost=None if self._opnode.is_leaf and not buffer_cost else self.BufferCost,  # type: ignore
-                    Output_Cost=None if self._opnode.is_leaf and not opt_cost else self.OutputCost,  # type: ignore
-                    Total=None if self._opnode.is_leaf and not total_cost else self.TotalCost,  # type: ignore
+                    Param_Cost=None if is_leaf and not param_cost else self.ParamCost,  # type: ignore
+                    Buffer_Cost=None if is_leaf and not buffer_cost else self.BufferCost,  # type: ignore
+                    Output_Cost=None if is_leaf and not opt_cost else self.OutputCost,  # type: ignore
+                    Total=None if is_leaf and not total_cost else self.TotalCost,  # type: ignore
                 )
             )
+        return self.__stat_ls
 
-        self.__TotalCost += total_cost
+    def __is_whole(self) -> bool:
+        """
+        Private method.
+        Whether the module is measured as a whole, i.e. it is a leaf, or all modules in its subtree are hooked
+        but none of them is called, e.g. `nn.MultiheadAttention` uses the weights of `out_proj` directly.
+        It should be called in the hook, after those of the submodules are triggered.
+
+        Returns:
+            bool: Whether the module is measured as a whole.
+        """
+        if self._opnode.is_leaf:
+            return True
+
+        stack = list(self._opnode.childs.values())
+        if not stack:  # the submodules are not in a tree
+            return False
+        while stack:
+            mem = stack.pop().mem
+            if not mem.is_measured or mem.is_extrapolated or mem.__raw_row is not None:
+                return False
+            stack.extend(mem._opnode.childs.values())
+        return True
 
     def __is_valid_access(self) -> bool:
         if self.is_measured:
-            if not self.__stat_ls and not isinstance(self._model, (nn.ModuleDict, nn.ModuleList)):
+            if (
+                self.__raw_row is None
+                and not self.__stat_ls
+                and not isinstance(self._model, (nn.ModuleDict, nn.ModuleList))
+            ):
                 raise RuntimeError("This module might be defined but not explicitly called, so no data is collected.")
         else:
             raise AttributeError(
@@ -745,9 +864,9 @@ class IttpMeter(Statistics):
         typename="InferTime_Throughput_INFO",
         field_names=[
             "Operation_Id", "Operation_Name", "Operation_Type", 
-            "Infer_Time", "Throughput"
+            "Infer_Time", "Throughput", "Overhead"
         ],
-        defaults=(None,) * 5, # type: ignore
+        defaults=(None,) * 6, # type: ignore
     )  # fmt: skip
 
     overview_val_container: NamedTuple = namedtuple(  # type: ignore
@@ -770,6 +889,8 @@ class IttpMeter(Statistics):
 
         self.__stat_ls: List[NamedTuple] = []  # record the inference time and throughput of each operation
         self.is_measured = False
+        self.is_extrapolated = False  # whether the measurement is reused from a structurally identical node
+        self.overhead_ratio: Optional[float] = None  # estimated fraction of the raw time spent by the benchmark itself
 
         self.__InferTime = MetricsData(reduce_func=np.median, unit_sys=TimeUnit)
         self.__Throughput = MetricsData(reduce_func=np.median, unit_sys=SpeedUnit)
@@ -809,26 +930,70 @@ class IttpMeter(Statistics):
             "Inference Elapse": str(self.InferTime),
             "Throughput": str(self.Throughput),
         }
+        if self.overhead_ratio is not None:
+            res_dict["Benchmark Overhead"] = f"{self.overhead_ratio:.1%} (subtracted)"
         max_keylen = max([len(key) for key in res_dict])
         res_dict = {key.ljust(max_keylen): value for key, value in res_dict.items()}
         return res_dict
 
-    def measure(self, device: tc_device, repeat: int = 50, global_process: Optional[tqdm] = None) -> RemovableHandle:
+    def measure(
+        self,
+        device: tc_device,
+        repeat: int = 50,
+        global_process: Optional[tqdm] = None,
+        dispatcher: Optional[HookDispatcher] = None,
+        overhead: Optional[TimingOverhead] = None,
+    ) -> Union[RemovableHandle, Callable]:
+        """Register a hook that benchmarks the module `repeat` times when it is first called.
+
+        Args:
+            device (tc_device): The device to benchmark on.
+            repeat (int): The number of benchmark runs. Defaults to `50`.
+            global_process (Optional[tqdm]): The progress bar updated after each run. Defaults to `None`.
+            dispatcher (Optional[HookDispatcher]): The dispatcher to register the hook to, see `hook_model()`.
+                                                   Defaults to `None`.
+            overhead (Optional[TimingOverhead]): The self-cost of the benchmark, see `calibrate_overhead()`. It is
+                                                 subtracted from each run, and its fraction of the raw time is
+                                                 reported as `overhead_ratio`. Defaults to `None`, i.e. the raw
+                                                 time is kept.
+
+        Returns:
+            Union[RemovableHandle, Callable]: The handle of the hook, or the hook itself if `dispatcher` is given.
+        """
         self._model.to(device, non_blocking=True)
+        self.is_extrapolated = False
+        self.overhead_ratio = None
 
-        hook = self._model.register_forward_hook(
+        hook = self.hook_model(
             partial(
                 self.__hook_func,
                 device=device,
                 repeat=repeat,
                 global_process=global_process,
-            )
+                dispatcher=dispatcher,
+                overhead=overhead,
+            ),
+            dispatcher=dispatcher,
         )
 
         self.is_measured = True
 
         return hook
 
+    def extrapolate(self, src: IttpMeter) -> None:
+        """Reuse the measurement of `src` instead of benchmarking, the node of `src` should be structurally
+        identical to the current one and see the same input. It should be applied to each node in the subtree.
+        """
+        self.__InferTime.vals = src.InferTime.vals.copy()
+        self.__Throughput.vals = src.Throughput.vals.copy()
+        self.overhead_ratio = src.overhead_ratio
+        self.__stat_ls = self.extrapolate_rows(
+            src.__stat_ls, {id(src.InferTime): self.InferTime, id(src.Throughput): self.Throughput}
+        )
+
+        self.is_measured = True
+        self.is_extrapolated = True
+
     def __hook_func(
         self,
         module: nn.Module,
@@ -837,12 +1002,18 @@ class IttpMeter(Statistics):
         device: tc_device,
         repeat: int = 50,
         global_process: Optional[tqdm] = None,
+        dispatcher: Optional[HookDispatcher] = None,
+        overhead: Optional[TimingOverhead] = None,
     ) -> None:
         self.__InferTime.clear()
         self.__Throughput.clear()
         self.__stat_ls.clear()
 
-        module._forward_hooks.clear()
+        # avoid being triggered again by the benchmark calls below
+        if dispatcher is not None:
+            dispatcher.remove(module)
+        else:
+            module._forward_hooks.clear()
         module.eval()
 
         if device.type == "cpu":
@@ -854,6 +1025,9 @@ class IttpMeter(Statistics):
             gpu_end_timer = end_event.record
             cuda_sync()  # WAIT FOR GPU SYNC
 
+        node_overhead = 0.0 if overhead is None else self.__node_overhead(overhead, dispatcher)
+        raw_its: List[float] = []
+
         with no_grad():
             for _ in range(repeat):
                 start_time = cpu_timer() if device.type == "cpu" else gpu_start_timer()
@@ -868,6 +1042,10 @@ class IttpMeter(Statistics):
                     cuda_sync()  # WAIT FOR GPU SYNC
                     it = start_event.elapsed_time(end_event) * 1e-3  # ms -> s    # type: ignore
 
+                raw_its.append(it)
+                if overhead is not None:
+                    it = max(it - node_overhead, MIN_ELAPSE)
+
                 tp = 1 / it
                 self.__InferTime.append(it)
                 self.__Throughput.append(tp)
@@ -875,6 +1053,9 @@ class IttpMeter(Statistics):
                 if global_process is not None:
                     global_process.update(1)
 
+        if overhead is not None and raw_its:
+            self.overhead_ratio = min(node_overhead / float(np.median(raw_its)), 1.0)
+
         self.__stat_ls.append(
             self.detail_val_container(
                 Operation_Id=self._opnode.node_id,  # type: ignore
@@ -882,9 +1063,37 @@ class IttpMeter(Statistics):
                 Operation_Type=self._opnode.type,  # type: ignore
                 Infer_Time=self.InferTime,  # type: ignore
                 Throughput=self.Throughput,  # type: ignore
+                Overhead=None if self.overhead_ratio is None else f"{self.overhead_ratio:.1%}",  # type: ignore
             )
         )
 
+    def __node_overhead(self, overhead: TimingOverhead, dispatcher: Optional[HookDispatcher]) -> float:
+        """Private method.
+
+        The self-cost of a benchmark run of the current module, i.e. that of the timer, plus the empty global hooks
+        of every module in the subtree if they are dispatched.
+
+        Returns:
+            float: The self-cost of a run in seconds.
+        """
+        if dispatcher is None:
+            return overhead.timer
+        return overhead.timer + overhead.hook * self.__subtree_size()
+
+    def __subtree_size(self) -> int:
+        """Private method.
+
+        The number of modules called in a feed-forward of the current one, i.e. the nodes in its subtree.
+
+        Returns:
+            int: The number of nodes in the subtree.
+        """
+        size, stack = 0, [self._opnode]
+        while stack:
+            size += 1
+            stack.extend(stack.pop().childs.values())
+        return size
+
     def __is_valid_access(self) -> bool:
         if self.is_measured:
             if not self.__stat_ls and not isinstance(self._model, (nn.ModuleDict, nn.ModuleList)):
@@ -894,3 +1103,118 @@ class IttpMeter(Statistics):
                 "You should never access this property on your own before accessing `Meter(your_model).ittp`."
             )
         return True
+
+
+def calibrate_overhead(device: tc_device, repeat: int = 200) -> TimingOverhead:
+    """Estimate the self-cost of the benchmark of `IttpMeter` on the current machine, which is included in each
+    benchmarked time but not spent by the module.
+
+    Args:
+        device (tc_device): The device to benchmark on.
+        repeat (int): The number of runs, the median of which is taken. Defaults to `200`.
+
+    Returns:
+        TimingOverhead: The time of a pair of back-to-back timer calls, and the extra time of a module call when
+                        an empty `HookDispatcher` is active, in seconds.
+    """
+    from torchmeter.hooks import HookDispatcher
+
+    probe = nn.Identity()
+    ipt = zeros(1, device=device)
+
+    timer = _median_elapse(lambda: None, device, repeat)
+    plain = _median_elapse(lambda: probe(ipt), device, repeat)
+    with HookDispatcher():
+        hooked = _median_elapse(lambda: probe(ipt), device, repeat)
+
+    return TimingOverhead(timer=timer, hook=max(hooked - plain, 0.0))
+
+
+def _median_elapse(func: Callable[[], Any], device: tc_device, repeat: int) -> float:
+    """The median time of `repeat` calls of `func`, timed in the same way as the benchmark of `IttpMeter`.
+
+    Returns:
+        float: The median elapsed time in seconds.
+    """
+    elapses = []
+    if device.type == "cuda":
+        start_event: Event = cuda_event(enable_timing=True)
+        end_event: Event = cuda_event(enable_timing=True)
+        cuda_sync()
+
+    with no_grad():
+        for _ in range(repeat):
+            if device.type == "cuda":
+                start_event.record()
+                func()
+                end_event.record()
+                cuda_sync()
+                elapses.append(start_event.elapsed_time(end_event) * 1e-3)
+            else:
+                start_time = perf_counter()
+                func()
+                elapses.append(perf_counter() - start_time)
+    return float(np.median(elapses))
+
+
+def _output_bytes(opt: Any) -> int:
+    """The bytes of the output of a module, each item of which is measured separately if it is a tuple.
+
+    Returns:
+        int: The bytes of the output.
+    """
+    nbytes = 0
+    for item in opt if isinstance(opt, tuple) else (opt,):
+        if isinstance(item, Tensor):
+            nbytes += item.numel() * item.element_size()
+        elif _is_tensor_seq(item):
+            # e.g. the hidden and cell states of `nn.LSTM`, or a `PackedSequence`
+            nbytes += sum(t.numel() * t.element_size() for t in _flatten_tensors(item))
+        elif isinstance(item, np.ndarray):
+            nbytes += item.nbytes
+        elif isinstance(item, str):
+            # Note: string storage is optimized after python 3.12, so the value changes with the version,
+            # but it is not significantly changed, which does not affect the macro measurement results.
+            nbytes += item.__sizeof__()
+        else:
+            nbytes += asizeof(item)
+    return nbytes
+
+
+def _is_tensor_seq(val: Any) -> bool:
+    """Whether `val` is a tuple or list of tensors (and `None`s, or such sequences), which has at least one tensor.
+
+    Returns:
+        bool: Whether `val` is such a sequence.
+    """
+    if not isinstance(val, (tuple, list)):
+        return False
+    items = [item for item in val if item is not None]
+    return bool(items) and all(isinstance(item, Tensor) or _is_tensor_seq(item) for item in items)
+
+
+def _flatten_tensors(val: Any) -> List[Tensor]:
+    """The tensors in a sequence approved by `_is_tensor_seq()`.
+
+    Returns:
+        List[Tensor]: The tensors in depth-first order.
+    """
+    if isinstance(val, Tensor):
+        return [val]
+    return [t for item in val if item is not None for t in _flatten_tensors(item)]
+
+
+def _tensor_dtype(val: Any) -> Optional[tc_dtype]:
+    """The data type of the first tensor in `val`, which is a tensor or a (nested) tuple or list.
+
+    Returns:
+        Optional[torch.dtype]: The data type, `None` if there is no tensor.
+    """
+    if isinstance(val, Tensor):
+        return val.dtype
+    if isinstance(val, (tuple, list)):
+        for item in val:
+            dtype = _tensor_dtype(item)
+            if dtype is not None:
+                return dtype
+    return None
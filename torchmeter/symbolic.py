@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+from fractions import Fraction
+from itertools import product
+from contextlib import nullcontext
+
+from torch import Tensor
+
+from torchmeter.hooks import HookDispatcher
+from torchmeter.utils import measure_mode
+
+if TYPE_CHECKING:
+    import sys
+
+    if sys.version_info >= (3, 10):
+        from typing import TypeAlias
+    else:
+        from typing_extensions import TypeAlias
+
+    from typing import Any, Dict, List, Tuple, Union, Sequence
+
+    import torch.nn as nn
+
+    from torchmeter.core import IPT_TYPE
+    from torchmeter.engine import OperationTree
+
+    DIM_LOC_TYPE: TypeAlias = Tuple[Union[int, str], int]
+    DIMS_TYPE: TypeAlias = Dict[str, Union[DIM_LOC_TYPE, Sequence[DIM_LOC_TYPE]]]
+
+__all__ = ["Formula", "trace_formulas"]
+
+# the statistics recorded as formulas, in the form of (statistics name, field name)
+FORMULA_FIELDS = (("cal", "Macs"), ("cal", "Flops"), ("mem", "OutputCost"))
+
+
+class Formula:
+    """
+    A polynomial in the named input dimensions with exact rational coefficients, which can be evaluated for any
+    value of the dimensions, and whose `str()` is a valid python expression, e.g. `2*B*L**2 + 64*B*L`.
+
+    Attributes:
+        dim_names (Tuple[str, ...]): The names of the variables.
+        terms (Dict[Tuple[int, ...], Fraction]): The nonzero coefficient of each monomial, which is keyed by the
+                                                 exponents of the variables in the order of `dim_names`.
+
+    Example:
+        ```python
+        f = Formula(("B", "L"), {(1, 2): Fraction(2), (1, 1): Fraction(64)})
+        f(B=8, L=512)  # 4456448
+        str(f)  # '2*B*L**2 + 64*B*L'
+        ```
+    """
+
+    __slots__ = ["dim_names", "terms"]
+
+    def __init__(self, dim_names: Sequence[str], terms: Dict[Tuple[int, ...], Fraction]) -> None:
+        self.dim_names = tuple(dim_names)
+        self.terms = {exps: coeff for exps, coeff in terms.items() if coeff}
+
+    def __call__(self, **dims: Union[int, float]) -> Union[int, float]:
+        """Evaluate the formula.
+
+        Args:
+            **dims (Union[int, float]): The value of each dimension in `dim_names`.
+
+        Returns:
+            Union[int, float]: The value, an `int` if it is integral.
+
+        Raises:
+            ValueError: If the value of any dimension is missing.
+        """
+        missing = [name for name in self.dim_names if name not in dims]
+        if missing:
+            raise ValueError(f"The values of the dimensions {missing} are missing.")
+
+        res = Fraction(0)
+        for exps, coeff in self.terms.items():
+            term = coeff
+            for name, exp in zip(self.dim_names, exps):
+                term *= Fraction(dims[name]) ** exp
+            res += term
+        return int(res) if res.denominator == 1 else float(res)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Formula):
+            return NotImplemented
+        return self.dim_names == other.dim_names and self.terms == other.terms
+
+    def __repr__(self) -> str:
+        if not self.terms:
+            return "0"
+
+        res = ""
+        # higher degree first
+        for exps in sorted(self.terms, key=lambda exps: (-sum(exps), tuple(-e for e in exps))):
+            coeff = abs(self.terms[exps])
+            factors = [name if exp == 1 else f"{name}**{exp}" for name, exp in zip(self.dim_names, exps) if exp]
+            if coeff != 1 or not factors:
+                factors.insert(0, str(coeff) if coeff.denominator == 1 else f"({coeff})")
+
+            sign = "-" if self.terms[exps] < 0 else "+"
+            res += (f" {sign} " if res else sign.strip("+")) + "*".join(factors)
+        return res
+
+
+def trace_formulas(
+    optree: OperationTree,
+    ipt: IPT_TYPE,
+    dims: DIMS_TYPE,
+    degree: int = 2,
+    count_ops: bool = False,
+) -> Dict[str, Dict[str, Formula]]:
+    """Record the `Macs`, `Flops` (see `CalMeter`) and `OutputCost` (see `MemMeter`) of each node as polynomials in
+    the given input dimensions.
+
+    Each dimension is assumed to contribute a polynomial of at most `degree`, e.g. `1` for convolutions and
+    linear layers and `2` for attention over the sequence length. The model is fed `(degree + 1) ** len(dims)`
+    inputs whose dimensions are `1` to `degree + 1` times the captured ones. The coefficients are then solved
+    exactly, and one more input checks the result. The values passed to the model only have the new shapes
+    (their content is zeros), so measuring on the `meta` device is recommended.
+
+    Args:
+        optree (OperationTree): The operation tree of the model, the statistics `cal` and `mem` of its nodes are
+                                remeasured for each input and discarded at last.
+        ipt (IPT_TYPE): The captured input, with keys `args` and `kwargs`, see `Meter.ipt`.
+        dims (DIMS_TYPE): A mapping from the name of a dimension to where it is in the input, i.e. a tuple of the
+                          position (or keyword) of the argument and the index of the dimension, or a list of such
+                          tuples if it is shared by multiple arguments.
+                          For example, `{"B": [(0, 0), ("mask", 0)], "L": (0, 1)}`.
+        degree (int): The maximum degree of each dimension. Defaults to `2`.
+        count_ops (bool): Whether to count the operators in each module, see `torchmeter.op_counter.OpCounter`.
+                          Defaults to `False`.
+
+    Returns:
+        Dict[str, Dict[str, Formula]]: A mapping from the node id to the formulas of `Macs`, `Flops` and
+                                       `OutputCost` of the node.
+
+    Raises:
+        ValueError: If `dims` is empty, `degree` is not a positive integer, or a dimension refers to a missing
+                    argument or dimension.
+    """
+    if not dims:
+        raise ValueError("At least one dimension should be given.")
+    if not isinstance(degree, int) or degree < 1:
+        raise ValueError(f"`degree` must be a positive integer, but got `{degree}`.")
+
+    dim_names = tuple(dims)
+    dim_locs = {name: [locs] if isinstance(locs, tuple) else list(locs) for name, locs in dims.items()}
+    base_sizes = {name: _locate(ipt, *dim_locs[name][0]).shape[dim_locs[name][0][1]] for name in dim_names}
+
+    def sample(scales: Tuple[int, ...]) -> Dict[str, Dict[str, Fraction]]:
+        sizes = {name: scale * base_sizes[name] for name, scale in zip(dim_names, scales)}
+        return _measure(optree, _resize(ipt, dim_locs, sizes), count_ops)
+
+    # values[node_id][field] maps the scales of the dimensions to the measured value
+    scale_grid = list(product(range(1, degree + 2), repeat=len(dim_names)))
+    values: Dict[str, Dict[str, Dict[Tuple[int, ...], Fraction]]] = {}
+    for scales in scale_grid:
+        for node_id, fields in sample(scales).items():
+            for field, val in fields.items():
+                values.setdefault(node_id, {}).setdefault(field, {})[scales] = val
+
+    points_per_dim = [[Fraction(scale * base_sizes[name]) for scale in range(1, degree + 2)] for name in dim_names]
+
+    res = {
+        node_id: {
+            field: Formula(
+                dim_names,
+                _interpolate([grid.get(scales, Fraction(0)) for scales in scale_grid], points_per_dim, degree),
+            )
+            for field, grid in fields.items()
+        }
+        for node_id, fields in values.items()
+    }
+
+    # validate at a point out of the grid
+    check_sizes = {name: (degree + 2) * base_sizes[name] for name in dim_names}
+    mismatched_nodes = [
+        node_id
+        for node_id, fields in sample((degree + 2,) * len(dim_names)).items()
+        if any(res[node_id][field](**check_sizes) != val for field, val in fields.items())
+    ]
+    if mismatched_nodes:
+        warnings.warn(
+            message=f"The costs of nodes {mismatched_nodes} are not polynomials of degree {degree} in {dim_names}, "
+            + "try a higher degree or input dimensions divisible by the strides of the model.\n",
+            category=RuntimeWarning,
+            stacklevel=2,
+        )
+
+    optree.reset_stats("cal", "mem")
+    return res
+
+
+def _locate(ipt: IPT_TYPE, key: Union[int, str], dim: int) -> Tensor:
+    """Get the tensor argument at `key` (a position or a keyword) in `ipt` and check it has dimension `dim`.
+
+    Returns:
+        Tensor: The located tensor.
+
+    Raises:
+        ValueError: If the argument is not found, or it is not a tensor with dimension `dim`.
+    """
+    try:
+        val = ipt["args"][key] if isinstance(key, int) else ipt["kwargs"][key]
+    except (IndexError, KeyError):
+        raise ValueError(f"Argument `{key}` is not found in the input.") from None
+
+    if not isinstance(val, Tensor) or not -val.dim() <= dim < val.dim():
+        raise ValueError(f"Argument `{key}` is not a tensor with dimension `{dim}`.")
+    return val
+
+
+def _resize(
+    ipt: IPT_TYPE,
+    dim_locs: Dict[str, List[DIM_LOC_TYPE]],
+    sizes: Dict[str, int],
+) -> IPT_TYPE:
+    """A copy of `ipt` whose tensors located by `dim_locs` are replaced by zeros of the given sizes.
+
+    Returns:
+        IPT_TYPE: The resized input.
+    """
+    args, kwargs = list(ipt["args"]), dict(ipt["kwargs"])
+    shapes: Dict[Union[int, str], List[int]] = {}
+    for name, locs in dim_locs.items():
+        for key, dim in locs:
+            shape = shapes.setdefault(key, list(_locate(ipt, key, dim).shape))
+            shape[dim] = sizes[name]
+
+    for key, shape in shapes.items():
+        container: Any = args if isinstance(key, int) else kwargs
+        container[key] = container[key].new_zeros(shape)
+    return {"args": tuple(args), "kwargs": kwargs}
+
+
+def _measure(optree: OperationTree, ipt: IPT_TYPE, count_ops: bool) -> Dict[str, Dict[str, Fraction]]:
+    """Measure `cal` and `mem` of all nodes from scratch with the given input in a single feed-forward.
+
+    Returns:
+        Dict[str, Dict[str, Fraction]]: A mapping from the id of each node to its measured fields.
+    """
+    optree.reset_stats("cal", "mem")
+
+    dispatcher = HookDispatcher()
+    op_counter = None
+    if count_ops:
+        from torchmeter.op_counter import OpCounter
+
+        op_counter = OpCounter(dispatcher)
+
+    all_nodes = optree.all_nodes
+    for node in all_nodes:
+        node.cal.measure(dispatcher=dispatcher, count_ops=count_ops)
+        node.mem.measure(dispatcher=dispatcher)
+        if op_counter is not None:
+            op_counter.track(node.operation, node.cal)
+
+    model: nn.Module = optree.root.operation
+    with measure_mode(), dispatcher, op_counter or nullcontext():
+        model(*ipt["args"], **ipt["kwargs"])
+
+    return {
+        node.node_id: {
+            field: Fraction(getattr(getattr(node, stat_name), field).val) for stat_name, field in FORMULA_FIELDS
+        }
+        for node in all_nodes
+    }
+
+
+def _interpolate(
+    vals: List[Fraction],
+    points_per_dim: List[List[Fraction]],
+    degree: int,
+) -> Dict[Tuple[int, ...], Fraction]:
+    """Solve the coefficients of the polynomial taking `vals` on the tensor grid of `points_per_dim` (in row-major
+    order), whose degree in each dimension is at most `degree`. The Vandermonde system of a tensor grid is the
+    Kronecker product of those of each dimension, so it is solved along one dimension after another.
+
+    Returns:
+        Dict[Tuple[int, ...], Fraction]: A mapping from the exponents of each term to its coefficient.
+    """
+    size = degree + 1
+    ndim = len(points_per_dim)
+    coeffs = list(vals)
+    for axis, points in enumerate(points_per_dim):
+        stride = size ** (ndim - 1 - axis)
+        for start in range(len(coeffs)):
+            if (start // stride) % size:  # not the first element along the axis
+                continue
+            idxs = [start + i * stride for i in range(size)]
+            solved = _solve_vandermonde(points, [coeffs[i] for i in idxs])
+            for i, c in zip(idxs, solved):
+                coeffs[i] = c
+
+    return {exps: coeffs[i] for i, exps in enumerate(product(range(size), repeat=ndim))}
+
+
+def _solve_vandermonde(points: List[Fraction], vals: List[Fraction]) -> List[Fraction]:
+    """The coefficients `c` (in ascending order of the power) of the polynomial with `sum(c[k] * x**k) == y` for
+    each `x` in `points` and `y` in `vals`, solved exactly via Gauss-Jordan elimination.
+
+    Returns:
+        List[Fraction]: The coefficients in ascending order of the power.
+    """
+    n = len(points)
+    mat = [[x**k for k in range(n)] + [y] for x, y in zip(points, vals)]
+    for col in range(n):
+        pivot = next(row for row in range(col, n) if mat[row][col])
+        mat[col], mat[pivot] = mat[pivot], mat[col]
+        mat[col] = [v / mat[col][col] for v in mat[col]]
+        for row in range(n):
+            if row != col and mat[row][col]:
+                factor = mat[row][col]
+                mat[row] = [v - factor * p for v, p in zip(mat[row], mat[col])]
+    return [mat[k][n] for k in range(n)]
@@ -4,14 +4,14 @@ import os
 from time import perf_counter
 from typing import TYPE_CHECKING
 from inspect import signature
-from functools import partial
+from contextlib import contextmanager
 
 from rich.text import Text
 from rich.status import Status
 
 if TYPE_CHECKING:
     from types import TracebackType
-    from typing import Any, List, Type, Tuple, Union, Callable, Iterable, Optional
+    from typing import Any, List, Type, Tuple, Union, Callable, Iterable, Iterator, Optional
 
     from polars import PolarsDataType
 
@@ -56,33 +56,55 @@ def dfs_task(
     *,
     visited: Optional[List] = None,
 ) -> Any:
+    """
+    Iterative depth-first traversal, which runs `task_func` on each reachable subject in preorder.
+
+    The result of `task_func` on a subject is passed to its adjacent subjects via the `pre_res` argument.
+    An explicit stack is used instead of recursion, so the traversal depth is not limited by python's
+    recursion limit, and the visited signals are tracked in a set, so each visited check costs O(1).
+
+    Args:
+        dfs_subject (Any): The subject to start the traversal from.
+        adj_func (Callable[[Any], Iterable]): Function to get the adjacent subjects of a subject.
+        task_func (Callable[[Any, Any], Any]): Function to execute on each subject, must have the arguments
+                                               `subject` and `pre_res`.
+        visited_signal_func (Callable[[Any], Any]): Function to get a hashable signal marking a visited subject.
+        visited (Optional[List]): The signals of subjects that have been visited, will be updated in place.
+
+    Returns:
+        Any: The result of `task_func` on `dfs_subject`, `None` if `dfs_subject` has been visited.
+    """
     hasargs(task_func, "subject", "pre_res")
 
-    visited_signal = visited_signal_func(dfs_subject)
+    visited = [] if visited is None else visited
+    visited_signals = set(visited)
 
-    visited = visited or []
+    root_res = None
+    # each item is (subject, is_start_subject, result of its predecessor)
+    stack: List[Tuple[Any, bool, Any]] = [(dfs_subject, True, None)]
+    while stack:
+        subject, is_start, pre_res = stack.pop()
 
-    if visited_signal not in visited:
+        visited_signal = visited_signal_func(subject)
+        if visited_signal in visited_signals:
+            continue
+        visited_signals.add(visited_signal)
         visited.append(visited_signal)
-        try:
-            task_res = task_func(subject=dfs_subject)  # type: ignore
-        except TypeError:
-            # use empty list when no default value for `pre_res`
-            task_res = task_func(subject=dfs_subject, pre_res=[])  # type: ignore
-
-        for adj in adj_func(dfs_subject):
-            dfs_task(
-                dfs_subject=adj,
-                adj_func=adj_func,
-                task_func=partial(task_func, pre_res=task_res),  # type: ignore
-                visited_signal_func=visited_signal_func,
-                visited=visited,
-            )
 
-    try:
-        return task_res
-    except UnboundLocalError:  # revisit visited node
-        return None
+        if is_start:
+            try:
+                task_res = task_func(subject=subject)  # type: ignore
+            except TypeError:
+                # use empty list when no default value for `pre_res`
+                task_res = task_func(subject=subject, pre_res=[])  # type: ignore
+            root_res = task_res
+        else:
+            task_res = task_func(subject=subject, pre_res=pre_res)  # type: ignore
+
+        # push in reverse order so that the adjacent subjects are popped in their original order
+        stack.extend((adj, False, task_res) for adj in tuple(adj_func(subject))[::-1])
+
+    return root_res
 
 
 def indent_str(
@@ -178,6 +200,117 @@ def data_repr(val: Any) -> str:
         return item_repr(val_type, val)
 
 
+def input_signature(val: Any) -> Tuple[Any, ...]:
+    """Summarize the input of a module into a hashable signature, two inputs with a same signature will lead to
+    the same cost of a module. Data with a shape (e.g. tensors and arrays) is summarized by its type, shape, data
+    type and device, containers are summarized item by item, while other objects are summarized by their type
+    and, if hashable, their value.
+
+    Args:
+        val (Any): The input to be summarized.
+
+    Returns:
+        Tuple[Any, ...]: The hashable signature of `val`.
+    """
+    val_type = type(val).__name__
+
+    if isinstance(val, (list, tuple, set)):
+        return (val_type, *map(input_signature, val))
+
+    if isinstance(val, dict):
+        return (val_type, *((input_signature(k), input_signature(v)) for k, v in val.items()))
+
+    if hasattr(val, "shape"):
+        return (val_type, tuple(val.shape), str(getattr(val, "dtype", None)), str(getattr(val, "device", None)))
+
+    try:
+        hash(val)
+    except TypeError:
+        return (val_type,)
+    return (val_type, val)
+
+
+def iopt_shapes(val: Any) -> Any:
+    """Record the input or output of a module with the least work, so that it can be formatted later without
+    keeping the tensors alive. Tensors are replaced by their shapes (`torch.Size`), containers are recorded item
+    by item (sets and lists become tuples), while other objects are replaced by their types.
+
+    Args:
+        val (Any): The input or output to be recorded.
+
+    Returns:
+        Any: The record of `val`.
+    """
+    shape = getattr(val, "shape", None)
+    if shape is not None and hasattr(val, "dim"):  # tensor
+        return shape
+
+    if val is None:
+        return None
+
+    if isinstance(val, (list, tuple, set)):
+        return tuple(map(iopt_shapes, val))
+
+    if isinstance(val, dict):
+        return {k: iopt_shapes(v) for k, v in val.items()}
+
+    return type(val)
+
+
+def packed_params(module: Any) -> List[Any]:
+    """Get the weight and bias packed in a quantized module (e.g. `torch.ao.nn.quantized.Linear`), which are
+    exposed via methods rather than registered as parameters.
+
+    Args:
+        module (Any): The module to be inspected.
+
+    Returns:
+        List[Any]: The packed tensors, empty for a module whose parameters are registered as usual.
+    """
+    tensors = []
+    for name in ("weight", "bias"):
+        getter = getattr(module, name, None)
+        # a registered parameter is a tensor, which is not callable
+        if callable(getter) and not hasattr(getter, "forward"):
+            tensor = getter()
+            if hasattr(tensor, "shape") and hasattr(tensor, "element_size"):
+                tensors.append(tensor)
+    return tensors
+
+
+@contextmanager
+def measure_mode() -> Iterator[None]:
+    """The context of the feed-forward passes measuring a model, i.e. `torch.no_grad()` with the fused fast paths
+    of `nn.MultiheadAttention` and the transformer layers disabled. These fast paths compute the whole layer in a
+    single operator, so their submodules (e.g. the `nn.Linear` and `nn.LayerNorm` inside) are never called and thus
+    never measured.
+
+    `torch.inference_mode()` is not used, since the operators run in it are not seen by the dispatch mode of
+    `torchmeter.op_counter.OpCounter`. The fast paths can only be disabled since torch 2.2 (via
+    `torch.backends.mha.set_fastpath_enabled()`). On the earlier versions autograd is left enabled instead, as the
+    fast paths are not taken when any parameter requires gradients.
+    """
+    from torch import no_grad
+
+    try:
+        from torch.backends import mha
+
+        is_fastpath_enabled = mha.get_fastpath_enabled()
+    except (ImportError, AttributeError):
+        is_fastpath_enabled = None
+
+    if is_fastpath_enabled is None:
+        yield
+        return
+
+    mha.set_fastpath_enabled(False)
+    try:
+        with no_grad():
+            yield
+    finally:
+        mha.set_fastpath_enabled(is_fastpath_enabled)
+
+
 def match_polars_type(
     ipt: Any,
     *,